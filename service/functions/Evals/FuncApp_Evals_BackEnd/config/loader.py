@@ -1,28 +1,88 @@
 from __future__ import annotations
 
+import copy
 import json
 import logging
 import os
 import threading
 import time
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional
 
 import yaml
 
-from config.models import AppConfig, ResolvedAppConfig, RootConfig
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to the stdlib codec.
+    orjson = None
+
+from config.models import AppConfig, ResolvedAppConfig, RootConfig, build_root_config
 
 logger = logging.getLogger(__name__)
 
+# Prefer the libyaml-backed loader when PyYAML was built with it.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Public section name -> RootConfig attribute for load_config_section.
+_SECTION_MAP: Mapping[str, str] = MappingProxyType(
+    {
+        "default_batch_time": "default_batch_time",
+        "batch_app_concurrency": "batch_app_concurrency",
+        "batch_policy_concurrency": "batch_policy_concurrency",
+        "batch_policy_process_workers": "batch_policy_process_workers",
+        "cosmos_telemetry_page_size": "cosmos_telemetry_page_size",
+        "cosmos_telemetry_partition_concurrency": "cosmos_telemetry_partition_concurrency",
+        "otlp_stream_chunk_size": "otlp_stream_chunk_size",
+        "otlp_max_payload_bytes": "otlp_max_payload_bytes",
+        "otlp_max_events_per_request": "otlp_max_events_per_request",
+        "memory_usage_warn_mb": "memory_usage_warn_mb",
+        "memory_usage_hard_limit_mb": "memory_usage_hard_limit_mb",
+        "evaluation_policies": "evaluation_policies",
+        "default_evaluation_policies": "default_evaluation_policies",
+        "global_thresholds": "global_thresholds",
+        "app_config": "applications",
+        "telemetry_source": "telemetry_source",
+        "alerting": "alerting",
+        "cosmos": "cosmos",
+    }
+)
+
 
 @dataclass
 class _ConfigCacheEntry:
     mtime_ns: int
+    size: int
     loaded_at: float
     config: RootConfig
 
 
+def _read_raw(path: Path) -> Dict[str, Any]:
+    if path.suffix.lower() in {".yaml", ".yml"}:
+        with path.open("rb") as f:
+            return yaml.load(f, Loader=_YAML_LOADER)
+    if path.suffix.lower() == ".json":
+        if orjson is not None:
+            # Parses the raw bytes directly, skipping the str decode.
+            return orjson.loads(path.read_bytes())
+        return json.loads(path.read_text())
+    raise ValueError("Unsupported config file format. Use YAML or JSON.")
+
+
+@lru_cache(maxsize=8)
+def _parse_raw_cached(path_str: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    # mtime/size are part of the key so an edited file misses the cache.
+    return _read_raw(Path(path_str))
+
+
+def _read_raw_cached(path_str: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    # The memoized dict is shared, so callers get their own copy; a deep copy is still far
+    # cheaper than parsing the file again.
+    return copy.deepcopy(_parse_raw_cached(path_str, mtime_ns, size))
+
+
 class _ConfigLoaderSingleton:
     _instance: "_ConfigLoaderSingleton | None" = None
 
@@ -37,14 +97,6 @@ class _ConfigLoaderSingleton:
     def _default_ttl_seconds() -> int:
         return int(os.getenv("CONFIG_CACHE_TTL_SECONDS", "60"))
 
-    @staticmethod
-    def _read_raw(path: Path) -> Dict[str, Any]:
-        if path.suffix.lower() in {".yaml", ".yml"}:
-            return yaml.safe_load(path.read_text())
-        if path.suffix.lower() == ".json":
-            return json.loads(path.read_text())
-        raise ValueError("Unsupported config file format. Use YAML or JSON.")
-
     def load(
         self,
         config_path: str,
@@ -57,7 +109,9 @@ class _ConfigLoaderSingleton:
 
         ttl = self._default_ttl_seconds() if ttl_seconds is None else int(ttl_seconds)
         now = time.time()
-        mtime_ns = path.stat().st_mtime_ns
+        stat = path.stat()
+        mtime_ns = stat.st_mtime_ns
+        size = stat.st_size
         key = str(path)
 
         with self._lock:
@@ -66,19 +120,29 @@ class _ConfigLoaderSingleton:
                 entry is not None
                 and not force_reload
                 and entry.mtime_ns == mtime_ns
+                and entry.size == size
                 and (ttl <= 0 or (now - entry.loaded_at) <= ttl)
             )
             if cache_valid:
                 return entry.config
 
-            config = RootConfig(self._read_raw(path))
+            # An expired TTL on an unchanged file skips the parse and only re-resolves
+            # env vars; force_reload always goes back to disk.
+            raw = _read_raw(path) if force_reload else _read_raw_cached(key, mtime_ns, size)
+            config = build_root_config(raw)
             self._cache[key] = _ConfigCacheEntry(
                 mtime_ns=mtime_ns,
+                size=size,
                 loaded_at=now,
                 config=config,
             )
             return config
 
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            _parse_raw_cached.cache_clear()
+
 
 _CONFIG_LOADER = _ConfigLoaderSingleton()
 
@@ -95,6 +159,11 @@ def load_config(
     )
 
 
+def clear_config_cache() -> None:
+    """Drop cached configs and parsed file contents so the next load reads from disk."""
+    _CONFIG_LOADER.clear()
+
+
 def load_config_section(
     config_path: str,
     section: str,
@@ -102,30 +171,28 @@ def load_config_section(
     force_reload: bool = False,
 ) -> Any:
     root = load_config(config_path, ttl_seconds=ttl_seconds, force_reload=force_reload)
-    section_map = {
-        "default_batch_time": "default_batch_time",
-        "batch_app_concurrency": "batch_app_concurrency",
-        "batch_policy_concurrency": "batch_policy_concurrency",
-        "cosmos_telemetry_page_size": "cosmos_telemetry_page_size",
-        "otlp_stream_chunk_size": "otlp_stream_chunk_size",
-        "otlp_max_payload_bytes": "otlp_max_payload_bytes",
-        "otlp_max_events_per_request": "otlp_max_events_per_request",
-        "memory_usage_warn_mb": "memory_usage_warn_mb",
-        "memory_usage_hard_limit_mb": "memory_usage_hard_limit_mb",
-        "evaluation_policies": "evaluation_policies",
-        "default_evaluation_policies": "default_evaluation_policies",
-        "global_thresholds": "global_thresholds",
-        "app_config": "applications",
-        "telemetry_source": "telemetry_source",
-        "alerting": "alerting",
-        "cosmos": "cosmos",
-    }
-    if section not in section_map:
-        raise KeyError(f"Unsupported config section: {section}")
-    return getattr(root, section_map[section])
+    try:
+        attr = _SECTION_MAP[section]
+    except KeyError as exc:
+        raise KeyError(f"Unsupported config section: {section}") from exc
+    return getattr(root, attr)
 
 
 def resolve_app_config(root: RootConfig, app_id: str) -> ResolvedAppConfig:
+    """Resolve ``app_id`` against ``root``; configured apps are memoized per RootConfig.
+
+    The returned object is shared between callers and must be treated as read-only.
+    """
+    if app_id not in root.applications:
+        # Unconfigured ids come from request payloads; resolve them fresh so the memo stays bounded.
+        return _resolve_app_config(root, app_id)
+    resolved = root._resolved_apps.get(app_id)
+    if resolved is None:
+        resolved = root._resolved_apps.setdefault(app_id, _resolve_app_config(root, app_id))
+    return resolved
+
+
+def _resolve_app_config(root: RootConfig, app_id: str) -> ResolvedAppConfig:
     if app_id in root.applications:
         app = root.applications[app_id]
     else:
@@ -147,8 +214,12 @@ def resolve_app_config(root: RootConfig, app_id: str) -> ResolvedAppConfig:
 
     policies = [root.evaluation_policies[name] for name in policy_names if name in root.evaluation_policies]
 
-    merged_thresholds = dict(root.global_thresholds)
-    merged_thresholds.update(app.thresholds)
+    if app.thresholds:
+        merged_thresholds = {**root.global_thresholds, **app.thresholds}
+    else:
+        # No per-app overrides (every unconfigured app): share the root mapping
+        # instead of copying it; resolved configs are read-only.
+        merged_thresholds = root.global_thresholds
 
     return ResolvedAppConfig(
         app_id=app_id,
@@ -1,19 +1,53 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from functools import cached_property
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import os
+import re
+
+# Same $VAR / ${VAR} grammar as posixpath.expandvars, compiled once.
+_ENV_VAR_RE = re.compile(r"\$(\w+|\{[^}]*\})", re.ASCII)
+
+
+def _substitute_env_var(match: re.Match[str]) -> str:
+    name = match.group(1)
+    if name.startswith("{") and name.endswith("}"):
+        name = name[1:-1]
+    # Unset variables are left untouched, matching os.path.expandvars.
+    return os.environ.get(name, match.group(0))
+
+
+def _expand_env_leaf(value: Any) -> Any:
+    if isinstance(value, str):
+        return _ENV_VAR_RE.sub(_substitute_env_var, value) if "$" in value else value
+    return value
 
 
 def _expand_env_vars(obj: Any) -> Any:
-    if isinstance(obj, dict):
-        return {key: _expand_env_vars(value) for key, value in obj.items()}
-    if isinstance(obj, list):
-        return [_expand_env_vars(item) for item in obj]
-    if isinstance(obj, str):
-        return os.path.expandvars(obj)
-    return obj
+    """Return a copy of ``obj`` with env vars expanded in every string leaf.
+
+    Nested dicts/lists are walked with an explicit worklist rather than recursion:
+    each container copy is linked into its parent up front and filled when popped.
+    """
+    if not isinstance(obj, (dict, list)):
+        return _expand_env_leaf(obj)
+
+    result: Any = {} if isinstance(obj, dict) else []
+    stack: List[Tuple[Any, Any]] = [(obj, result)]
+    while stack:
+        src, dst = stack.pop()
+        dst_is_dict = isinstance(dst, dict)
+        for key, value in src.items() if isinstance(src, dict) else enumerate(src):
+            if isinstance(value, (dict, list)):
+                copy: Any = {} if isinstance(value, dict) else []
+                stack.append((value, copy))
+            else:
+                copy = _expand_env_leaf(value)
+            if dst_is_dict:
+                dst[key] = copy
+            else:
+                dst.append(copy)
+    return result
 
 
 def _to_bool(value: Any, default: bool) -> bool:
@@ -26,7 +60,21 @@ def _to_bool(value: Any, default: bool) -> bool:
     return bool(value)
 
 
-@dataclass
+def _setting(raw: Dict[str, Any], key: str, env_var: str, default: Any, cast: Callable[[Any], Any]) -> Any:
+    """Read ``key`` from ``raw``, else ``env_var``, else ``default``; coerce with ``cast``.
+
+    The env lookup only happens when the key is absent, and values that already have
+    the target type are returned as-is.
+    """
+    value = raw.get(key)
+    if value is None:
+        value = os.getenv(env_var)
+        if value is None:
+            return default
+    return value if type(value) is cast else cast(value)
+
+
+@dataclass(slots=True)
 class ThresholdConfig:
     level: str
     value: float
@@ -35,9 +83,10 @@ class ThresholdConfig:
 
 def _parse_thresholds(raw: Dict[str, Any]) -> Dict[str, List[ThresholdConfig]]:
     parsed: Dict[str, List[ThresholdConfig]] = {}
+    threshold_cls = ThresholdConfig
     for metric_name, entries in raw.items():
         parsed[metric_name] = [
-            ThresholdConfig(
+            threshold_cls(
                 level=item["level"],
                 value=float(item["value"]),
                 direction=item.get("direction", "min"),
@@ -56,11 +105,13 @@ class PolicyConfig:
 
 def _parse_policies(raw: Dict[str, Any]) -> Dict[str, PolicyConfig]:
     parsed: Dict[str, PolicyConfig] = {}
+    policy_cls = PolicyConfig
     for name, cfg in raw.items():
-        parsed[name] = PolicyConfig(
+        cfg_get = cfg.get
+        parsed[name] = policy_cls(
             name=name,
-            metrics=cfg.get("metrics", []),
-            parameters=cfg.get("parameters", {}),
+            metrics=cfg_get("metrics", []),
+            parameters=cfg_get("parameters", {}),
         )
     return parsed
 
@@ -76,16 +127,19 @@ class AppConfig:
 
 def _parse_applications(raw: Dict[str, Any]) -> Dict[str, AppConfig]:
     parsed: Dict[str, AppConfig] = {}
+    app_cls = AppConfig
     for app_id, cfg in raw.items():
-        policies_raw = cfg.get("evaluation_policies", [])
+        cfg_get = cfg.get
+        policies_raw = cfg_get("evaluation_policies", [])
         policies = [p.strip() for p in policies_raw.split(",")] if isinstance(policies_raw, str) else policies_raw
+        thresholds_raw = cfg_get("thresholds")
 
-        parsed[app_id] = AppConfig(
+        parsed[app_id] = app_cls(
             app_id=app_id,
-            batch_time=cfg.get("batch_time"),
+            batch_time=cfg_get("batch_time"),
             evaluation_policies=policies,
-            thresholds=_parse_thresholds(cfg.get("thresholds", {})),
-            metadata=cfg.get("metadata", {}),
+            thresholds=_parse_thresholds(thresholds_raw) if thresholds_raw else {},
+            metadata=cfg_get("metadata", {}),
         )
     return parsed
 
@@ -103,6 +157,7 @@ class CosmosConfig:
     client_retry_backoff_max: int = 30
     client_retry_backoff_factor: float = 1.0
     client_connection_timeout: int = 60
+    consistency_level: Optional[str] = None  # None keeps the account default consistency
     operation_retry_attempts: int = 5
     operation_retry_base_delay_seconds: float = 0.5
     operation_retry_max_delay_seconds: float = 8.0
@@ -189,143 +244,119 @@ def _parse_alerting(raw: Dict[str, Any]) -> AlertingConfig:
     )
 
 
-class RootConfig:
-    def __init__(self, raw: Dict[str, Any]) -> None:
-        self._raw = _expand_env_vars(raw)
-
-    @cached_property
-    def default_batch_time(self) -> str:
-        return self._raw.get("default_batch_time", "0 * * * *")
-
-    @cached_property
-    def batch_app_concurrency(self) -> int:
-        return int(self._raw.get("batch_app_concurrency", os.getenv("BATCH_APP_CONCURRENCY", 10)))
-
-    @cached_property
-    def batch_policy_concurrency(self) -> int:
-        return int(self._raw.get("batch_policy_concurrency", os.getenv("BATCH_POLICY_CONCURRENCY", 10)))
-
-    @cached_property
-    def cosmos_telemetry_page_size(self) -> int:
-        return int(self._raw.get("cosmos_telemetry_page_size", os.getenv("COSMOS_TELEMETRY_PAGE_SIZE", 100)))
-
-    @cached_property
-    def otlp_stream_chunk_size(self) -> int:
-        return int(self._raw.get("otlp_stream_chunk_size", os.getenv("OTLP_STREAM_CHUNK_SIZE", 100)))
-
-    @cached_property
-    def otlp_max_payload_bytes(self) -> int:
-        return int(self._raw.get("otlp_max_payload_bytes", os.getenv("OTLP_MAX_PAYLOAD_BYTES", 10_485_760)))
-
-    @cached_property
-    def otlp_max_events_per_request(self) -> int:
-        return int(self._raw.get("otlp_max_events_per_request", os.getenv("OTLP_MAX_EVENTS_PER_REQUEST", 50_000)))
-
-    @cached_property
-    def memory_usage_warn_mb(self) -> int:
-        return int(self._raw.get("memory_usage_warn_mb", os.getenv("MEMORY_USAGE_WARN_MB", 1024)))
-
-    @cached_property
-    def memory_usage_hard_limit_mb(self) -> int:
-        return int(self._raw.get("memory_usage_hard_limit_mb", os.getenv("MEMORY_USAGE_HARD_LIMIT_MB", 0)))
-
-    @cached_property
-    def evaluation_policies(self) -> Dict[str, PolicyConfig]:
-        return _parse_policies(self._raw.get("evaluation_policies", {}))
-
-    @cached_property
-    def default_evaluation_policies(self) -> List[str]:
-        default_policy_raw = self._raw.get("default_evaluation_policies")
-        if default_policy_raw is None:
-            return list(self.evaluation_policies.keys())
-        elif isinstance(default_policy_raw, str):
-            return [p.strip() for p in default_policy_raw.split(",") if p.strip()]
-        else:
-            return list(default_policy_raw)
-
-    @cached_property
-    def global_thresholds(self) -> Dict[str, List[ThresholdConfig]]:
-        return _parse_thresholds(self._raw.get("global_thresholds", {}))
-
-    @cached_property
-    def applications(self) -> Dict[str, AppConfig]:
-        return _parse_applications(self._raw.get("app_config", {}))
-
-    @cached_property
-    def telemetry_source(self) -> TelemetrySourceConfig:
-        return _parse_telemetry_source(self._raw.get("telemetry_source", {}))
-
-    @cached_property
-    def alerting(self) -> AlertingConfig:
-        return _parse_alerting(self._raw.get("alerting", {}))
-
-    @cached_property
-    def cosmos(self) -> Optional[CosmosConfig]:
-        cosmos_cfg = self._raw.get("cosmos", {})
-        if cosmos_cfg or os.getenv("COSMOS_ENDPOINT"):
-            return CosmosConfig(
-                endpoint=cosmos_cfg.get("endpoint", os.getenv("COSMOS_ENDPOINT", "")),
-                key=cosmos_cfg.get("key", os.getenv("COSMOS_KEY", "")),
-                database_name=cosmos_cfg.get("database_name", os.getenv("COSMOS_DATABASE", "ai-eval")),
-                telemetry_container=cosmos_cfg.get("telemetry_container", "telemetry"),
-                results_container=cosmos_cfg.get("results_container", "evaluation_results"),
-                enable_bulk=_to_bool(
-                    cosmos_cfg.get("enable_bulk", os.getenv("COSMOS_ENABLE_BULK")),
-                    True,
-                ),
-                pool_max_connection_size=int(
-                    cosmos_cfg.get(
-                        "pool_max_connection_size",
-                        os.getenv("COSMOS_POOL_MAX_CONNECTION_SIZE", 100),
-                    )
-                ),
-                client_retry_total=int(
-                    cosmos_cfg.get("client_retry_total", os.getenv("COSMOS_CLIENT_RETRY_TOTAL", 10))
-                ),
-                client_retry_backoff_max=int(
-                    cosmos_cfg.get(
-                        "client_retry_backoff_max",
-                        os.getenv("COSMOS_CLIENT_RETRY_BACKOFF_MAX", 30),
-                    )
-                ),
-                client_retry_backoff_factor=float(
-                    cosmos_cfg.get(
-                        "client_retry_backoff_factor",
-                        os.getenv("COSMOS_CLIENT_RETRY_BACKOFF_FACTOR", 1),
-                    )
-                ),
-                client_connection_timeout=int(
-                    cosmos_cfg.get(
-                        "client_connection_timeout",
-                        os.getenv("COSMOS_CLIENT_CONNECTION_TIMEOUT", 60),
-                    )
-                ),
-                operation_retry_attempts=int(
-                    cosmos_cfg.get(
-                        "operation_retry_attempts",
-                        os.getenv("COSMOS_OPERATION_RETRY_ATTEMPTS", 5),
-                    )
-                ),
-                operation_retry_base_delay_seconds=float(
-                    cosmos_cfg.get(
-                        "operation_retry_base_delay_seconds",
-                        os.getenv("COSMOS_OPERATION_RETRY_BASE_DELAY_SECONDS", 0.5),
-                    )
-                ),
-                operation_retry_max_delay_seconds=float(
-                    cosmos_cfg.get(
-                        "operation_retry_max_delay_seconds",
-                        os.getenv("COSMOS_OPERATION_RETRY_MAX_DELAY_SECONDS", 8),
-                    )
-                ),
-                operation_retry_jitter_seconds=float(
-                    cosmos_cfg.get(
-                        "operation_retry_jitter_seconds",
-                        os.getenv("COSMOS_OPERATION_RETRY_JITTER_SECONDS", 0.25),
-                    )
-                ),
-            )
+def _parse_cosmos(cosmos_cfg: Dict[str, Any]) -> Optional[CosmosConfig]:
+    if not (cosmos_cfg or os.getenv("COSMOS_ENDPOINT")):
         return None
+    return CosmosConfig(
+        endpoint=_setting(cosmos_cfg, "endpoint", "COSMOS_ENDPOINT", "", str),
+        key=_setting(cosmos_cfg, "key", "COSMOS_KEY", "", str),
+        database_name=_setting(cosmos_cfg, "database_name", "COSMOS_DATABASE", "ai-eval", str),
+        telemetry_container=cosmos_cfg.get("telemetry_container", "telemetry"),
+        results_container=cosmos_cfg.get("results_container", "evaluation_results"),
+        enable_bulk=_to_bool(
+            cosmos_cfg.get("enable_bulk", os.getenv("COSMOS_ENABLE_BULK")),
+            True,
+        ),
+        pool_max_connection_size=_setting(
+            cosmos_cfg, "pool_max_connection_size", "COSMOS_POOL_MAX_CONNECTION_SIZE", 100, int
+        ),
+        client_retry_total=_setting(cosmos_cfg, "client_retry_total", "COSMOS_CLIENT_RETRY_TOTAL", 10, int),
+        client_retry_backoff_max=_setting(
+            cosmos_cfg, "client_retry_backoff_max", "COSMOS_CLIENT_RETRY_BACKOFF_MAX", 30, int
+        ),
+        client_retry_backoff_factor=_setting(
+            cosmos_cfg, "client_retry_backoff_factor", "COSMOS_CLIENT_RETRY_BACKOFF_FACTOR", 1.0, float
+        ),
+        client_connection_timeout=_setting(
+            cosmos_cfg, "client_connection_timeout", "COSMOS_CLIENT_CONNECTION_TIMEOUT", 60, int
+        ),
+        consistency_level=_setting(cosmos_cfg, "consistency_level", "COSMOS_CONSISTENCY_LEVEL", None, str) or None,
+        operation_retry_attempts=_setting(
+            cosmos_cfg, "operation_retry_attempts", "COSMOS_OPERATION_RETRY_ATTEMPTS", 5, int
+        ),
+        operation_retry_base_delay_seconds=_setting(
+            cosmos_cfg, "operation_retry_base_delay_seconds", "COSMOS_OPERATION_RETRY_BASE_DELAY_SECONDS", 0.5, float
+        ),
+        operation_retry_max_delay_seconds=_setting(
+            cosmos_cfg, "operation_retry_max_delay_seconds", "COSMOS_OPERATION_RETRY_MAX_DELAY_SECONDS", 8.0, float
+        ),
+        operation_retry_jitter_seconds=_setting(
+            cosmos_cfg, "operation_retry_jitter_seconds", "COSMOS_OPERATION_RETRY_JITTER_SECONDS", 0.25, float
+        ),
+    )
+
+
+def _parse_default_policies(raw: Any, evaluation_policies: Dict[str, PolicyConfig]) -> List[str]:
+    if raw is None:
+        return list(evaluation_policies.keys())
+    if isinstance(raw, str):
+        return [p.strip() for p in raw.split(",") if p.strip()]
+    return list(raw)
+
+
+@dataclass(frozen=True)
+class RootConfig:
+    default_batch_time: str = "0 * * * *"
+    batch_app_concurrency: int = 10
+    batch_policy_concurrency: int = 10
+    batch_policy_process_workers: int = 0
+    cosmos_telemetry_page_size: int = 100
+    cosmos_telemetry_partition_concurrency: int = 8
+    otlp_stream_chunk_size: int = 100
+    otlp_max_payload_bytes: int = 10_485_760
+    otlp_max_events_per_request: int = 50_000
+    memory_usage_warn_mb: int = 1024
+    memory_usage_hard_limit_mb: int = 0
+    evaluation_policies: Dict[str, PolicyConfig] = field(default_factory=dict)
+    default_evaluation_policies: List[str] = field(default_factory=list)
+    global_thresholds: Dict[str, List[ThresholdConfig]] = field(default_factory=dict)
+    applications: Dict[str, AppConfig] = field(default_factory=dict)
+    telemetry_source: TelemetrySourceConfig = field(default_factory=TelemetrySourceConfig)
+    alerting: AlertingConfig = field(default_factory=AlertingConfig)
+    cosmos: Optional[CosmosConfig] = None
+    # Memo for config.loader.resolve_app_config; lives and dies with this snapshot.
+    _resolved_apps: Dict[str, ResolvedAppConfig] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+
+def build_root_config(raw: Dict[str, Any]) -> RootConfig:
+    """Expand env vars and parse every section once into an immutable RootConfig."""
+    raw = _expand_env_vars(raw)
+    raw_get = raw.get
+    evaluation_policies = _parse_policies(raw_get("evaluation_policies", {}))
+    return RootConfig(
+        default_batch_time=raw_get("default_batch_time", "0 * * * *"),
+        batch_app_concurrency=_setting(raw, "batch_app_concurrency", "BATCH_APP_CONCURRENCY", 10, int),
+        batch_policy_concurrency=_setting(raw, "batch_policy_concurrency", "BATCH_POLICY_CONCURRENCY", 10, int),
+        batch_policy_process_workers=_setting(
+            raw, "batch_policy_process_workers", "BATCH_POLICY_PROCESS_WORKERS", 0, int
+        ),
+        cosmos_telemetry_page_size=_setting(
+            raw, "cosmos_telemetry_page_size", "COSMOS_TELEMETRY_PAGE_SIZE", 100, int
+        ),
+        cosmos_telemetry_partition_concurrency=_setting(
+            raw, "cosmos_telemetry_partition_concurrency", "COSMOS_TELEMETRY_PARTITION_CONCURRENCY", 8, int
+        ),
+        otlp_stream_chunk_size=_setting(raw, "otlp_stream_chunk_size", "OTLP_STREAM_CHUNK_SIZE", 100, int),
+        otlp_max_payload_bytes=_setting(raw, "otlp_max_payload_bytes", "OTLP_MAX_PAYLOAD_BYTES", 10_485_760, int),
+        otlp_max_events_per_request=_setting(
+            raw, "otlp_max_events_per_request", "OTLP_MAX_EVENTS_PER_REQUEST", 50_000, int
+        ),
+        memory_usage_warn_mb=_setting(raw, "memory_usage_warn_mb", "MEMORY_USAGE_WARN_MB", 1024, int),
+        memory_usage_hard_limit_mb=_setting(
+            raw, "memory_usage_hard_limit_mb", "MEMORY_USAGE_HARD_LIMIT_MB", 0, int
+        ),
+        evaluation_policies=evaluation_policies,
+        default_evaluation_policies=_parse_default_policies(
+            raw_get("default_evaluation_policies"), evaluation_policies
+        ),
+        global_thresholds=_parse_thresholds(raw_get("global_thresholds", {})),
+        applications=_parse_applications(raw_get("app_config", {})),
+        telemetry_source=_parse_telemetry_source(raw_get("telemetry_source", {})),
+        alerting=_parse_alerting(raw_get("alerting", {})),
+        cosmos=_parse_cosmos(raw_get("cosmos", {})),
+    )
 
 
 @dataclass
@@ -336,3 +367,10 @@ class ResolvedAppConfig:
     policies: List[PolicyConfig]
     thresholds: Dict[str, List[ThresholdConfig]]
     metadata: Dict[str, Any] = field(default_factory=dict)
+    policies_by_name: Dict[str, PolicyConfig] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        by_name: Dict[str, PolicyConfig] = {}
+        for policy in self.policies:
+            by_name.setdefault(policy.name, policy)
+        self.policies_by_name = by_name
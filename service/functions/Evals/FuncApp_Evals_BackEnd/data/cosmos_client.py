@@ -1,23 +1,83 @@
 from __future__ import annotations
 
-import hashlib
+import json
 import logging
 import random
 import threading
 import time
-from typing import Any, Callable, Dict, List, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 from azure.cosmos import CosmosClient, PartitionKey
 from azure.cosmos.exceptions import CosmosBatchOperationError
 from azure.core.exceptions import ServiceRequestError
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to the stdlib codec.
+    orjson = None
+
 from config.models import CosmosConfig
 
 logger = logging.getLogger(__name__)
 
-_CLIENT_POOL: Dict[str, CosmosClient] = {}
+# Client settings that must match for two CosmosDbClient instances to share a CosmosClient.
+_PoolKey = Tuple[str, str, bool, int, int, int, float, int, Optional[str]]
+_CLIENT_POOL: Dict[_PoolKey, CosmosClient] = {}
+# (pool key, database, telemetry container, results container) -> resolved proxies.
+_CONTAINER_POOL: Dict[Tuple[_PoolKey, str, str, str], Tuple[Any, Any, Any]] = {}
 _POOL_LOCK = threading.Lock()
 _TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+# Transactional batches allow 100 operations and a 2 MB request; keep headroom for the envelope.
+_BATCH_MAX_OPERATIONS = 100
+_BATCH_MAX_PAYLOAD_BYTES = 1_900_000
+
+
+def _retry_attempts(config: CosmosConfig) -> int:
+    return max(1, config.operation_retry_attempts)
+
+
+def _retry_sleep_seconds(config: CosmosConfig, attempt: int) -> float:
+    """Exponential backoff with jitter for the given 1-based attempt number."""
+    base_delay = max(0.0, config.operation_retry_base_delay_seconds)
+    max_delay = max(base_delay, config.operation_retry_max_delay_seconds)
+    jitter = max(0.0, config.operation_retry_jitter_seconds)
+    delay = min(max_delay, base_delay * (2 ** (attempt - 1)))
+    return delay + random.uniform(0.0, jitter)
+
+
+def _encoded_size(item: Dict[str, Any]) -> int:
+    if orjson is not None:
+        try:
+            return len(orjson.dumps(item))
+        except TypeError:
+            pass  # Types orjson rejects (e.g. non-str keys) fall through to the stdlib codec.
+    return len(json.dumps(item, separators=(",", ":"), default=str).encode("utf-8"))
+
+
+def _iter_upsert_batches(items: List[Dict[str, Any]]) -> Iterator[List[Tuple[str, Tuple[Any, ...]]]]:
+    """Split items into upsert operation lists within the transactional batch limits.
+
+    A batch is closed when it reaches the operation cap or when the next item would push
+    its estimated payload past the byte cap. An oversized item is still sent on its own.
+    """
+    batch: List[Tuple[str, Tuple[Any, ...]]] = []
+    batch_bytes = 0
+    for item in items:
+        size = _encoded_size(item)
+        if batch and (len(batch) >= _BATCH_MAX_OPERATIONS or batch_bytes + size > _BATCH_MAX_PAYLOAD_BYTES):
+            yield batch
+            batch = []
+            batch_bytes = 0
+        batch.append(("upsert", (item,)))
+        batch_bytes += size
+    if batch:
+        yield batch
+
+
+def _consistency_kwargs(config: CosmosConfig) -> Dict[str, Any]:
+    # Only send a consistency level when one is configured: Cosmos rejects requests
+    # stronger than the account default, so the safe default is not to ask at all.
+    return {"consistency_level": config.consistency_level} if config.consistency_level else {}
 
 
 class CosmosDbClient:
@@ -42,37 +102,40 @@ class CosmosDbClient:
                     retry_backoff_factor=config.client_retry_backoff_factor,
                     retry_on_status_codes=list(_TRANSIENT_STATUS_CODES),
                     connection_timeout=config.client_connection_timeout,
+                    **_consistency_kwargs(config),
                 )
+            self._client = _CLIENT_POOL[pool_key]
 
-        self._client = _CLIENT_POOL[pool_key]
-        self._database = self._client.create_database_if_not_exists(id=config.database_name)
-        self._telemetry_container = self._database.create_container_if_not_exists(
-            id=config.telemetry_container,
-            partition_key=PartitionKey(path="/pk"),
-        )
-        self._results_container = self._database.create_container_if_not_exists(
-            id=config.results_container,
-            partition_key=PartitionKey(path="/pk"),
-        )
+            # The create_*_if_not_exists calls are control-plane round trips; resolve
+            # each database/container combination once per process.
+            container_key = (pool_key, config.database_name, config.telemetry_container, config.results_container)
+            if container_key not in _CONTAINER_POOL:
+                database = self._client.create_database_if_not_exists(id=config.database_name)
+                _CONTAINER_POOL[container_key] = (
+                    database,
+                    database.create_container_if_not_exists(
+                        id=config.telemetry_container,
+                        partition_key=PartitionKey(path="/pk"),
+                    ),
+                    database.create_container_if_not_exists(
+                        id=config.results_container,
+                        partition_key=PartitionKey(path="/pk"),
+                    ),
+                )
+            self._database, self._telemetry_container, self._results_container = _CONTAINER_POOL[container_key]
 
     def upsert_telemetry(self, item: Dict[str, Any]) -> Dict[str, Any]:
         return self._with_retry("upsert_telemetry", self._telemetry_container.upsert_item, item)
 
     def upsert_telemetry_batch(self, items: List[Dict[str, Any]], partition_key: str) -> None:
-        """Upsert a batch of up to 100 items within the same logical partition."""
-        if not items:
-            return
-
-        chunk_size = 100
-        for i in range(0, len(items), chunk_size):
-            chunk = items[i : i + chunk_size]
-            batch_operations: List[Tuple[str, Tuple[Any, ...]]] = [("upsert", (item,)) for item in chunk]
-            self._with_retry(
-                "upsert_telemetry_batch",
-                self._telemetry_container.execute_item_batch,
-                batch_operations,
-                partition_key=partition_key,
-            )
+        """Upsert items of one logical partition in transactional batches within Cosmos limits."""
+        self._upsert_batches(
+            "upsert_telemetry_batch", self._telemetry_container, items, partition_key, self.upsert_telemetry
+        )
+
+    def upsert_telemetry_many(self, items: List[Dict[str, Any]]) -> None:
+        """Upsert items from any number of partitions, batching each partition's items."""
+        self._upsert_many(items, self.upsert_telemetry, self.upsert_telemetry_batch)
 
     def query_telemetry(
         self,
@@ -111,48 +174,86 @@ class CosmosDbClient:
         return self._with_retry("upsert_result", self._results_container.upsert_item, item)
 
     def upsert_results_batch(self, items: List[Dict[str, Any]], partition_key: str) -> None:
-        """Upsert a batch of up to 100 items within the same logical partition."""
-        if not items:
-            return
-
-        chunk_size = 100
-        for i in range(0, len(items), chunk_size):
-            chunk = items[i : i + chunk_size]
-            batch_operations: List[Tuple[str, Tuple[Any, ...]]] = [("upsert", (item,)) for item in chunk]
-            self._with_retry(
-                "upsert_results_batch",
-                self._results_container.execute_item_batch,
-                batch_operations,
-                partition_key=partition_key,
-            )
+        """Upsert items of one logical partition in transactional batches within Cosmos limits."""
+        self._upsert_batches("upsert_results_batch", self._results_container, items, partition_key, self.upsert_result)
 
-    def query_results(self, query: str, parameters: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def query_results(
+        self,
+        query: str,
+        parameters: List[Dict[str, Any]],
+        partition_key: str | None = None,
+    ) -> List[Dict[str, Any]]:
+        # Without a partition key the query fans out to every physical partition.
         return self._with_retry(
             "query_results",
             lambda: list(
                 self._results_container.query_items(
                     query=query,
                     parameters=parameters,
-                    enable_cross_partition_query=True,
+                    partition_key=partition_key,
+                    enable_cross_partition_query=(partition_key is None),
                 )
             )
         )
 
+    def _upsert_batches(
+        self,
+        operation_name: str,
+        container: Any,
+        items: List[Dict[str, Any]],
+        partition_key: str,
+        upsert_one: Callable[[Dict[str, Any]], Any],
+    ) -> None:
+        for batch_operations in _iter_upsert_batches(items):
+            try:
+                self._with_retry(
+                    operation_name,
+                    container.execute_item_batch,
+                    batch_operations,
+                    partition_key=partition_key,
+                )
+            except Exception as exc:
+                # A batch is all-or-nothing, so one rejected document (e.g. oversized) would
+                # sink its neighbours; retry just this batch's items one by one.
+                logger.warning(
+                    "Batch upsert failed for partition %s (%s). Falling back to individual requests.",
+                    partition_key,
+                    exc,
+                )
+                for _, (item,) in batch_operations:
+                    upsert_one(item)
+
+    @staticmethod
+    def _upsert_many(
+        items: List[Dict[str, Any]],
+        upsert_one: Callable[[Dict[str, Any]], Any],
+        upsert_batch: Callable[..., None],
+    ) -> None:
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for item in items:
+            grouped.setdefault(item["pk"], []).append(item)
+
+        for partition_key, group in grouped.items():
+            # A single item is cheaper as a plain upsert than as a one-op transactional batch.
+            if len(group) == 1:
+                upsert_one(group[0])
+            else:
+                upsert_batch(group, partition_key=partition_key)
+
     @staticmethod
-    def _pool_key(config: CosmosConfig) -> str:
-        key_material = "|".join(
-            [
-                config.endpoint,
-                config.key,
-                str(config.enable_bulk),
-                str(config.pool_max_connection_size),
-                str(config.client_retry_total),
-                str(config.client_retry_backoff_max),
-                str(config.client_retry_backoff_factor),
-                str(config.client_connection_timeout),
-            ]
+    def _pool_key(config: CosmosConfig) -> _PoolKey:
+        # A plain tuple hashes far cheaper than digesting the joined fields.
+        return (
+            config.endpoint,
+            config.key,
+            config.enable_bulk,
+            config.pool_max_connection_size,
+            config.client_retry_total,
+            config.client_retry_backoff_max,
+            config.client_retry_backoff_factor,
+            config.client_connection_timeout,
+            config.consistency_level,
         )
-        return hashlib.sha256(key_material.encode("utf-8")).hexdigest()
 
     @staticmethod
     def _is_transient_error(exc: Exception) -> bool:
@@ -178,10 +279,7 @@ class CosmosDbClient:
         *args: Any,
         **kwargs: Any,
     ) -> Any:
-        attempts = max(1, self._config.operation_retry_attempts)
-        base_delay = max(0.0, self._config.operation_retry_base_delay_seconds)
-        max_delay = max(base_delay, self._config.operation_retry_max_delay_seconds)
-        jitter = max(0.0, self._config.operation_retry_jitter_seconds)
+        attempts = _retry_attempts(self._config)
 
         for attempt in range(1, attempts + 1):
             try:
@@ -189,8 +287,7 @@ class CosmosDbClient:
             except Exception as exc:
                 if attempt >= attempts or not self._is_transient_error(exc):
                     raise
-                delay = min(max_delay, base_delay * (2 ** (attempt - 1)))
-                sleep_seconds = delay + random.uniform(0.0, jitter)
+                sleep_seconds = _retry_sleep_seconds(self._config, attempt)
                 logger.warning(
                     "Cosmos transient failure in %s (attempt %d/%d): %s. Retrying in %.2fs",
                     operation_name,
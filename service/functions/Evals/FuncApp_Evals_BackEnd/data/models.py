@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
 
@@ -9,13 +10,18 @@ def utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def partition_key_for(app_id: str, timestamp: str) -> str:
-    # Single synthetic partition key to co-locate app/time-slice data.
-    date_slice = timestamp[:10]
+@lru_cache(maxsize=4096)
+def _partition_key(app_id: str, date_slice: str) -> str:
     return f"{app_id}:{date_slice}"
 
 
-@dataclass
+def partition_key_for(app_id: str, timestamp: str) -> str:
+    # Single synthetic partition key to co-locate app/time-slice data. A batch spans few
+    # (app, day) pairs, so records share one cached key string instead of building one each.
+    return _partition_key(app_id, timestamp[:10])
+
+
+@dataclass(slots=True)
 class TelemetryRecord:
     id: str
     app_id: str
@@ -30,13 +36,26 @@ class TelemetryRecord:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> Dict[str, Any]:
-        payload = asdict(self)
-        payload["type"] = "telemetry"
-        payload["pk"] = partition_key_for(self.app_id, self.timestamp)
-        return payload
+        # Explicit literals rather than dataclasses.asdict: same keys and order without the
+        # recursive field walk. metadata is copied one level deep so the payload stays detached.
+        return {
+            "id": self.id,
+            "app_id": self.app_id,
+            "timestamp": self.timestamp,
+            "model_id": self.model_id,
+            "model_version": self.model_version,
+            "input_text": self.input_text,
+            "output_text": self.output_text,
+            "expected_output": self.expected_output,
+            "user_id": self.user_id,
+            "latency_ms": self.latency_ms,
+            "metadata": dict(self.metadata),
+            "type": "telemetry",
+            "pk": partition_key_for(self.app_id, self.timestamp),
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class MetricValueVersioned:
     metric_name: str
     value: float
@@ -46,10 +65,17 @@ class MetricValueVersioned:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "metric_name": self.metric_name,
+            "value": self.value,
+            "version": self.version,
+            "timestamp": self.timestamp,
+            "metric_type": self.metric_type,
+            "metadata": dict(self.metadata),
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class ThresholdBreach:
     metric_name: str
     level: str
@@ -58,10 +84,16 @@ class ThresholdBreach:
     direction: str
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "metric_name": self.metric_name,
+            "level": self.level,
+            "threshold_value": self.threshold_value,
+            "actual_value": self.actual_value,
+            "direction": self.direction,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class EvaluationResult:
     id: str
     app_id: str
@@ -1,20 +1,26 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime, timezone
+import json
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import ijson
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to the stdlib codec.
+    orjson = None
+
 from data.models import TelemetryRecord
 
 
-def _value_from_otlp_attr(value_obj: Dict[str, Any]) -> Any:
-    for key in ("stringValue", "intValue", "doubleValue", "boolValue"):
-        if key in value_obj:
-            return value_obj[key]
-    return None
+_SCALAR_VALUE_KINDS = frozenset(("stringValue", "intValue", "doubleValue", "boolValue"))
 
 
 def _otlp_attrs_to_dict(attrs: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -23,75 +29,167 @@ def _otlp_attrs_to_dict(attrs: List[Dict[str, Any]]) -> Dict[str, Any]:
         key = attr.get("key")
         if key is None:
             continue
-        out[str(key)] = _value_from_otlp_attr(attr.get("value", {}))
+        # An OTLP AnyValue has exactly one populated field: inspect the first entry
+        # instead of probing every scalar kind. Non-scalar kinds map to None.
+        value = None
+        for kind, raw in attr.get("value", {}).items():
+            if kind in _SCALAR_VALUE_KINDS:
+                value = raw
+            break
+        out[str(key)] = value
     return out
 
 
-def _iso_from_unix_nano(raw: str | int | None) -> str:
-    if not raw:
-        return datetime.now(timezone.utc).isoformat()
-    nanos = int(raw)
+def _merged_get(primary: Dict[str, Any], fallback: Dict[str, Any], key: str, default: Any = None) -> Any:
+    """Equivalent to ``{**fallback, **primary}.get(key, default)`` without building the merge."""
+    if key in primary:
+        return primary[key]
+    return fallback.get(key, default)
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def _unix_nano(value: datetime) -> int:
+    # Exact integer arithmetic; going through timestamp() would round via float.
+    return (value - _EPOCH) // _ONE_MICROSECOND * 1000
+
+
+def _iso_from_nanos(nanos: int) -> str:
     return datetime.fromtimestamp(nanos / 1_000_000_000, tz=timezone.utc).isoformat()
 
 
 def _parse_dt(value: str) -> datetime:
-    text = value.replace("Z", "+00:00")
-    return datetime.fromisoformat(text)
+    # Only a trailing "Z" needs translating; slicing avoids a full-string replace.
+    if value.endswith("Z"):
+        return datetime.fromisoformat(value[:-1]).replace(tzinfo=timezone.utc)
+    return datetime.fromisoformat(value)
+
+
+# Exports up to this size are parsed once and shared across fetches; larger ones stream.
+_PARSE_CACHE_MAX_BYTES = 16 * 1024 * 1024
+# One lock per file version, so parses of different files or versions do not queue.
+_PARSE_LOCKS: Dict[str, Tuple[int, int, threading.Lock]] = {}
+_PARSE_LOCKS_GUARD = threading.Lock()
+
+
+def _parse_lock_for(path: str, mtime_ns: int, size: int) -> threading.Lock:
+    with _PARSE_LOCKS_GUARD:
+        entry = _PARSE_LOCKS.get(path)
+        if entry is None or entry[:2] != (mtime_ns, size):
+            # A rewritten file replaces its old entry, so the map holds one lock per path.
+            entry = (mtime_ns, size, threading.Lock())
+            _PARSE_LOCKS[path] = entry
+        return entry[2]
+
+
+# Only the most recent export stays parsed; holding more would keep several large payloads alive.
+@lru_cache(maxsize=1)
+def _load_resource_spans(path: str, mtime_ns: int, size: int) -> Tuple[Dict[str, Any], ...]:
+    # mtime_ns and size only key the cache, so a rewritten file is parsed again.
+    if orjson is not None:
+        payload = orjson.loads(Path(path).read_bytes())
+    else:
+        with open(path, "rb") as f:
+            payload = json.load(f)
+    return tuple(payload.get("resourceSpans", []))
+
+
+def _iter_records(
+    resource_spans_iter: Iterable[Dict[str, Any]], app_id: str, start_ns: int, end_ns: int
+) -> Iterator[TelemetryRecord]:
+    """Yield ``app_id``'s spans starting in ``[start_ns, end_ns)`` as TelemetryRecords."""
+    record_cls = TelemetryRecord
+    # Model ids, versions and service names repeat across every span of a run; interning
+    # lets all records share one string object per distinct value.
+    intern = sys.intern
+    for resource_spans in resource_spans_iter:
+        resource_attrs = _otlp_attrs_to_dict(resource_spans.get("resource", {}).get("attributes", []))
+        for scope_spans in resource_spans.get("scopeSpans", []):
+            for span in scope_spans.get("spans", []):
+                span_attrs = _otlp_attrs_to_dict(span.get("attributes", []))
+                # Most spans in a shared export belong to other apps; resolve the
+                # app id without merging and build the merged view only for kept spans.
+                rec_app_id = str(
+                    _merged_get(
+                        span_attrs,
+                        resource_attrs,
+                        "app_id",
+                        _merged_get(span_attrs, resource_attrs, "service.name", ""),
+                    )
+                )
+                if rec_app_id != app_id:
+                    continue
+                # Filter on the raw integer and only format timestamps for kept spans.
+                raw_nanos = span.get("startTimeUnixNano")
+                nanos = int(raw_nanos) if raw_nanos else _unix_nano(datetime.now(timezone.utc))
+                if not (start_ns <= nanos < end_ns):
+                    continue
+                ts = _iso_from_nanos(nanos)
+                attrs = {**resource_attrs, **span_attrs}
+                service_name = attrs.get("service.name")
+                if isinstance(service_name, str):
+                    service_name = intern(service_name)
+                latency_raw: Optional[Any] = attrs.get("latency_ms", attrs.get("duration_ms"))
+                yield record_cls(
+                    id=str(attrs.get("event_id", f"{app_id}:{span.get('traceId','') or span.get('spanId','')}")),
+                    app_id=app_id,
+                    timestamp=ts,
+                    model_id=intern(str(attrs.get("model_id", attrs.get("llm.model", "unknown-model")))),
+                    model_version=intern(
+                        str(attrs.get("model_version", attrs.get("llm.model_version", "unknown-version")))
+                    ),
+                    input_text=str(attrs.get("input_text", attrs.get("llm.input", ""))),
+                    output_text=str(attrs.get("output_text", attrs.get("llm.output", ""))),
+                    user_id=str(attrs.get("user_id")) if attrs.get("user_id") is not None else None,
+                    latency_ms=float(latency_raw) if latency_raw not in (None, "") else None,
+                    metadata={
+                        "trace_id": span.get("traceId"),
+                        "span_id": span.get("spanId"),
+                        "service_name": service_name,
+                    },
+                )
 
 
 class OtlpTelemetryRepository:
-    def __init__(self, otlp_file_path: str, chunk_size: int = 100) -> None:
+    def __init__(
+        self,
+        otlp_file_path: str,
+        chunk_size: int = 100,
+        parse_cache_max_bytes: int = _PARSE_CACHE_MAX_BYTES,
+    ) -> None:
         if not otlp_file_path:
             raise ValueError("otlp_file_path is required when telemetry_source.type=otlp")
         self._path = Path(otlp_file_path)
         self._chunk_size = max(1, int(chunk_size))
+        self._parse_cache_max_bytes = max(0, int(parse_cache_max_bytes))
+
+    def _iter_resource_spans(self) -> Iterator[Dict[str, Any]]:
+        stat = self._path.stat()
+        if stat.st_size <= self._parse_cache_max_bytes:
+            # Concurrent app runs read the same export; the lock makes them share one parse.
+            path = str(self._path)
+            with _parse_lock_for(path, stat.st_mtime_ns, stat.st_size):
+                resource_spans = _load_resource_spans(path, stat.st_mtime_ns, stat.st_size)
+            yield from resource_spans
+            return
+
+        # Large exports are streamed one resourceSpans entry at a time instead of cached.
+        with open(self._path, "rb") as f:
+            # use_float keeps doubleValue attributes as floats rather than Decimal objects.
+            yield from ijson.items(f, "resourceSpans.item", use_float=True)
 
     async def fetch_telemetry(self, app_id: str, start_ts: str, end_ts: str) -> AsyncIterator[List[TelemetryRecord]]:
         if not self._path.exists():
             raise FileNotFoundError(f"OTLP file not found: {self._path}")
-        start = _parse_dt(start_ts)
-        end = _parse_dt(end_ts)
+        start_ns = _unix_nano(_parse_dt(start_ts))
+        end_ns = _unix_nano(_parse_dt(end_ts))
 
         def _fetch_all() -> Iterator[List[TelemetryRecord]]:
-            records: List[TelemetryRecord] = []
-            with open(self._path, "rb") as f:
-                for resource_spans in ijson.items(f, "resourceSpans.item"):
-                    resource_attrs = _otlp_attrs_to_dict(resource_spans.get("resource", {}).get("attributes", []))
-                    for scope_spans in resource_spans.get("scopeSpans", []):
-                        for span in scope_spans.get("spans", []):
-                            span_attrs = _otlp_attrs_to_dict(span.get("attributes", []))
-                            attrs = {**resource_attrs, **span_attrs}
-                            rec_app_id = str(attrs.get("app_id", attrs.get("service.name", "")))
-                            if rec_app_id != app_id:
-                                continue
-                            ts = _iso_from_unix_nano(span.get("startTimeUnixNano"))
-                            ts_dt = _parse_dt(ts)
-                            if not (start <= ts_dt < end):
-                                continue
-                            latency_raw: Optional[Any] = attrs.get("latency_ms", attrs.get("duration_ms"))
-                            records.append(
-                                TelemetryRecord(
-                                    id=str(attrs.get("event_id", f"{app_id}:{span.get('traceId','') or span.get('spanId','')}")),
-                                    app_id=rec_app_id,
-                                    timestamp=ts,
-                                    model_id=str(attrs.get("model_id", attrs.get("llm.model", "unknown-model"))),
-                                    model_version=str(attrs.get("model_version", attrs.get("llm.model_version", "unknown-version"))),
-                                    input_text=str(attrs.get("input_text", attrs.get("llm.input", ""))),
-                                    output_text=str(attrs.get("output_text", attrs.get("llm.output", ""))),
-                                    user_id=str(attrs.get("user_id")) if attrs.get("user_id") is not None else None,
-                                    latency_ms=float(latency_raw) if latency_raw not in (None, "") else None,
-                                    metadata={
-                                        "trace_id": span.get("traceId"),
-                                        "span_id": span.get("spanId"),
-                                        "service_name": attrs.get("service.name"),
-                                    },
-                                )
-                            )
-                            if len(records) >= self._chunk_size:
-                                yield records
-                                records = []
-            if records:
-                yield records
+            records = _iter_records(self._iter_resource_spans(), app_id, start_ns, end_ns)
+            while chunk := list(islice(records, self._chunk_size)):
+                yield chunk
 
         # Run generator in explicit separate threads per iteration to correctly stream without blocking
         iterator = _fetch_all()
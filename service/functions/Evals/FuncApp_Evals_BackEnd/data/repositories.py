@@ -1,24 +1,73 @@
 from __future__ import annotations
 
 import asyncio
+import contextvars
+import heapq
 import logging
-from collections import defaultdict
-from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import AsyncIterator, Dict, List, Protocol
+import os
+import threading
+from bisect import bisect_left, insort
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from functools import lru_cache, partial
+from itertools import islice
+from operator import attrgetter, itemgetter
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Protocol, Tuple
 
 logger = logging.getLogger(__name__)
 
 from data.cosmos_client import CosmosDbClient
-from data.models import EvaluationResult, TelemetryRecord
+from data.models import EvaluationResult, TelemetryRecord, partition_key_for
+
+# Queue marker a partition scan puts once it has delivered its last page.
+_PARTITION_DONE = object()
+# Only the TelemetryRecord fields travel back, not the whole document and its system
+# properties. Ingestion has written the trace id under three names; all three are projected
+# because Cosmos `??` only skips undefined values, while a null or empty trace_id must still
+# fall through to the next name (see _record_from_row).
+_TELEMETRY_PROJECTION = (
+    "c.id, c.app_id, c.timestamp, c.model_id, c.model_version, c.input_text, c.output_text, "
+    "c.expected_output, c.user_id, c.latency_ms, c.metadata, c.trace_id, c.traceId, c.traceparent"
+)
+
+
+_COSMOS_IO_LOCK = threading.Lock()
+_COSMOS_IO_EXECUTOR: Optional[ThreadPoolExecutor] = None
+
+
+def _cosmos_io_executor() -> ThreadPoolExecutor:
+    # The synchronous SDK blocks a thread per in-flight request. Giving Cosmos calls their
+    # own pool keeps them from queueing behind (or starving) other to_thread work on the
+    # loop's default executor, which is capped at min(32, cpu + 4) threads.
+    global _COSMOS_IO_EXECUTOR
+    with _COSMOS_IO_LOCK:
+        if _COSMOS_IO_EXECUTOR is None:
+            _COSMOS_IO_EXECUTOR = ThreadPoolExecutor(
+                max_workers=max(1, int(os.getenv("COSMOS_IO_MAX_WORKERS", "64"))),
+                thread_name_prefix="cosmos-io",
+            )
+        return _COSMOS_IO_EXECUTOR
+
+
+async def _run_cosmos_io(fn: Callable[..., Any], *args: Any) -> Any:
+    """Like asyncio.to_thread, but on the dedicated Cosmos I/O pool."""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_cosmos_io_executor(), partial(context.run, fn, *args))
+
 
+@lru_cache(maxsize=256)
+def _date_slices(start_ts: str, end_ts: str) -> Tuple[str, ...]:
+    """Return the YYYY-MM-DD strings of every day overlapping [start_ts, end_ts].
 
-def _iterator_next_page(iterator: object) -> tuple[bool, object]:
-    """Return (has_value, page) without propagating StopIteration across threads."""
-    try:
-        return True, next(iterator)  # type: ignore[arg-type]
-    except StopIteration:
-        return False, None
+    Days are walked as proleptic ordinals rather than by repeated timedelta/strftime, and
+    the result is cached because scheduled runs ask for the same windows over and over.
+    """
+    first = datetime.fromisoformat(start_ts.replace("Z", "+00:00")).date().toordinal()
+    last = datetime.fromisoformat(end_ts.replace("Z", "+00:00")).date().toordinal()
+    return tuple(date.fromordinal(ordinal).isoformat() for ordinal in range(first, last + 1))
 
 
 class TelemetryRepository(Protocol):
@@ -44,23 +93,16 @@ class EvaluationRepository(Protocol):
 
 
 class CosmosTelemetryRepository:
-    def __init__(self, client: CosmosDbClient, page_size: int = 100) -> None:
+    def __init__(self, client: CosmosDbClient, page_size: int = 100, partition_concurrency: int = 8) -> None:
         self._client = client
         self._page_size = max(1, int(page_size))
+        self._partition_concurrency = max(1, int(partition_concurrency))
 
     async def fetch_telemetry(self, app_id: str, start_ts: str, end_ts: str) -> AsyncIterator[List[TelemetryRecord]]:
-        dt_start = datetime.fromisoformat(start_ts.replace("Z", "+00:00"))
-        dt_end = datetime.fromisoformat(end_ts.replace("Z", "+00:00"))
-        
-        # Calculate all YYYY-MM-DD strings that overlap with the time range
-        date_slices = []
-        current = dt_start
-        while current.date() <= dt_end.date():
-            date_slices.append(current.strftime("%Y-%m-%d"))
-            current += timedelta(days=1)
-            
+        date_slices = _date_slices(start_ts, end_ts)
+
         query = (
-            "SELECT * FROM c WHERE c.type = 'telemetry' "
+            f"SELECT {_TELEMETRY_PROJECTION} FROM c WHERE c.type = 'telemetry' "
             "AND c.app_id = @app_id AND c.timestamp >= @start_ts AND c.timestamp < @end_ts"
         )
         parameters = [
@@ -69,78 +111,163 @@ class CosmosTelemetryRepository:
             {"name": "@end_ts", "value": end_ts},
         ]
         
-        for date_slice in date_slices:
-            partition_key = f"{app_id}:{date_slice}"
-            iterator = self._client.query_telemetry_paged(
-                query,
-                parameters,
-                max_item_count=self._page_size,
-                partition_key=partition_key,
-            ).by_page()
-
-            while True:
-                has_page, page = await asyncio.to_thread(_iterator_next_page, iterator)
-                if not has_page:
-                    break
-                if page:
-                    yield [TelemetryRecord(**_pick_telemetry_fields(row)) for row in page]
+        # Each day is its own partition: scan up to partition_concurrency of them at once and
+        # hand pages over a bounded queue so producers cannot run far ahead of the consumer.
+        pages: asyncio.Queue[Any] = asyncio.Queue(maxsize=self._partition_concurrency)
+        semaphore = asyncio.Semaphore(self._partition_concurrency)
+
+        async def _scan(partition_key: str) -> None:
+            try:
+                async with semaphore:
+                    iterator = self._client.query_telemetry_paged(
+                        query,
+                        parameters,
+                        max_item_count=self._page_size,
+                        partition_key=partition_key,
+                    ).by_page()
+                    # next() with a default never raises StopIteration across the thread
+                    # boundary; pages are iterables, so None only means the pager is exhausted.
+                    while (page := await _run_cosmos_io(next, iterator, None)) is not None:
+                        await pages.put(page)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                await pages.put(exc)
+            else:
+                await pages.put(_PARTITION_DONE)
+
+        scans = [asyncio.create_task(_scan(f"{app_id}:{date_slice}")) for date_slice in date_slices]
+        remaining = len(scans)
+        try:
+            while remaining:
+                page = await pages.get()
+                if page is _PARTITION_DONE:
+                    remaining -= 1
+                elif isinstance(page, Exception):
+                    raise page
+                elif page:
+                    yield list(map(_record_from_row, page))
+        finally:
+            for scan in scans:
+                scan.cancel()
+            await asyncio.gather(*scans, return_exceptions=True)
 
 
 class CosmosEvaluationRepository:
-    def __init__(self, client: CosmosDbClient) -> None:
+    def __init__(
+        self,
+        client: CosmosDbClient,
+        known_ids_max: int = 100_000,
+        write_concurrency: int = 8,
+        query_concurrency: int = 8,
+        latest_lookback_days: int = 7,
+    ) -> None:
         self._client = client
         self._exists_query_chunk_size = 100
+        self._write_concurrency = max(1, int(write_concurrency))
+        self._query_concurrency = max(1, int(query_concurrency))
+        self._latest_lookback_days = max(0, int(latest_lookback_days))
+        # Result ids this process has written or seen in Cosmos. Results are never deleted,
+        # so a hit is a definite "exists" that needs no query. Insertion-ordered and capped:
+        # the oldest ids are forgotten first, which only costs a query later.
+        # OrderedDict rather than dict: popping the oldest entry of a plain dict rescans the
+        # deleted slots at its front, which makes every insert at the cap O(n).
+        self._known_ids: OrderedDict[str, None] = OrderedDict()
+        self._known_ids_max = max(0, int(known_ids_max))
+
+    def _remember(self, result_ids: Iterable[str]) -> None:
+        known = self._known_ids
+        for result_id in result_ids:
+            known[result_id] = None
+        while len(known) > self._known_ids_max:
+            known.popitem(last=False)
 
     async def save_result(self, result: EvaluationResult) -> None:
-        await asyncio.to_thread(self._client.upsert_result, result.to_dict())
+        await _run_cosmos_io(self._client.upsert_result, result.to_dict())
+        self._remember((result.id,))
 
     async def save_results(self, results: List[EvaluationResult]) -> None:
+        # Result ids are stable per (app, policy, trace, version), so an id this process has
+        # already saved or seen in Cosmos is a redelivery; writing it again would only burn RU
+        # (or add a duplicate document in another day partition). A repeat within the call
+        # replaces the earlier copy, matching what sequential upserts would have stored.
+        fresh: Dict[str, EvaluationResult] = {}
+        for r in results:
+            if r.id not in self._known_ids:
+                fresh[r.id] = r
+        if len(fresh) < len(results):
+            logger.info("Skipping %d already saved results", len(results) - len(fresh))
+        results = list(fresh.values())
         if not results:
             return
 
-        def _save_all() -> None:
-            # Group by partition key
-            grouped: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-            for r in results:
-                payload = r.to_dict()
-                grouped[payload["pk"]].append(payload)
-
-            for pk, items in grouped.items():
-                # Transactional batch inserts limit is 100 per request
-                chunk_size = 100
-                for i in range(0, len(items), chunk_size):
-                    chunk = items[i : i + chunk_size]
-                    try:
-                        self._client.upsert_results_batch(chunk, partition_key=pk)
-                        logger.debug("Batch upserted %d results to partition %s", len(chunk), pk)
-                    except Exception as e:
-                        logger.warning(
-                            "Batch upsert failed for partition %s (%s). Falling back to individual requests.",
-                            pk,
-                            e,
-                        )
-                        for item in chunk:
-                            self._client.upsert_result(item)
-
-        await asyncio.to_thread(_save_all)
+        grouped: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for r in results:
+            payload = r.to_dict()
+            grouped[payload["pk"]].append(payload)
+
+        # Partitions are independent transactional scopes, so their batches can be in flight
+        # together; the semaphore bounds how many worker threads one save occupies.
+        semaphore = asyncio.Semaphore(self._write_concurrency)
+
+        async def _save_group(pk: str, items: List[Dict[str, Any]]) -> None:
+            async with semaphore:
+                await _run_cosmos_io(self._save_partition, pk, items)
+
+        await asyncio.gather(*(_save_group(pk, items) for pk, items in grouped.items()))
+        self._remember(r.id for r in results)
+
+    def _save_partition(self, pk: str, items: List[Dict[str, Any]]) -> None:
+        # The client splits the group into batches within the Cosmos operation and payload
+        # limits, and falls back to single upserts for the items of any batch that fails.
+        self._client.upsert_results_batch(items, partition_key=pk)
+        logger.debug("Batch upserted %d results to partition %s", len(items), pk)
 
     async def latest_results(self, app_id: str, limit: int = 20) -> List[Dict]:
-        def _fetch() -> List[Dict]:
+        if limit <= 0:
+            return []
+        parameters = [{"name": "@app_id", "value": app_id}]
+
+        def _query(top: int, partition_key: str | None = None, exclude_pks: List[str] | None = None) -> List[Dict]:
             # Cosmos DB SQL API does not support parameterised TOP values;
-            # limit is a typed int so it is safe to inline directly.
+            # top is a typed int so it is safe to inline directly.
             query = (
-                f"SELECT TOP {limit} c.app_id, c.timestamp, c.policy_name, c.metrics, c.breaches "
+                f"SELECT TOP {int(top)} c.app_id, c.timestamp, c.policy_name, c.metrics, c.breaches "
                 "FROM c WHERE c.type = 'evaluation_result' AND c.app_id = @app_id "
-                "ORDER BY c.timestamp DESC"
-            )
-            return self._client.query_results(
-                query,
-                [{"name": "@app_id", "value": app_id}],
             )
+            query_parameters = parameters
+            if exclude_pks:
+                query += "AND NOT ARRAY_CONTAINS(@exclude_pks, c.pk) "
+                query_parameters = parameters + [{"name": "@exclude_pks", "value": exclude_pks}]
+            query += "ORDER BY c.timestamp DESC"
+            return self._client.query_results(query, query_parameters, partition_key=partition_key)
 
-        return await asyncio.to_thread(_fetch)
+        def _fetch() -> List[Dict]:
+            # Results are partitioned by (app, day) and stamped when they are written, so the
+            # newest ones sit in the most recent day partitions. Walking those newest-first
+            # answers with cheap single-partition queries; only an app without enough recent
+            # results pays for the cross-partition fan-out.
+            rows: List[Dict] = []
+            walked: List[str] = []
+            today = datetime.now(timezone.utc).date().toordinal()
+            for ordinal in range(today, today - self._latest_lookback_days, -1):
+                pk = partition_key_for(app_id, date.fromordinal(ordinal).isoformat())
+                walked.append(pk)
+                rows.extend(_query(limit - len(rows), pk))
+                if len(rows) >= limit:
+                    return rows
+            # The walk returned everything in its partitions, so the fan-out only needs the
+            # remaining rows from partitions outside the window.
+            rows.extend(_query(limit - len(rows), exclude_pks=walked))
+            rows.sort(key=itemgetter("timestamp"), reverse=True)
+            return rows
+
+        return await _run_cosmos_io(_fetch)
 
     async def result_exists(self, result_id: str) -> bool:
+        if result_id in self._known_ids:
+            return True
+
         def _fetch() -> bool:
             rows = self._client.query_results(
                 "SELECT TOP 1 c.id FROM c WHERE c.id = @id",
@@ -148,33 +275,95 @@ class CosmosEvaluationRepository:
             )
             return bool(rows)
 
-        return await asyncio.to_thread(_fetch)
+        exists = await _run_cosmos_io(_fetch)
+        if exists:
+            self._remember((result_id,))
+        return exists
 
     async def results_exist(self, result_ids: List[str]) -> List[str]:
-        if not result_ids:
-            return []
+        known = [rid for rid in result_ids if rid in self._known_ids]
+        unknown = [rid for rid in result_ids if rid not in self._known_ids]
+        if not unknown:
+            return known
 
-        def _fetch() -> List[str]:
-            found: List[str] = []
-            for start in range(0, len(result_ids), self._exists_query_chunk_size):
-                chunk = result_ids[start : start + self._exists_query_chunk_size]
-                parameters = [{"name": f"@id{i}", "value": rid} for i, rid in enumerate(chunk)]
-                placeholders = ", ".join(p["name"] for p in parameters)
-                query = (
-                    "SELECT c.id FROM c WHERE c.type = 'evaluation_result' "
-                    f"AND c.id IN ({placeholders})"
-                )
-                rows = self._client.query_results(query, parameters)
-                found.extend(row["id"] for row in rows)
-            return found
+        # Each chunk is its own round trip, so they go out together rather than back to back.
+        semaphore = asyncio.Semaphore(self._query_concurrency)
+
+        async def _query_chunk(chunk: List[str]) -> List[str]:
+            parameters = [{"name": f"@id{i}", "value": rid} for i, rid in enumerate(chunk)]
+            placeholders = ", ".join(p["name"] for p in parameters)
+            query = (
+                "SELECT c.id FROM c WHERE c.type = 'evaluation_result' "
+                f"AND c.id IN ({placeholders})"
+            )
+            async with semaphore:
+                rows = await _run_cosmos_io(self._client.query_results, query, parameters)
+            return [row["id"] for row in rows]
 
-        return await asyncio.to_thread(_fetch)
+        size = self._exists_query_chunk_size
+        chunks = [unknown[start : start + size] for start in range(0, len(unknown), size)]
+        found = [rid for ids in await asyncio.gather(*map(_query_chunk, chunks)) for rid in ids]
+        self._remember(found)
+        return known + found
+
+
+_timestamp_of = attrgetter("timestamp")
 
 
 @dataclass
 class InMemoryStore:
+    """Telemetry and results held in plain lists, with lazily maintained lookup indexes.
+
+    The lists are append-only: add records with ``append``/``extend``, or assign a new list.
+    Replacing or mutating an element in place is not seen by the indexes.
+    """
+
     telemetry: List[TelemetryRecord]
     results: List[EvaluationResult]
+    # Lookup indexes over the two lists. The lists stay the source of truth, so each index is
+    # brought up to date lazily by indexing the new tail; a list that shrank or was reassigned
+    # is re-indexed from scratch. Indexes are derived state and excluded from comparison.
+    _telemetry_by_app: Dict[str, List[TelemetryRecord]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _telemetry_indexed: int = field(default=0, init=False, repr=False, compare=False)
+    _telemetry_source: Optional[List[TelemetryRecord]] = field(default=None, init=False, repr=False, compare=False)
+    _results_by_id: Dict[str, EvaluationResult] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _results_by_app: Dict[str, List[EvaluationResult]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _results_indexed: int = field(default=0, init=False, repr=False, compare=False)
+    _results_source: Optional[List[EvaluationResult]] = field(default=None, init=False, repr=False, compare=False)
+
+    def telemetry_for_app(self, app_id: str) -> List[TelemetryRecord]:
+        """Return the app's telemetry records ordered by timestamp."""
+        if self.telemetry is not self._telemetry_source or len(self.telemetry) < self._telemetry_indexed:
+            self._telemetry_by_app = {}
+            self._telemetry_indexed = 0
+            self._telemetry_source = self.telemetry
+        for record in islice(self.telemetry, self._telemetry_indexed, None):
+            insort(self._telemetry_by_app.setdefault(record.app_id, []), record, key=_timestamp_of)
+        self._telemetry_indexed = len(self.telemetry)
+        return self._telemetry_by_app.get(app_id, [])
+
+    def results_for_app(self, app_id: str) -> List[EvaluationResult]:
+        self._index_results()
+        return self._results_by_app.get(app_id, [])
+
+    def result_ids(self) -> Dict[str, EvaluationResult]:
+        self._index_results()
+        return self._results_by_id
+
+    def _index_results(self) -> None:
+        if self.results is not self._results_source or len(self.results) < self._results_indexed:
+            self._results_by_id = {}
+            self._results_by_app = {}
+            self._results_indexed = 0
+            self._results_source = self.results
+        for result in islice(self.results, self._results_indexed, None):
+            self._results_by_id[result.id] = result
+            self._results_by_app.setdefault(result.app_id, []).append(result)
+        self._results_indexed = len(self.results)
 
 
 class InMemoryTelemetryRepository:
@@ -182,11 +371,10 @@ class InMemoryTelemetryRepository:
         self._store = store
 
     async def fetch_telemetry(self, app_id: str, start_ts: str, end_ts: str) -> AsyncIterator[List[TelemetryRecord]]:
-        records = [
-            row
-            for row in self._store.telemetry
-            if row.app_id == app_id and start_ts <= row.timestamp < end_ts
-        ]
+        bucket = self._store.telemetry_for_app(app_id)
+        lo = bisect_left(bucket, start_ts, key=_timestamp_of)
+        hi = bisect_left(bucket, end_ts, lo=lo, key=_timestamp_of)
+        records = bucket[lo:hi]
         chunk_size = 100
         for i in range(0, len(records), chunk_size):
             yield records[i : i + chunk_size]
@@ -203,40 +391,43 @@ class InMemoryEvaluationRepository:
         self._store.results.extend(results)
 
     async def latest_results(self, app_id: str, limit: int = 20) -> List[Dict]:
-        items = [r.to_dict() for r in self._store.results if r.app_id == app_id]
-        return sorted(items, key=lambda r: r["timestamp"], reverse=True)[:limit]
+        # Partial heap selection keeps only `limit` candidates, and only those are serialised.
+        newest = heapq.nlargest(limit, self._store.results_for_app(app_id), key=_timestamp_of)
+        return [r.to_dict() for r in newest]
 
     async def result_exists(self, result_id: str) -> bool:
-        return any(r.id == result_id for r in self._store.results)
+        return result_id in self._store.result_ids()
 
     async def results_exist(self, result_ids: List[str]) -> List[str]:
-        existing = {r.id for r in self._store.results}
+        existing = self._store.result_ids()
         return [rid for rid in result_ids if rid in existing]
 
 
-def _pick_telemetry_fields(row: Dict[str, Any]) -> Dict[str, Any]:
-    allowed = {
-        "id",
-        "app_id",
-        "timestamp",
-        "model_id",
-        "model_version",
-        "input_text",
-        "output_text",
-        "expected_output",
-        "user_id",
-        "latency_ms",
-        "metadata",
-    }
-    payload = {key: value for key, value in row.items() if key in allowed}
+def _record_from_row(row: Dict[str, Any]) -> TelemetryRecord:
+    # Called once per telemetry row, so fields are read straight-line and passed
+    # positionally (in TelemetryRecord field order) rather than through an intermediate
+    # kwargs dict. Required fields raise KeyError when missing; optional ones default to None.
+    get = row.get
 
     # Normalise trace identity for dedupe:
     # - prefer metadata.trace_id when present
     # - fall back to top-level trace_id/traceparent fields from telemetry ingestion
-    metadata = dict(payload.get("metadata") or {})
+    metadata = dict(get("metadata") or {})
     if not metadata.get("trace_id"):
-        trace_id = row.get("trace_id") or row.get("traceId") or row.get("traceparent")
+        trace_id = get("trace_id") or get("traceId") or get("traceparent")
         if trace_id:
             metadata["trace_id"] = str(trace_id)
-    payload["metadata"] = metadata
-    return payload
+
+    return TelemetryRecord(
+        row["id"],
+        row["app_id"],
+        row["timestamp"],
+        row["model_id"],
+        row["model_version"],
+        row["input_text"],
+        row["output_text"],
+        get("expected_output"),
+        get("user_id"),
+        get("latency_ms"),
+        metadata,
+    )
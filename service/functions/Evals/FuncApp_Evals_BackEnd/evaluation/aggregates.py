@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+from typing import FrozenSet, Sequence, Tuple
+
+from data.models import TelemetryRecord
+
+_DEGRADED_STATUSES = frozenset({"error", "failed", "timeout"})
+_DEGRADED_RESOURCE_UTILIZATION = 0.95
+# Below this many values sorted() is faster than a heap selection (crossover measured ~2-5k).
+_HEAP_SELECT_MIN_VALUES = 4096
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_SENTENCE_RE = re.compile(r"[.!?]")
+
+
+def nearest_rank_percentile(values: Sequence[float], fraction: float) -> float:
+    """Value at the ceil(n * fraction) rank of ``values``; large inputs avoid a full sort."""
+    idx = max(0, math.ceil(len(values) * fraction) - 1)
+    if len(values) < _HEAP_SELECT_MIN_VALUES:
+        # At chunk-sized inputs (default 100) a C-level sort beats heap bookkeeping.
+        return sorted(values)[idx]
+    tail = len(values) - idx
+    # Select from whichever side is shorter: heapq keeps only that many items.
+    if tail <= idx + 1:
+        return heapq.nlargest(tail, values)[-1]
+    return heapq.nsmallest(idx + 1, values)[-1]
+
+
+@dataclass(frozen=True)
+class TextAnalysis:
+    """Token and sentence features of one text, shared by every text-based policy."""
+
+    words: Tuple[str, ...]
+    tokens: FrozenSet[str]
+    unique_ratio: float
+    sentence_count: int
+    ends_with_sentence_punct: bool
+    lower_text: str
+
+
+@lru_cache(maxsize=10000)
+def analyze_text(text: str) -> TextAnalysis:
+    raw = text or ""
+    lower = raw.lower()
+    words = tuple(_TOKEN_RE.findall(lower))
+    tokens = frozenset(words)
+    return TextAnalysis(
+        words=words,
+        tokens=tokens,
+        unique_ratio=len(tokens) / max(len(words), 1),
+        sentence_count=max(1, len(_SENTENCE_RE.findall(raw))),
+        ends_with_sentence_punct=raw.strip().endswith((".", "!", "?")),
+        lower_text=lower,
+    )
+
+
+@dataclass(frozen=True)
+class RecordAggregates:
+    """Per-chunk columns and numeric features shared by every policy evaluating the same records.
+
+    Every column is computed on first access and then cached, so a policy only pays
+    for what it reads and the next policy on the same chunk reuses it. Text columns
+    are positionally aligned with the source records and already normalized
+    (``None`` -> ``""``), so policies iterate plain strings.
+    """
+
+    records: Tuple[TelemetryRecord, ...] = field(repr=False)
+
+    @classmethod
+    def from_records(cls, records: Sequence[TelemetryRecord]) -> "RecordAggregates":
+        return cls(records=tuple(records))
+
+    @property
+    def sample_count(self) -> int:
+        return len(self.records)
+
+    @cached_property
+    def input_texts(self) -> Tuple[str, ...]:
+        return tuple(record.input_text or "" for record in self.records)
+
+    @cached_property
+    def output_texts(self) -> Tuple[str, ...]:
+        return tuple(record.output_text or "" for record in self.records)
+
+    @cached_property
+    def input_analyses(self) -> Tuple[TextAnalysis, ...]:
+        return tuple(map(analyze_text, self.input_texts))
+
+    @cached_property
+    def output_analyses(self) -> Tuple[TextAnalysis, ...]:
+        # Each output is lowered and tokenized once here; the toxicity, fairness, compliance,
+        # groundedness, relevance, coherence and readability policies all read this tuple.
+        return tuple(map(analyze_text, self.output_texts))
+
+    @cached_property
+    def latencies(self) -> Tuple[float, ...]:
+        return tuple(float(record.latency_ms) for record in self.records if record.latency_ms is not None)
+
+    @cached_property
+    def latency_sum(self) -> float:
+        return math.fsum(self.latencies)
+
+    @cached_property
+    def _output_length_sums(self) -> Tuple[int, int]:
+        total = 0
+        sq_total = 0
+        for output_text in self.output_texts:
+            output_length = len(output_text)
+            total += output_length
+            sq_total += output_length * output_length
+        return total, sq_total
+
+    @property
+    def output_length_sum(self) -> int:
+        return self._output_length_sums[0]
+
+    @property
+    def output_length_sq_sum(self) -> int:
+        return self._output_length_sums[1]
+
+    @cached_property
+    def degraded_events(self) -> int:
+        # Only the availability policy reads this; a malformed resource_utilization
+        # must fail that policy alone, not every policy on the chunk.
+        degraded_events = 0
+        for record in self.records:
+            metadata = record.metadata
+            status = str(metadata.get("status", "")).lower()
+            resource_util = float(metadata.get("resource_utilization", 0.0) or 0.0)
+            if status in _DEGRADED_STATUSES or resource_util >= _DEGRADED_RESOURCE_UTILIZATION:
+                degraded_events += 1
+        return degraded_events
+
+    @property
+    def output_length_mean(self) -> float:
+        return self.output_length_sum / self.sample_count if self.sample_count else 0.0
+
+    @property
+    def output_length_pstdev(self) -> float:
+        n = self.sample_count
+        if n < 2:
+            return 0.0
+        # Integer sums keep the variance numerator exact: n*sum(x^2) - sum(x)^2.
+        return math.sqrt(n * self.output_length_sq_sum - self.output_length_sum**2) / n
+
+    @cached_property
+    def latency_stats(self) -> Tuple[float, float]:
+        """(mean, p95) latency, computed once per aggregate and shared by every reader."""
+        if not self.latencies:
+            return 0.0, 0.0
+        return self.latency_sum / len(self.latencies), nearest_rank_percentile(self.latencies, 0.95)
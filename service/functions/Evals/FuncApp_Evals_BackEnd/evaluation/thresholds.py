@@ -1,19 +1,39 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Dict, List, Mapping, Sequence, Tuple
 
 from config.models import ThresholdConfig
 from data.models import MetricValueVersioned, ThresholdBreach
 
+# "min" breaches when value < threshold and "max" when value > threshold, i.e. when
+# -value < -threshold. Folding the direction into a sign makes every check a single
+# comparison: sign * value < sign * threshold. Unsupported directions get sign 0.
+_DIRECTION_SIGNS = {"min": 1.0, "max": -1.0}
+
+# metric_name -> ((sign, sign * threshold value, source config), ...)
+ThresholdIndex = Mapping[str, Tuple[Tuple[float, float, ThresholdConfig], ...]]
+
+
+def build_threshold_index(threshold_map: Mapping[str, Sequence[ThresholdConfig]]) -> ThresholdIndex:
+    """Resolve each metric's thresholds once so repeated evaluations skip the direction dispatch."""
+    index: Dict[str, Tuple[Tuple[float, float, ThresholdConfig], ...]] = {}
+    for metric_name, thresholds in threshold_map.items():
+        entries = []
+        for threshold in thresholds:
+            sign = _DIRECTION_SIGNS.get(threshold.direction, 0.0)
+            entries.append((sign, sign * threshold.value, threshold))
+        index[metric_name] = tuple(entries)
+    return index
+
 
 def evaluate_thresholds(
     metrics: List[MetricValueVersioned],
-    threshold_map: Dict[str, List[ThresholdConfig]],
+    threshold_map: Mapping[str, Sequence[ThresholdConfig]],
 ) -> List[ThresholdBreach]:
     breaches: List[ThresholdBreach] = []
 
     for metric in metrics:
-        thresholds = threshold_map.get(metric.metric_name, [])
+        thresholds = threshold_map.get(metric.metric_name, ())
         for threshold in thresholds:
             if _is_breached(metric.value, threshold):
                 breaches.append(
@@ -29,6 +49,35 @@ def evaluate_thresholds(
     return breaches
 
 
+def evaluate_thresholds_indexed(
+    metrics: List[MetricValueVersioned],
+    threshold_index: ThresholdIndex,
+) -> List[ThresholdBreach]:
+    """Same result as ``evaluate_thresholds`` against an index from ``build_threshold_index``."""
+    breaches: List[ThresholdBreach] = []
+
+    for metric in metrics:
+        entries = threshold_index.get(metric.metric_name)
+        if not entries:
+            continue
+        value = metric.value
+        for sign, signed_threshold, threshold in entries:
+            if not sign:
+                raise ValueError(f"Unsupported threshold direction: {threshold.direction}")
+            if sign * value < signed_threshold:
+                breaches.append(
+                    ThresholdBreach(
+                        metric_name=metric.metric_name,
+                        level=threshold.level,
+                        threshold_value=threshold.value,
+                        actual_value=value,
+                        direction=threshold.direction,
+                    )
+                )
+
+    return breaches
+
+
 def _is_breached(value: float, threshold: ThresholdConfig) -> bool:
     if threshold.direction == "min":
         return value < threshold.value
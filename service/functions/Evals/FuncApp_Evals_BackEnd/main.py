@@ -9,7 +9,7 @@ from datetime import datetime, timedelta, timezone
 from typing import List, Optional
 from uuid import uuid4
 
-from config.loader import list_resolved_apps, load_config, resolve_app_config
+from config.loader import load_config, resolve_app_config
 from config.models import ResolvedAppConfig
 from data.cosmos_client import CosmosDbClient
 from data.otlp_repository import OtlpTelemetryRepository
@@ -17,7 +17,7 @@ from data.repositories import (
     CosmosEvaluationRepository,
     CosmosTelemetryRepository,
 )
-from evaluation.thresholds import evaluate_thresholds
+from evaluation.thresholds import build_threshold_index, evaluate_thresholds_indexed
 from orchestration.batch_partition import select_group, total_groups
 from orchestration.batch_runner import BatchEvaluationRunner
 from orchestration.job_tracking import SqliteJobStatusStore
@@ -109,6 +109,7 @@ async def run_batch(
         telemetry_repo = CosmosTelemetryRepository(
             cosmos,
             page_size=root_config.cosmos_telemetry_page_size,
+            partition_concurrency=root_config.cosmos_telemetry_partition_concurrency,
         )
     elif telemetry_source_type == "otlp":
         telemetry_repo = OtlpTelemetryRepository(
@@ -122,6 +123,7 @@ async def run_batch(
         telemetry_repo,
         evaluation_repo,
         policy_concurrency=resolved_policy_concurrency,
+        process_workers=root_config.batch_policy_process_workers,
     )
     scheduler = CronScheduler()
 
@@ -130,21 +132,23 @@ async def run_batch(
         if group_size > 0:
             logger.info("--group-size ignored when --app-id is specified (single app mode).")
     else:
-        all_apps = sorted(list_resolved_apps(root_config), key=lambda a: a.app_id)
+        # Partition on the sorted ids and resolve only this group's apps.
+        all_app_ids = sorted(root_config.applications)
         if group_size > 0:
-            groups = total_groups(len(all_apps), group_size)
-            target_apps = select_group(all_apps, group_size, group_index)
+            groups = total_groups(len(all_app_ids), group_size)
+            selected_ids = select_group(all_app_ids, group_size, group_index)
             logger.info(
                 "Batch group selection: group_index=%d total_groups=%d group_size=%d apps_in_group=%d",
                 group_index,
                 groups,
                 group_size,
-                len(target_apps),
+                len(selected_ids),
             )
         else:
             if group_index != 0:
                 logger.info("--group-index ignored because --group-size is 0.")
-            target_apps = all_apps
+            selected_ids = all_app_ids
+        target_apps = [resolve_app_config(root_config, selected_id) for selected_id in selected_ids]
 
     if not target_apps:
         if app_id:
@@ -185,8 +189,9 @@ async def run_batch(
             try:
                 results = await runner.run_for_application(app, start_ts=start, end_ts=end)
                 notification_breaches = []
+                threshold_index = build_threshold_index(app.thresholds)
                 for result in results:
-                    notification_breaches.extend(evaluate_thresholds(result.metrics, app.thresholds))
+                    notification_breaches.extend(evaluate_thresholds_indexed(result.metrics, threshold_index))
                 total_breaches = len(notification_breaches)
                 next_run = scheduler.next_run_time(app, now=now)
                 logger.info(
@@ -250,7 +255,10 @@ async def run_batch(
         )
     )
     semaphore = asyncio.Semaphore(resolved_app_concurrency)
-    await asyncio.gather(*[_process_app(app, semaphore) for app in target_apps])
+    try:
+        await asyncio.gather(*[_process_app(app, semaphore) for app in target_apps])
+    finally:
+        runner.close()
     try:
         await drain_alert_queue(root_config.alerting.shutdown_drain_timeout_seconds)
     except asyncio.TimeoutError:
@@ -3,28 +3,74 @@ from __future__ import annotations
 import asyncio
 import hashlib
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional
+from typing import Any, List, Mapping, Optional, Tuple
 
-from config.models import ResolvedAppConfig
+from config.models import PolicyConfig, ResolvedAppConfig
 from data.models import EvaluationResult, MetricValueVersioned, TelemetryRecord
 from data.repositories import EvaluationRepository, TelemetryRepository
-from evaluation.policies import EvaluationPolicy, build_policy_registry
+from evaluation.aggregates import RecordAggregates
+from evaluation.policies import POLICY_REGISTRY, EvaluationPolicy
 
 logger = logging.getLogger(__name__)
 
 
+def _evaluate_chunk_sync(
+    app_id: str,
+    records: List[TelemetryRecord],
+    policies: List[Tuple[type[EvaluationPolicy], PolicyConfig]],
+) -> List[List[MetricValueVersioned]]:
+    """Worker-process entry point; module-level so the executor can pickle it.
+
+    One call evaluates every pooled policy of a chunk, so the records cross the process
+    boundary once and the policies share one RecordAggregates built in the worker.
+    """
+    aggregates = RecordAggregates.from_records(records)
+    metrics: List[List[MetricValueVersioned]] = []
+    for policy_type, policy_cfg in policies:
+        policy = policy_type(policy_cfg)
+        policy.aggregates = aggregates
+        metrics.append(policy.compute(app_id, records))
+    return metrics
+
+
+@dataclass(frozen=True)
+class _PendingPolicy:
+    name: str
+    policy_type: type
+    config: PolicyConfig
+    version: str
+    result_id: str
+
+
 class BatchEvaluationRunner:
     def __init__(
         self,
         telemetry_repo: TelemetryRepository,
         evaluation_repo: EvaluationRepository,
         policy_concurrency: int = 10,
+        process_workers: int = 0,
     ) -> None:
         self.telemetry_repo = telemetry_repo
         self.evaluation_repo = evaluation_repo
-        self.policy_registry = build_policy_registry()
+        self.policy_registry: Mapping[str, type[EvaluationPolicy]] = POLICY_REGISTRY
         self._policy_concurrency = max(1, int(policy_concurrency))
+        # 0 keeps policies on the event loop; >0 offloads EvaluationPolicy subclasses
+        # to a lazily created process pool so CPU-bound evaluations escape the GIL.
+        self._process_workers = max(0, int(process_workers))
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._process_workers)
+        return self._executor
 
     async def run_for_application(
         self,
@@ -55,11 +101,13 @@ class BatchEvaluationRunner:
             handled_chunks = True
             total_records += len(chunk)
             dedupe_trace_id = self._derive_trace_identity(chunk, start, end)
+            # Shared per-chunk columns; each is computed once, on first use by any policy.
+            chunk_aggregates = RecordAggregates.from_records(chunk)
             
             # Pre-calculate all expected result IDs to bulk check for duplicates
             expected_ids = []
             for policy_name in app_cfg.policy_names:
-                policy_cfg = next((p for p in app_cfg.policies if p.name == policy_name), None)
+                policy_cfg = app_cfg.policies_by_name.get(policy_name)
                 if policy_cfg:
                     policy_version = str(policy_cfg.parameters.get("version", "1.0"))
                     rid = self._stable_batch_result_id(
@@ -79,39 +127,18 @@ class BatchEvaluationRunner:
                         app_cfg.app_id,
                     )
 
-            async def _run_policy(policy_name: str, current_chunk: List[TelemetryRecord] = chunk, current_dedupe: str = dedupe_trace_id, current_existing: set[str] = existing_ids) -> EvaluationResult | None:
-                async with policy_sem:
-                    return await self._evaluate_policy(
-                        policy_name,
-                        app_cfg,
-                        current_chunk,
-                        start,
-                        end,
-                        current_dedupe,
-                        current_existing,
-                    )
-
-            tasks = [_run_policy(policy_name) for policy_name in app_cfg.policy_names]
-            chunk_results = await asyncio.gather(*tasks)
-            all_results.extend([result for result in chunk_results if result is not None])
+            all_results.extend(
+                await self._evaluate_chunk(
+                    app_cfg, chunk, start, end, dedupe_trace_id, existing_ids, chunk_aggregates, policy_sem
+                )
+            )
 
         if not handled_chunks:
             # If no telemetry was found, evaluate once with empty list to produce zero metrics
             dedupe_trace_id = self._derive_trace_identity([], start, end)
-            async def _run_empty_policy(policy_name: str) -> EvaluationResult | None:
-                async with policy_sem:
-                    return await self._evaluate_policy(
-                        policy_name,
-                        app_cfg,
-                        [],
-                        start,
-                        end,
-                        dedupe_trace_id,
-                        set(),
-                    )
-            tasks = [_run_empty_policy(policy_name) for policy_name in app_cfg.policy_names]
-            empty_results = await asyncio.gather(*tasks)
-            all_results.extend([result for result in empty_results if result is not None])
+            all_results.extend(
+                await self._evaluate_chunk(app_cfg, [], start, end, dedupe_trace_id, set(), None, policy_sem)
+            )
 
         logger.debug("Fetched %d telemetry records total for app_id=%s", total_records, app_cfg.app_id)
 
@@ -126,20 +153,13 @@ class BatchEvaluationRunner:
 
         return all_results
 
-    async def _evaluate_policy(
-        self,
-        policy_name: str,
-        app_cfg: ResolvedAppConfig,
-        records: List[TelemetryRecord],
-        window_start: str,
-        window_end: str,
-        dedupe_trace_id: str,
-        existing_result_ids: set[str],
-    ) -> EvaluationResult | None:
+    def _pending_policy(
+        self, policy_name: str, app_cfg: ResolvedAppConfig, dedupe_trace_id: str
+    ) -> _PendingPolicy:
         if policy_name not in self.policy_registry:
             raise KeyError(f"Policy not registered: {policy_name}")
 
-        policy_cfg = next((p for p in app_cfg.policies if p.name == policy_name), None)
+        policy_cfg = app_cfg.policies_by_name.get(policy_name)
         if policy_cfg is None:
             raise KeyError(f"Policy config missing for: {policy_name}")
 
@@ -150,31 +170,77 @@ class BatchEvaluationRunner:
             trace_id=dedupe_trace_id,
             value_object_version=policy_version,
         )
-        if result_id in existing_result_ids:
-            return None
+        return _PendingPolicy(policy_name, self.policy_registry[policy_name], policy_cfg, policy_version, result_id)
 
-        policy_type = self.policy_registry[policy_name]
-        policy: EvaluationPolicy = policy_type(policy_cfg)
+    async def _evaluate_chunk(
+        self,
+        app_cfg: ResolvedAppConfig,
+        records: List[TelemetryRecord],
+        window_start: str,
+        window_end: str,
+        dedupe_trace_id: str,
+        existing_result_ids: set[str],
+        aggregates: Optional[RecordAggregates],
+        policy_sem: asyncio.Semaphore,
+    ) -> List[EvaluationResult]:
+        pending = [
+            item
+            for item in (
+                self._pending_policy(policy_name, app_cfg, dedupe_trace_id) for policy_name in app_cfg.policy_names
+            )
+            if item.result_id not in existing_result_ids
+        ]
+        # With a process pool, built-in policies go to a worker together as one task; anything
+        # else (custom or async policies) is evaluated on the event loop.
+        pooled: List[_PendingPolicy] = []
+        inline: List[_PendingPolicy] = []
+        for item in pending:
+            if self._process_workers and issubclass(item.policy_type, EvaluationPolicy):
+                pooled.append(item)
+            else:
+                inline.append(item)
 
-        metrics = await policy.evaluate(app_cfg.app_id, records)
-        metrics = self._normalize_metrics_for_traceability(
-            metrics=metrics,
-            app_id=app_cfg.app_id,
-            policy_name=policy_name,
-            policy_version=policy_version,
-            window_start=window_start,
-            window_end=window_end,
-            dedupe_trace_id=dedupe_trace_id,
-        )
+        async def _run_inline(item: _PendingPolicy) -> List[MetricValueVersioned]:
+            async with policy_sem:
+                policy: Any = item.policy_type(item.config)
+                if aggregates is not None and isinstance(policy, EvaluationPolicy):
+                    policy.aggregates = aggregates
+                return await policy.evaluate(app_cfg.app_id, records)
 
-        return EvaluationResult(
-            id=result_id,
-            app_id=app_cfg.app_id,
-            timestamp=datetime.now(timezone.utc).isoformat(),
-            policy_name=policy_name,
-            metrics=metrics,
-            breaches=[],
-        )
+        async def _run_pooled() -> List[List[MetricValueVersioned]]:
+            if not pooled:
+                return []
+            return await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(),
+                _evaluate_chunk_sync,
+                app_cfg.app_id,
+                records,
+                [(item.policy_type, item.config) for item in pooled],
+            )
+
+        pooled_metrics, *inline_metrics = await asyncio.gather(_run_pooled(), *map(_run_inline, inline))
+        metrics_by_name = dict(zip((item.name for item in pooled), pooled_metrics))
+        metrics_by_name.update(zip((item.name for item in inline), inline_metrics))
+
+        return [
+            EvaluationResult(
+                id=item.result_id,
+                app_id=app_cfg.app_id,
+                timestamp=datetime.now(timezone.utc).isoformat(),
+                policy_name=item.name,
+                metrics=self._normalize_metrics_for_traceability(
+                    metrics=metrics_by_name[item.name],
+                    app_id=app_cfg.app_id,
+                    policy_name=item.name,
+                    policy_version=item.version,
+                    window_start=window_start,
+                    window_end=window_end,
+                    dedupe_trace_id=dedupe_trace_id,
+                ),
+                breaches=[],
+            )
+            for item in pending
+        ]
 
     def _stable_batch_result_id(
         self,
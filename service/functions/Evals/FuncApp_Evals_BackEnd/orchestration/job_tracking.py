@@ -3,7 +3,7 @@ from __future__ import annotations
 import threading
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 
 def utc_now_iso() -> str:
@@ -75,29 +75,30 @@ class SqliteJobStatusStore:
 
     def load_runs(self) -> List[Dict[str, Any]]:
         with self._lock:
-            runs = []
+            # Three flat scans grouped in memory instead of a query per run and per item.
             cur = self.conn.cursor()
-            cur.execute("SELECT * FROM runs")
-            for run_row in cur.fetchall():
-                run_dict = dict(run_row)
-
-                # Fetch matching items
-                cur.execute("SELECT * FROM items WHERE run_id = ?", (run_dict["run_id"],))
-                items = []
-                for item_row in cur.fetchall():
-                    item_dict = dict(item_row)
-
-                    # Fetch matching logs
-                    cur.execute(
-                        "SELECT timestamp, level, message FROM logs "
-                        "WHERE run_id = ? AND item_id = ? ORDER BY id ASC",
-                        (run_dict["run_id"], item_dict["item_id"]),
+            runs = [dict(row) for row in cur.execute("SELECT * FROM runs")]
+            items_by_run: Dict[str, List[Dict[str, Any]]] = {}
+            item_by_key: Dict[Tuple[str, str], Dict[str, Any]] = {}
+            for item_row in cur.execute("SELECT * FROM items ORDER BY run_id, item_id"):
+                item_dict = dict(item_row)
+                item_dict["logs"] = []
+                items_by_run.setdefault(item_dict["run_id"], []).append(item_dict)
+                item_by_key[(item_dict["run_id"], item_dict["item_id"])] = item_dict
+            for log_row in cur.execute(
+                "SELECT run_id, item_id, timestamp, level, message FROM logs ORDER BY id ASC"
+            ):
+                item_dict = item_by_key.get((log_row["run_id"], log_row["item_id"]))
+                if item_dict is not None:
+                    item_dict["logs"].append(
+                        {
+                            "timestamp": log_row["timestamp"],
+                            "level": log_row["level"],
+                            "message": log_row["message"],
+                        }
                     )
-                    item_dict["logs"] = [dict(log_row) for log_row in cur.fetchall()]
-                    items.append(item_dict)
-
-                run_dict["items"] = items
-                runs.append(run_dict)
+            for run_dict in runs:
+                run_dict["items"] = items_by_run.get(run_dict["run_id"], [])
             return runs
 
     def start_run(
@@ -111,23 +112,24 @@ class SqliteJobStatusStore:
     ) -> None:
         with self._lock:
             started_at = utc_now_iso()
-            self.conn.execute(
-                """
-                INSERT OR IGNORE INTO runs 
-                (run_id, status, started_at, window_start, window_end, group_size, group_index)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (run_id, "running", started_at, window_start, window_end, group_size, group_index)
-            )
-
-            for app_id in app_ids:
+            # One transaction for the run and all of its items, not a commit per app.
+            with self.conn:
+                self.conn.execute("BEGIN")
                 self.conn.execute(
+                    """
+                    INSERT OR IGNORE INTO runs 
+                    (run_id, status, started_at, window_start, window_end, group_size, group_index)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (run_id, "running", started_at, window_start, window_end, group_size, group_index)
+                )
+                self.conn.executemany(
                     """
                     INSERT OR IGNORE INTO items 
                     (run_id, item_id, status)
                     VALUES (?, ?, ?)
                     """,
-                    (run_id, app_id, "pending")
+                    [(run_id, app_id, "pending") for app_id in app_ids]
                 )
 
     def mark_item_running(self, run_id: str, item_id: str) -> None:
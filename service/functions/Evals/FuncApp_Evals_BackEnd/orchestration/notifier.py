@@ -7,6 +7,7 @@ import smtplib
 import ssl
 import time
 from dataclasses import dataclass
+from functools import lru_cache
 from email.message import EmailMessage
 from typing import List, Dict, Any, Optional
 from urllib.request import Request, urlopen
@@ -72,7 +73,10 @@ _teams_breaker = CircuitBreaker()
 
 def filter_breaches_by_min_level(breaches: List[ThresholdBreach], min_level: str) -> List[ThresholdBreach]:
     threshold = _LEVEL_ORDER.get(min_level.lower(), 1)
-    return [b for b in breaches if _LEVEL_ORDER.get(b.level.lower(), 1) >= threshold]
+    # Breaches carry only a handful of distinct level strings: rank each once, then
+    # the filter is a single dict lookup per breach.
+    keep = {level: _LEVEL_ORDER.get(level.lower(), 1) >= threshold for level in {b.level for b in breaches}}
+    return [b for b in breaches if keep[b.level]]
 
 
 async def enqueue_alert(
@@ -157,26 +161,13 @@ async def alert_worker(
                     existing.breaches.extend(item.breaches)
 
             try:
-                for app_id, agg_item in grouped.items():
-                    subject = f"[AI Eval] {app_id} threshold alert ({len(agg_item.breaches)} breach(es))"
-                    body = _build_body(
-                        app_id=agg_item.app_id,
-                        window_start=agg_item.window_start,
-                        window_end=agg_item.window_end,
-                        breaches=agg_item.breaches
+                # Apps, and the channels within each app, are independent network round-trips.
+                await asyncio.gather(
+                    *(
+                        _dispatch_alert(agg_item, email_breaker, teams_breaker)
+                        for agg_item in grouped.values()
                     )
-
-                    if agg_item.config.email.enabled:
-                        try:
-                            await email_breaker.call(asyncio.to_thread, _send_email, agg_item.config, subject, body)
-                        except Exception as e:
-                            logger.error(f"Failed to send email alert for {app_id}: {e}")
-
-                    if agg_item.config.teams.enabled:
-                        try:
-                            await teams_breaker.call(asyncio.to_thread, _send_teams, agg_item.config, subject, body)
-                        except Exception as e:
-                            logger.error(f"Failed to send Teams alert for {app_id}: {e}")
+                )
             finally:
                 # Ensure queue bookkeeping is always advanced, even on send errors.
                 for _ in batch:
@@ -189,19 +180,49 @@ async def alert_worker(
             logger.exception("Unexpected error in alert_worker: %s", e)
 
 
+async def _dispatch_alert(
+    item: AlertItem,
+    email_breaker: CircuitBreaker,
+    teams_breaker: CircuitBreaker,
+) -> None:
+    subject = f"[AI Eval] {item.app_id} threshold alert ({len(item.breaches)} breach(es))"
+    body = _build_body(
+        app_id=item.app_id,
+        window_start=item.window_start,
+        window_end=item.window_end,
+        breaches=item.breaches,
+    )
+    sends = []
+    if item.config.email.enabled:
+        sends.append(_send_via(email_breaker, _send_email, "email", item, subject, body))
+    if item.config.teams.enabled:
+        sends.append(_send_via(teams_breaker, _send_teams, "Teams", item, subject, body))
+    await asyncio.gather(*sends)
+
+
+async def _send_via(breaker: CircuitBreaker, sender, channel: str, item: AlertItem, subject: str, body: str) -> None:
+    try:
+        await breaker.call(asyncio.to_thread, sender, item.config, subject, body)
+    except Exception as e:
+        logger.error(f"Failed to send {channel} alert for {item.app_id}: {e}")
+
+
 def _build_body(app_id: str, window_start: str, window_end: str, breaches: List[ThresholdBreach]) -> str:
-    lines = [
-        f"Application: {app_id}",
-        f"Window: {window_start} .. {window_end}",
-        f"Breaches: {len(breaches)}",
-        "",
-    ]
-    for breach in breaches:
-        lines.append(
-            f"- metric={breach.metric_name} level={breach.level} "
-            f"actual={breach.actual_value} threshold={breach.threshold_value} direction={breach.direction}"
-        )
-    return "\n".join(lines)
+    header = f"Application: {app_id}\nWindow: {window_start} .. {window_end}\nBreaches: {len(breaches)}\n"
+    if not breaches:
+        return header
+    return header + "\n" + "\n".join(
+        f"- metric={b.metric_name} level={b.level} "
+        f"actual={b.actual_value} threshold={b.threshold_value} direction={b.direction}"
+        for b in breaches
+    )
+
+
+@lru_cache(maxsize=1)
+def _ssl_context() -> ssl.SSLContext:
+    # create_default_context() loads the system CA bundle; do it once per process, on
+    # first use, rather than per email. SSLContext is safe to share across threads.
+    return ssl.create_default_context()
 
 
 def _send_email(config: AlertingConfig, subject: str, body: str) -> None:
@@ -218,7 +239,7 @@ def _send_email(config: AlertingConfig, subject: str, body: str) -> None:
 
     if email_cfg.use_tls:
         with smtplib.SMTP(email_cfg.smtp_host, email_cfg.smtp_port, timeout=15) as smtp:
-            smtp.starttls(context=ssl.create_default_context())
+            smtp.starttls(context=_ssl_context())
             if email_cfg.username:
                 smtp.login(email_cfg.username, email_cfg.password)
             smtp.send_message(message)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Dict, List, Optional, Tuple
 
 from croniter import croniter
 
@@ -11,6 +11,17 @@ from config.models import ResolvedAppConfig
 class CronScheduler:
     def __init__(self) -> None:
         self._last_run: Dict[str, datetime] = {}
+        # Parsed schedules keyed by (expression, tzinfo); apps sharing a cron string share one.
+        self._iters: Dict[Tuple[str, Optional[tzinfo]], croniter] = {}
+
+    def _iter_at(self, expression: str, start: datetime) -> croniter:
+        key = (expression, start.tzinfo)
+        it = self._iters.get(key)
+        if it is None:
+            it = self._iters[key] = croniter(expression, start)
+        else:
+            it.set_current(start, force=True)
+        return it
 
     def due_apps(self, apps: List[ResolvedAppConfig], now: Optional[datetime] = None) -> List[ResolvedAppConfig]:
         current = now or datetime.now(timezone.utc)
@@ -23,7 +34,7 @@ class CronScheduler:
                 continue
 
             base = current - timedelta(minutes=1)
-            prev_tick = croniter(app.batch_time, base).get_prev(datetime)
+            prev_tick = self._iter_at(app.batch_time, base).get_prev(datetime)
             if prev_tick <= current and last_run < prev_tick:
                 due.append(app)
 
@@ -34,4 +45,4 @@ class CronScheduler:
 
     def next_run_time(self, app: ResolvedAppConfig, now: Optional[datetime] = None) -> datetime:
         current = now or datetime.now(timezone.utc)
-        return croniter(app.batch_time, current).get_next(datetime)
+        return self._iter_at(app.batch_time, current).get_next(datetime)
@@ -15,7 +15,7 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from config.loader import list_resolved_apps, load_config
+from config.loader import load_config
 from orchestration.batch_partition import total_groups
 
 logger = logging.getLogger(__name__)
@@ -210,7 +210,8 @@ def main() -> int:
     logging.basicConfig(level=getattr(logging, cfg.log_level), format="%(asctime)s [%(levelname)s] %(message)s")
 
     root = load_config(cfg.config_path)
-    app_count = len(list_resolved_apps(root))
+    # Sharding only needs the count; resolving every app here would be wasted work.
+    app_count = len(root.applications)
     shard_count = total_groups(app_count, cfg.group_size)
 
     logger.info(
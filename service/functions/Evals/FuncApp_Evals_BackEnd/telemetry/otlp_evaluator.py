@@ -8,7 +8,7 @@ import resource
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterator, List, Tuple
+from typing import Any, Dict, Iterator, List, Mapping, Tuple
 
 import ijson
 from flask import Flask, jsonify, request
@@ -16,7 +16,8 @@ from flask import Flask, jsonify, request
 from config.loader import load_config, resolve_app_config
 from data.cosmos_client import CosmosDbClient
 from data.models import EvaluationResult, TelemetryRecord
-from evaluation.policies import EvaluationPolicy, build_policy_registry
+from evaluation.aggregates import RecordAggregates
+from evaluation.policies import POLICY_REGISTRY, EvaluationPolicy
 
 logger = logging.getLogger(__name__)
 
@@ -62,7 +63,7 @@ class OtlpTraceEvaluationService:
         if self.root_config.cosmos is None:
             raise ValueError("Cosmos DB configuration is required.")
         self.cosmos = cosmos_client or CosmosDbClient(self.root_config.cosmos)
-        self.policy_registry = build_policy_registry()
+        self.policy_registry: Mapping[str, type[EvaluationPolicy]] = POLICY_REGISTRY
         self._max_events_per_request = max(1, int(self.root_config.otlp_max_events_per_request))
         self._memory_warn_mb = max(1, int(self.root_config.memory_usage_warn_mb))
         self._memory_hard_limit_mb = max(0, int(self.root_config.memory_usage_hard_limit_mb))
@@ -231,7 +232,7 @@ class OtlpTraceEvaluationService:
                 if policy_name not in self.policy_registry:
                     logger.warning("Skipping unregistered policy=%s for app_id=%s", policy_name, app_id)
                     continue
-                policy_cfg = next((p for p in app_cfg.policies if p.name == policy_name), None)
+                policy_cfg = app_cfg.policies_by_name.get(policy_name)
                 if policy_cfg is None:
                     logger.warning("Skipping missing policy config policy=%s for app_id=%s", policy_name, app_id)
                     continue
@@ -268,10 +269,18 @@ class OtlpTraceEvaluationService:
 
         # Step C: Evaluate all policies concurrently
         async def evaluate_all() -> List[Any]:
-            futures = [
-                task[4].evaluate(task[0], task[2])
-                for task in valid_tasks
-            ]
+            # Policies for the same trace group share one pass over its records.
+            aggregates_by_group: Dict[Tuple[str, str], RecordAggregates] = {}
+            futures = []
+            for task in valid_tasks:
+                group_key = (task[0], task[1])
+                aggregates = aggregates_by_group.get(group_key)
+                if aggregates is None:
+                    aggregates = aggregates_by_group[group_key] = RecordAggregates.from_records(task[2])
+                policy = task[4]
+                if isinstance(policy, EvaluationPolicy):
+                    policy.aggregates = aggregates
+                futures.append(policy.evaluate(task[0], task[2]))
             return await asyncio.gather(*futures, return_exceptions=True)
 
         batch_metrics = asyncio.run(evaluate_all())
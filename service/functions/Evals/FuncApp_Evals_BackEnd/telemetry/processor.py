@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import json
 import logging
+import warnings
+from concurrent.futures import Executor, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
-from typing import Any, Dict, Iterable, Optional, Protocol
+from typing import Any, Dict, Iterable, List, Optional, Protocol
 from uuid import uuid4
 
 from data.models import TelemetryRecord
@@ -56,6 +58,39 @@ class TelemetryEventProcessor:
         self._sink = sink
 
     def process_event(self, event: Dict[str, Any], enqueued_time_utc: Optional[str] = None) -> Dict[str, Any]:
+        return self._sink.upsert_telemetry(self._build_document(event, enqueued_time_utc))
+
+    def process_events(
+        self,
+        events: Iterable[Dict[str, Any]],
+        enqueued_time_utc: Optional[str] = None,
+        executor: Optional[Executor] = None,
+    ) -> int:
+        """Validate and write a batch of events.
+
+        With an ``executor``, each partition's documents are written as a separate task so
+        partitions proceed concurrently; all writes finish before the first error is raised.
+        """
+        # Validate every event before writing so a bad event does not leave a partial batch.
+        documents = [self._build_document(event, enqueued_time_utc) for event in events]
+        upsert_many = getattr(self._sink, "upsert_telemetry_many", None)
+        if upsert_many is None:
+            for document in documents:
+                self._sink.upsert_telemetry(document)
+        elif executor is None:
+            upsert_many(documents)
+        else:
+            grouped: Dict[str, List[Dict[str, Any]]] = {}
+            for document in documents:
+                grouped.setdefault(document["pk"], []).append(document)
+            futures = [executor.submit(upsert_many, group) for group in grouped.values()]
+            wait(futures)
+            for future in futures:
+                future.result()
+        return len(documents)
+
+    @staticmethod
+    def _build_document(event: Dict[str, Any], enqueued_time_utc: Optional[str]) -> Dict[str, Any]:
         validate_telemetry_event(event)
         enriched = enrich_telemetry_event(event, enqueued_time_utc=enqueued_time_utc)
         record = TelemetryRecord(
@@ -71,14 +106,7 @@ class TelemetryEventProcessor:
             latency_ms=float(enriched["latency_ms"]) if enriched.get("latency_ms") is not None else None,
             metadata=dict(enriched.get("metadata", {})),
         )
-        return self._sink.upsert_telemetry(record.to_dict())
-
-    def process_events(self, events: Iterable[Dict[str, Any]]) -> int:
-        count = 0
-        for event in events:
-            self.process_event(event)
-            count += 1
-        return count
+        return record.to_dict()
 
 
 def run_eventhub_processor_loop(
@@ -86,11 +114,23 @@ def run_eventhub_processor_loop(
     connection_string: str,
     eventhub_name: str,
     consumer_group: str = "$Default",
-    max_concurrency: int = 20,
+    max_concurrency: Optional[int] = None,
 ) -> None:
-    import concurrent.futures
+    """Consume Event Hubs telemetry and write it through ``processor``.
+
+    ``max_concurrency`` is deprecated. It used to size a per-event worker pool; it now only
+    bounds how many partitions of one array batch are written concurrently (default 20).
+    """
     import gzip
 
+    if max_concurrency is not None:
+        warnings.warn(
+            "max_concurrency is deprecated; it now only bounds concurrent partition writes per batch",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+    partition_workers = max(1, int(max_concurrency if max_concurrency is not None else 20))
+
     try:
         from azure.eventhub import EventHubConsumerClient
     except ImportError as exc:
@@ -102,41 +142,35 @@ def run_eventhub_processor_loop(
         consumer_group=consumer_group,
     )
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrency) as executor:
-        def on_event(partition_context, event) -> None:
-            enqueued_time = event.enqueued_time.isoformat() if event.enqueued_time else None
-
-            try:
-                # Reconstruct trailing raw bytes
-                raw_body = b"".join(event.body)
-                properties = event.properties or {}
-
-                # Decompress if tagged appropriately by Emitter batching
-                if properties.get(b"content-encoding") == b"gzip":
-                    raw_body = gzip.decompress(raw_body)
-
-                decoded_body = raw_body.decode("utf-8")
-
-                # Handle native emitter array batching
-                if properties.get(b"batch-type") == b"json-array":
-                    payloads = json.loads(decoded_body)
-                else:
-                    payloads = [json.loads(decoded_body)]
-
-                futures = [
-                    executor.submit(processor.process_event, payload, enqueued_time)
-                    for payload in payloads
-                ]
-                # Block until all futures complete to apply backpressure to EventHub polling.
-                for fut in concurrent.futures.as_completed(futures):
-                    fut.result()
-
-                partition_context.update_checkpoint(event)
-            except Exception:
-                logger.exception("Failed to process telemetry event from partition=%s", partition_context.partition_id)
-
-        with client:
-            client.receive(
-                on_event=on_event,
-                starting_position="-1",
-            )
+    def on_event(partition_context, event) -> None:
+        enqueued_time = event.enqueued_time.isoformat() if event.enqueued_time else None
+
+        try:
+            # Reconstruct trailing raw bytes
+            raw_body = b"".join(event.body)
+            properties = event.properties or {}
+
+            # Decompress if tagged appropriately by Emitter batching
+            if properties.get(b"content-encoding") == b"gzip":
+                raw_body = gzip.decompress(raw_body)
+
+            decoded_body = raw_body.decode("utf-8")
+
+            # Native emitter array batches go through the bulk path: all payloads are
+            # validated first, then each partition is written as transactional batches,
+            # partitions concurrently. Processing completes before the checkpoint, which
+            # applies backpressure.
+            if properties.get(b"batch-type") == b"json-array":
+                processor.process_events(json.loads(decoded_body), enqueued_time, executor=executor)
+            else:
+                processor.process_event(json.loads(decoded_body), enqueued_time)
+
+            partition_context.update_checkpoint(event)
+        except Exception:
+            logger.exception("Failed to process telemetry event from partition=%s", partition_context.partition_id)
+
+    with ThreadPoolExecutor(max_workers=partition_workers) as executor, client:
+        client.receive(
+            on_event=on_event,
+            starting_position="-1",
+        )
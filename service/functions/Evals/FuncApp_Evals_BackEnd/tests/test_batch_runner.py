@@ -295,3 +295,98 @@ async def test_batch_runner_respects_policy_concurrency_limit() -> None:
 
     assert len(results) == 4
     assert SlowPolicy.max_inflight <= 2
+
+
+@pytest.mark.asyncio
+async def test_batch_runner_process_pool_matches_inline_metrics() -> None:
+    inline_store = InMemoryStore(telemetry=list(_TELEMETRY), results=[])
+    inline_runner = BatchEvaluationRunner(
+        InMemoryTelemetryRepository(inline_store),
+        InMemoryEvaluationRepository(inline_store),
+    )
+    pooled_store = InMemoryStore(telemetry=list(_TELEMETRY), results=[])
+    pooled_runner = BatchEvaluationRunner(
+        InMemoryTelemetryRepository(pooled_store),
+        InMemoryEvaluationRepository(pooled_store),
+        process_workers=2,
+    )
+    window = {"start_ts": "2026-02-24T00:00:00Z", "end_ts": "2026-02-24T23:59:59Z"}
+
+    try:
+        inline = await inline_runner.run_for_application(_APP_CFG, **window)
+        pooled = await pooled_runner.run_for_application(_APP_CFG, **window)
+        assert pooled_runner._executor is not None
+    finally:
+        pooled_runner.close()
+
+    def _values(results):
+        return {
+            (r.policy_name, m.metric_name): m.value for r in results for m in r.metrics
+        }
+
+    assert _values(pooled) == _values(inline)
+    assert pooled_runner._executor is None
+
+
+@pytest.mark.asyncio
+async def test_batch_runner_submits_one_pool_task_per_chunk() -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    class _CountingExecutor(ThreadPoolExecutor):
+        submissions = 0
+
+        def submit(self, fn, /, *args, **kwargs):
+            _CountingExecutor.submissions += 1
+            return super().submit(fn, *args, **kwargs)
+
+    store = InMemoryStore(telemetry=list(_TELEMETRY), results=[])
+    runner = BatchEvaluationRunner(
+        InMemoryTelemetryRepository(store),
+        InMemoryEvaluationRepository(store),
+        process_workers=2,
+    )
+    runner._executor = _CountingExecutor(max_workers=1)
+    try:
+        results = await runner.run_for_application(
+            _APP_CFG, start_ts="2026-02-24T00:00:00Z", end_ts="2026-02-24T23:59:59Z"
+        )
+    finally:
+        runner.close()
+
+    # Both policies of the single chunk travel to the worker together.
+    assert len(results) == 2
+    assert _CountingExecutor.submissions == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_runner_ignores_malformed_health_metadata_for_unrelated_policies() -> None:
+    record = TelemetryRecord(
+        id="1",
+        app_id="app1",
+        timestamp="2026-02-24T00:00:01Z",
+        model_id="m1",
+        model_version="2.3",
+        input_text="hello",
+        output_text="fine",
+        metadata={"trace_id": "trace-1", "resource_utilization": "high"},
+    )
+    app_cfg = ResolvedAppConfig(
+        app_id="app1",
+        batch_time="0 * * * *",
+        policy_names=["safety_toxicity"],
+        policies=[PolicyConfig(name="safety_toxicity", metrics=["safety_toxicity"], parameters={})],
+        thresholds={},
+    )
+    store = InMemoryStore(telemetry=[record], results=[])
+    runner = BatchEvaluationRunner(
+        InMemoryTelemetryRepository(store),
+        InMemoryEvaluationRepository(store),
+    )
+
+    results = await runner.run_for_application(
+        app_cfg,
+        start_ts="2026-02-24T00:00:00Z",
+        end_ts="2026-02-24T23:59:59Z",
+    )
+
+    assert [m.value for r in results for m in r.metrics] == [1.0]
@@ -49,6 +49,18 @@ def test_load_config_json(tmp_path: Path) -> None:
     assert app_cfg.thresholds["performance_precision_coherence"][0].value == 0.9
 
 
+def test_read_raw_json_matches_with_and_without_orjson(tmp_path: Path, monkeypatch) -> None:
+    from config import loader
+
+    payload = {"default_batch_time": "0 * * * *", "note": "caf\u00e9", "nested": {"n": [1, 2.5, None]}}
+    file_path = tmp_path / "cfg.json"
+    file_path.write_text(json.dumps(payload), encoding="utf-8")
+
+    fast = loader._read_raw(file_path)
+    monkeypatch.setattr(loader, "orjson", None)
+    assert loader._read_raw(file_path) == fast == payload
+
+
 def test_missing_config_raises() -> None:
     """load_config should raise FileNotFoundError for a non-existent path."""
     with pytest.raises(FileNotFoundError, match="not found"):
@@ -340,3 +352,208 @@ def test_load_config_section_lazy_access(tmp_path: Path) -> None:
     assert telemetry_source.type == "otlp"
     assert telemetry_source.otlp_file_path == "/tmp/otlp.json"
     assert "performance_precision_coherence" in policies
+    assert load_config_section(str(file_path), "app_config").keys() == {"appx"}
+    with pytest.raises(KeyError, match="Unsupported config section: nope"):
+        load_config_section(str(file_path), "nope")
+
+
+def test_load_config_ttl_expiry_reuses_parse_for_unchanged_file(tmp_path: Path, monkeypatch) -> None:
+    from config import loader
+
+    payload = {
+        "default_batch_time": "0 * * * *",
+        "evaluation_policies": {
+            "performance_precision_coherence": {
+                "metrics": ["performance_precision_coherence"],
+                "parameters": {},
+            }
+        },
+        "app_config": {"appx": {}},
+    }
+    file_path = tmp_path / "cfg.json"
+    file_path.write_text(json.dumps(payload))
+
+    read_count = {"count": 0}
+    original_read_raw = loader._read_raw
+
+    def counting_read_raw(path):
+        read_count["count"] += 1
+        return original_read_raw(path)
+
+    clock = {"now": 1_000.0}
+    monkeypatch.setattr(loader, "_read_raw", counting_read_raw)
+    monkeypatch.setattr(loader.time, "time", lambda: clock["now"])
+    loader.clear_config_cache()
+
+    cfg1 = load_config(str(file_path), ttl_seconds=10)
+    clock["now"] += 60
+    cfg2 = load_config(str(file_path), ttl_seconds=10)
+
+    assert cfg1 is not cfg2
+    assert read_count["count"] == 1
+
+
+def test_env_var_expansion_matches_expandvars(monkeypatch) -> None:
+    import os
+
+    from config.models import _expand_env_vars
+
+    monkeypatch.setenv("EVAL_TEST_HOST", "smtp.example.com")
+    monkeypatch.delenv("EVAL_TEST_UNSET", raising=False)
+    raw = {
+        "plain": "no variables here",
+        "braced": "${EVAL_TEST_HOST}",
+        "bare": "host=$EVAL_TEST_HOST:25",
+        "unset": "${EVAL_TEST_UNSET}",
+        "nested": [{"value": "$EVAL_TEST_HOST"}, 5],
+    }
+
+    expanded = _expand_env_vars(raw)
+
+    assert expanded["plain"] == "no variables here"
+    assert expanded["braced"] == "smtp.example.com"
+    assert expanded["bare"] == os.path.expandvars("host=$EVAL_TEST_HOST:25")
+    assert expanded["unset"] == "${EVAL_TEST_UNSET}"
+    assert expanded["nested"] == [{"value": "smtp.example.com"}, 5]
+
+
+def test_env_var_expansion_handles_deep_nesting_without_mutating_input(monkeypatch) -> None:
+    import sys
+
+    from config.models import _expand_env_vars
+
+    monkeypatch.setenv("EVAL_TEST_HOST", "smtp.example.com")
+    depth = sys.getrecursionlimit() + 100
+    raw: dict = {"leaf": "$EVAL_TEST_HOST"}
+    for _ in range(depth):
+        raw = {"child": [raw, "x"], "z": 1, "a": None}
+
+    expanded = _expand_env_vars(raw)
+
+    assert list(expanded) == ["child", "z", "a"]
+    node, original = expanded, raw
+    for _ in range(depth):
+        assert node is not original
+        node, original = node["child"][0], original["child"][0]
+    assert node == {"leaf": "smtp.example.com"}
+    assert original == {"leaf": "$EVAL_TEST_HOST"}
+    assert _expand_env_vars("$EVAL_TEST_HOST") == "smtp.example.com"
+
+
+def test_resolved_app_config_indexes_policies_by_name() -> None:
+    from config.models import PolicyConfig, ResolvedAppConfig
+
+    first = PolicyConfig(name="p1", metrics=["m"])
+    cfg = ResolvedAppConfig(
+        app_id="app1",
+        batch_time="0 * * * *",
+        policy_names=["p1", "p2"],
+        policies=[first, PolicyConfig(name="p2", metrics=[]), PolicyConfig(name="p1", metrics=["dup"])],
+        thresholds={},
+    )
+
+    assert cfg.policies_by_name["p1"] is first
+    assert set(cfg.policies_by_name) == {"p1", "p2"}
+    assert "policies_by_name" not in repr(cfg)
+
+
+def test_resolve_app_config_memoized_per_root_config() -> None:
+    from config.loader import list_resolved_apps
+    from config.models import build_root_config
+
+    raw = {
+        "evaluation_policies": {"p1": {"metrics": ["m"]}},
+        "default_evaluation_policies": ["p1"],
+        "app_config": {"app1": {}},
+    }
+    root = build_root_config(raw)
+
+    resolved = resolve_app_config(root, "app1")
+    assert resolve_app_config(root, "app1") is resolved
+    assert list_resolved_apps(root) == [resolved]
+    assert list_resolved_apps(root)[0] is resolved
+
+    assert resolve_app_config(root, "adhoc") is not resolve_app_config(root, "adhoc")
+    assert set(root._resolved_apps) == {"app1"}
+    assert resolve_app_config(build_root_config(raw), "app1") is not resolved
+
+
+def test_resolve_app_config_shares_global_thresholds_without_overrides() -> None:
+    from config.models import build_root_config
+
+    root = build_root_config(
+        {
+            "evaluation_policies": {"p1": {"metrics": ["m"]}},
+            "global_thresholds": {"m": [{"level": "warning", "value": 0.5, "direction": "min"}]},
+            "app_config": {
+                "plain": {},
+                "custom": {"thresholds": {"m2": [{"level": "critical", "value": 1, "direction": "max"}]}},
+            },
+        }
+    )
+
+    assert resolve_app_config(root, "plain").thresholds is root.global_thresholds
+    assert resolve_app_config(root, "adhoc").thresholds is root.global_thresholds
+    custom = resolve_app_config(root, "custom").thresholds
+    assert set(custom) == {"m", "m2"}
+    assert set(root.global_thresholds) == {"m"}
+
+
+def test_build_root_config_parses_eagerly_into_frozen_fields(monkeypatch) -> None:
+    import dataclasses
+
+    from config.models import build_root_config
+
+    monkeypatch.setenv("TEST_BATCH_TIME", "5 * * * *")
+    root = build_root_config(
+        {
+            "default_batch_time": "${TEST_BATCH_TIME}",
+            "evaluation_policies": {"p1": {"metrics": ["m"]}, "p2": {"metrics": ["m2"]}},
+            "batch_app_concurrency": "4",
+        }
+    )
+
+    assert vars(root)["default_batch_time"] == "5 * * * *"
+    assert root.batch_app_concurrency == 4
+    assert root.default_evaluation_policies == ["p1", "p2"]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        root.batch_app_concurrency = 1
+
+
+def test_build_root_config_reads_settings_then_env_then_default(monkeypatch) -> None:
+    from config.models import build_root_config
+
+    monkeypatch.setenv("BATCH_POLICY_CONCURRENCY", "7")
+    monkeypatch.setenv("COSMOS_CLIENT_RETRY_BACKOFF_FACTOR", "2.5")
+    monkeypatch.delenv("COSMOS_CONSISTENCY_LEVEL", raising=False)
+    monkeypatch.delenv("COSMOS_POOL_MAX_CONNECTION_SIZE", raising=False)
+    root = build_root_config(
+        {
+            "batch_app_concurrency": "3",
+            "batch_policy_concurrency": None,
+            "cosmos": {"endpoint": "https://example", "key": "k", "client_connection_timeout": 5},
+        }
+    )
+
+    assert root.batch_app_concurrency == 3
+    assert root.batch_policy_concurrency == 7
+    assert root.cosmos.client_retry_backoff_factor == 2.5
+    assert root.cosmos.client_connection_timeout == 5
+    assert root.cosmos.pool_max_connection_size == 100
+    assert root.cosmos.consistency_level is None
+
+
+def test_read_raw_cached_returns_independent_copies(tmp_path: Path) -> None:
+    from config import loader
+
+    file_path = tmp_path / "cfg.json"
+    file_path.write_text(json.dumps({"app_config": {"appx": {"tags": ["a"]}}}))
+    stat = file_path.stat()
+    loader.clear_config_cache()
+
+    first = loader._read_raw_cached(str(file_path), stat.st_mtime_ns, stat.st_size)
+    first["app_config"]["appx"]["tags"].append("mutated")
+    second = loader._read_raw_cached(str(file_path), stat.st_mtime_ns, stat.st_size)
+
+    assert second == {"app_config": {"appx": {"tags": ["a"]}}}
+    assert loader._parse_raw_cached.cache_info().hits == 1
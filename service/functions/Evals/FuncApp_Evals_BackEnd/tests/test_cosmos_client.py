@@ -16,7 +16,9 @@ class _FakeContainer:
         self.query_calls = 0
         self.batch_calls = 0
         self.fail_upsert_attempts = 0
+        self.fail_batch_calls: set[int] = set()
         self.batch_sizes: List[int] = []
+        self.query_kwargs: List[Dict[str, Any]] = []
 
     def upsert_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
         self.upsert_calls += 1
@@ -25,14 +27,17 @@ class _FakeContainer:
             raise ServiceRequestError("transient failure")
         return item
 
-    def query_items(self, **_: Any) -> List[Dict[str, Any]]:
+    def query_items(self, **kwargs: Any) -> List[Dict[str, Any]]:
         self.query_calls += 1
+        self.query_kwargs.append(kwargs)
         return [{"id": "ok"}]
 
     def execute_item_batch(self, batch_operations: List[Any], partition_key: str) -> None:
         self.batch_calls += 1
         assert partition_key == "app1"
         self.batch_sizes.append(len(batch_operations))
+        if self.batch_calls in self.fail_batch_calls:
+            raise ValueError("batch rejected")
 
 
 class _FakeDatabase:
@@ -49,6 +54,7 @@ class _FakeDatabase:
 
 class _FakeCosmosClient:
     init_calls = 0
+    database_calls = 0
     last_kwargs: Dict[str, Any] = {}
     telemetry_container = _FakeContainer()
     results_container = _FakeContainer()
@@ -61,6 +67,7 @@ class _FakeCosmosClient:
 
     def create_database_if_not_exists(self, id: str) -> _FakeDatabase:
         _ = id
+        _FakeCosmosClient.database_calls += 1
         return _FakeDatabase(_FakeCosmosClient.telemetry_container, _FakeCosmosClient.results_container)
 
 
@@ -84,7 +91,9 @@ def _make_config(**overrides: Any) -> CosmosConfig:
 @pytest.fixture(autouse=True)
 def _reset_pool_and_fakes(monkeypatch):
     cosmos_module._CLIENT_POOL.clear()
+    cosmos_module._CONTAINER_POOL.clear()
     _FakeCosmosClient.init_calls = 0
+    _FakeCosmosClient.database_calls = 0
     _FakeCosmosClient.last_kwargs = {}
     _FakeCosmosClient.telemetry_container = _FakeContainer()
     _FakeCosmosClient.results_container = _FakeContainer()
@@ -99,6 +108,26 @@ def test_client_pool_reuses_client_for_same_config() -> None:
     assert _FakeCosmosClient.init_calls == 1
 
 
+def test_client_resolves_containers_once_per_process() -> None:
+    cfg = _make_config()
+    first = CosmosDbClient(cfg)
+    second = CosmosDbClient(cfg)
+
+    assert _FakeCosmosClient.database_calls == 1
+    assert first._results_container is second._results_container
+    assert "consistency_level" not in _FakeCosmosClient.last_kwargs
+
+    CosmosDbClient(_make_config(results_container="other_results"))
+    assert _FakeCosmosClient.init_calls == 1
+    assert _FakeCosmosClient.database_calls == 2
+
+
+def test_client_passes_consistency_level_only_when_configured() -> None:
+    CosmosDbClient(_make_config(consistency_level="Eventual"))
+
+    assert _FakeCosmosClient.last_kwargs["consistency_level"] == "Eventual"
+
+
 def test_client_passes_bulk_and_pool_settings() -> None:
     cfg = _make_config(enable_bulk=False, pool_max_connection_size=42)
     CosmosDbClient(cfg)
@@ -128,3 +157,63 @@ def test_upsert_results_batch_chunks_to_max_100() -> None:
 
     assert _FakeCosmosClient.results_container.batch_calls == 2
     assert _FakeCosmosClient.results_container.batch_sizes == [100, 50]
+
+
+def test_upsert_telemetry_many_batches_per_partition() -> None:
+    cfg = _make_config()
+    client = CosmosDbClient(cfg)
+
+    items = [{"id": str(i), "pk": "app1"} for i in range(3)] + [{"id": "solo", "pk": "app2"}]
+    client.upsert_telemetry_many(items)
+
+    container = _FakeCosmosClient.telemetry_container
+    assert container.batch_calls == 1
+    assert container.batch_sizes == [3]
+    assert container.upsert_calls == 1
+
+
+def test_query_results_scopes_to_partition_when_key_given() -> None:
+    client = CosmosDbClient(_make_config())
+    container = _FakeCosmosClient.results_container
+
+    client.query_results("SELECT * FROM c", [], partition_key="app1:2024-03-01")
+    client.query_results("SELECT * FROM c", [])
+
+    scoped, fan_out = container.query_kwargs
+    assert scoped["partition_key"] == "app1:2024-03-01"
+    assert scoped["enable_cross_partition_query"] is False
+    assert fan_out["partition_key"] is None
+    assert fan_out["enable_cross_partition_query"] is True
+
+
+def test_upsert_results_batch_splits_on_payload_size(monkeypatch) -> None:
+    monkeypatch.setattr(cosmos_module, "_BATCH_MAX_PAYLOAD_BYTES", 1_000)
+    client = CosmosDbClient(_make_config())
+
+    items = [{"id": str(i), "pk": "app1", "blob": "x" * 400} for i in range(5)]
+    items.append({"id": "huge", "pk": "app1", "blob": "y" * 5_000})
+    client.upsert_results_batch(items, partition_key="app1")
+
+    # Two ~430-byte items fit under the cap; the oversized item still goes out alone.
+    assert _FakeCosmosClient.results_container.batch_sizes == [2, 2, 1, 1]
+
+
+def test_encoded_size_falls_back_to_stdlib_json(monkeypatch) -> None:
+    item = {"id": "x", "pk": "app1", "value": 1.5}
+    fast = cosmos_module._encoded_size(item)
+
+    monkeypatch.setattr(cosmos_module, "orjson", None)
+    assert cosmos_module._encoded_size(item) == fast
+
+
+def test_upsert_results_batch_falls_back_per_failed_batch() -> None:
+    client = CosmosDbClient(_make_config())
+    container = _FakeCosmosClient.results_container
+    container.fail_batch_calls = {2}
+
+    items = [{"id": str(i), "pk": "app1"} for i in range(150)]
+    client.upsert_results_batch(items, partition_key="app1")
+
+    # The first batch committed; only the 50 items of the rejected second batch go one by one.
+    assert container.batch_sizes == [100, 50]
+    assert container.upsert_calls == 50
@@ -102,3 +102,34 @@ def test_batch_status_endpoints_prefer_sqlite_store(tmp_path) -> None:
     current_payload = current.get_json()
     assert current_payload["run_id"] == "run-db"
     assert current_payload["stats"]["completed_items"] == 1
+
+
+def test_run_stats_single_pass_and_cached_per_snapshot() -> None:
+    run = {
+        "run_id": "r",
+        "items": [
+            {"status": "completed", "breach_count": 2, "policy_runs": 3},
+            {"status": "failed", "breach_count": 0, "policy_runs": 1},
+            {"status": "running"},
+            {"status": "pending"},
+            {"status": "skipped", "breach_count": "1"},
+        ],
+    }
+    stats = dashboard_app._compute_run_stats(run)
+    assert stats == {
+        "total_items": 5,
+        "completed_items": 1,
+        "failed_items": 1,
+        "running_items": 1,
+        "pending_items": 1,
+        "total_breaches": 3,
+        "total_policy_runs": 4,
+        "success_rate": 0.2,
+    }
+
+    stats_cache: dict = {}
+    first = dashboard_app._run_with_stats(run, stats_cache)
+    second = dashboard_app._run_with_stats(run, stats_cache)
+    assert first["stats"] == stats
+    assert first["stats"] is second["stats"]
+    assert "stats" not in run
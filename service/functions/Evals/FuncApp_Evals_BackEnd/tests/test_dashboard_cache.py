@@ -144,3 +144,80 @@ def test_batch_endpoints_use_status_file_cache_with_mtime_invalidation(tmp_path,
     assert resp3.status_code == 200
     assert resp3.get_json()["run_id"] == "run-2"
     assert read_count["count"] == 2
+
+
+def test_file_cache_invalidates_on_size_change_with_same_mtime(tmp_path) -> None:
+    data_file = tmp_path / "data.json"
+    data_file.write_text(json.dumps({"v": 1}))
+    stat = data_file.stat()
+
+    cache = dashboard_app.FileCache()
+    loads = {"count": 0}
+
+    def _loader():
+        loads["count"] += 1
+        return json.loads(data_file.read_text())
+
+    assert cache.get_or_load(data_file, _loader) == {"v": 1}
+    assert cache.get_or_load(data_file, _loader) == {"v": 1}
+    assert loads["count"] == 1
+
+    data_file.write_text(json.dumps({"v": 1000}))
+    os.utime(data_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert cache.get_or_load(data_file, _loader) == {"v": 1000}
+    assert loads["count"] == 2
+
+
+def test_file_cache_invalidates_on_companion_change(tmp_path) -> None:
+    db_file = tmp_path / "batch_status.db"
+    wal_file = tmp_path / "batch_status.db-wal"
+    db_file.write_text("db")
+
+    cache = dashboard_app.FileCache()
+    loads = {"count": 0}
+
+    def _loader():
+        loads["count"] += 1
+        return {"count": loads["count"]}
+
+    cache.get_or_load(db_file, _loader, companions=(wal_file,))
+    cache.get_or_load(db_file, _loader, companions=(wal_file,))
+    assert loads["count"] == 1
+
+    wal_file.write_text("wal frames")
+    cache.get_or_load(db_file, _loader, companions=(wal_file,))
+    assert loads["count"] == 2
+
+
+def test_batch_lookups_use_indices_built_once_per_status_load(tmp_path, monkeypatch) -> None:
+    status_file = tmp_path / "batch_status.json"
+    status_file.write_text(
+        json.dumps(
+            {
+                "runs": [
+                    {"run_id": "run-old", "status": "completed", "started_at": "2026-02-26T00:00:00Z", "items": []},
+                    {
+                        "run_id": "run-new",
+                        "status": "completed",
+                        "started_at": "2026-02-27T00:00:00Z",
+                        "items": [{"item_id": "app1", "status": "completed", "logs": ["ok"]}],
+                    },
+                ]
+            }
+        )
+    )
+    monkeypatch.setattr(dashboard_app, "STATUS_DB_FILE", tmp_path / "does-not-exist.db")
+    monkeypatch.setattr(dashboard_app, "STATUS_FILE", status_file)
+    monkeypatch.setattr(dashboard_app, "_FILE_CACHE", dashboard_app.FileCache())
+
+    snapshot = dashboard_app._load_status_snapshot()
+    assert [r["run_id"] for r in snapshot.runs_sorted_desc] == ["run-new", "run-old"]
+    assert dashboard_app._load_status_snapshot() is snapshot
+
+    client = dashboard_app.app.test_client()
+    assert client.get("/api/batch/run/run-old").get_json()["run_id"] == "run-old"
+    assert client.get("/api/batch/run/missing").status_code == 404
+    assert client.get("/api/batch/run/run-new/item/app1/logs").get_json()["logs"] == ["ok"]
+    assert client.get("/api/batch/run/run-new/item/missing/logs").status_code == 404
+    assert client.get("/api/batch/run/missing/item/app1/logs").status_code == 404
@@ -1,4 +1,6 @@
-from dashboard.app import app
+import json
+
+from dashboard.app import _json_array_response, app
 
 
 def test_openapi_and_docs_endpoints() -> None:
@@ -13,3 +15,25 @@ def test_openapi_and_docs_endpoints() -> None:
     docs_resp = client.get("/api/docs")
     assert docs_resp.status_code == 200
     assert "swagger-ui" in docs_resp.get_data(as_text=True).lower()
+
+
+def test_json_responses_round_trip_through_configured_provider() -> None:
+    client = app.test_client()
+
+    resp = client.get("/api/thresholds")
+    assert resp.status_code == 200
+    assert resp.mimetype == "application/json"
+    payload = app.json.loads(resp.get_data())
+    assert payload["dynamic_thresholds"] is False
+    assert "safety_toxicity" in payload["thresholds"]
+
+
+def test_json_array_response_streams_rows() -> None:
+    with app.app_context():
+        response = _json_array_response(iter([{"a": 1}, {"b": [2, 3]}]))
+        assert response.is_streamed
+        assert response.mimetype == "application/json"
+        assert json.loads(b"".join(response.response)) == [{"a": 1}, {"b": [2, 3]}]
+
+        empty = _json_array_response(iter(()))
+        assert b"".join(empty.response) == b"[]"
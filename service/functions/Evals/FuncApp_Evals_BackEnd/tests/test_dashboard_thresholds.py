@@ -26,3 +26,82 @@ def test_dashboard_dynamic_thresholds_override_defaults() -> None:
     app1 = next(row for row in rows if row["app_id"] == "app1")
     assert app1["status"] == "healthy"
     assert app1["breaches"] == []
+
+
+def test_dashboard_threshold_map_is_cached_per_query_signature() -> None:
+    import dashboard.app as dashboard_app
+
+    query = {
+        "dynamic_thresholds": "1",
+        "threshold.system_reliability_latency.warning": "1500",
+        "direction.system_reliability_latency.warning": "max",
+        "unrelated": "x",
+    }
+    with app.test_request_context("/api/latest", query_string=query):
+        first = dashboard_app._active_threshold_map()
+    with app.test_request_context("/api/latest", query_string={**query, "unrelated": "y"}):
+        second = dashboard_app._active_threshold_map()
+
+    assert first is second
+    assert first["system_reliability_latency"][0].value == 1500
+    assert isinstance(first["system_reliability_latency"], tuple)
+
+
+def test_dashboard_breach_view_reused_for_same_inputs(monkeypatch) -> None:
+    import dashboard.app as dashboard_app
+
+    calls = {"count": 0}
+    original = dashboard_app._latest_with_breaches
+
+    def counting(latest_rows, threshold_map):
+        calls["count"] += 1
+        return original(latest_rows, threshold_map)
+
+    monkeypatch.setattr(dashboard_app, "_latest_with_breaches", counting)
+    monkeypatch.setattr(dashboard_app, "_BREACH_VIEW_CACHE", dashboard_app._BreachViewCache())
+    client = app.test_client()
+
+    first = client.get("/api/latest").get_json()
+    alerts = client.get("/api/alerts").get_json()
+    second = client.get("/api/latest").get_json()
+    client.get("/api/latest?dynamic_thresholds=1&threshold.safety_toxicity.warning=0.5")
+
+    assert first == second
+    assert len(alerts) == sum(len(row["breaches"]) for row in first)
+    assert calls["count"] == 2
+
+
+def test_dashboard_threshold_overrides_copy_only_touched_metrics() -> None:
+    import dashboard.app as dashboard_app
+
+    with app.test_request_context("/api/latest"):
+        assert dashboard_app._active_threshold_map() is dashboard_app.DEFAULT_THRESHOLD_MAP
+
+    query = {"dynamic_thresholds": "1", "threshold.safety_toxicity.warning": "0.5"}
+    with app.test_request_context("/api/latest", query_string=query):
+        overridden = dashboard_app._active_threshold_map()
+
+    defaults = dashboard_app.DEFAULT_THRESHOLD_MAP
+    assert overridden["safety_toxicity"][0].value == 0.5
+    assert defaults["safety_toxicity"][0].value == 0.90
+    assert overridden["safety_compliance"] is defaults["safety_compliance"]
+
+
+def test_build_threshold_map_parses_override_keys() -> None:
+    import dashboard.app as dashboard_app
+
+    threshold_map = dashboard_app._build_threshold_map(
+        (
+            ("direction.custom_metric.critical", " MAX "),
+            ("direction.custom_metric.warning", "sideways"),
+            ("threshold.custom_metric.critical", "5"),
+            ("threshold.custom_metric.warning", "2"),
+            ("threshold.too.many.parts", "1"),
+        )
+    )
+
+    entries = {t.level: t for t in threshold_map["custom_metric"]}
+    assert entries["critical"].value == 5.0
+    assert entries["critical"].direction == "max"
+    assert entries["warning"].direction == "min"
+    assert "too" not in threshold_map
@@ -38,3 +38,31 @@ def test_sqlite_job_status_store_lifecycle(tmp_path: Path) -> None:
     assert app1["policy_runs"] == 2
     assert app2["status"] == "failed"
     assert app2["error"] == "boom"
+
+
+def test_sqlite_job_status_store_load_runs_groups_items_and_logs(tmp_path: Path) -> None:
+    store = SqliteJobStatusStore(tmp_path / "batch_status.db")
+    try:
+        for run_id, app_ids in (("run-a", ["app2", "app1"]), ("run-b", ["app1"])):
+            store.start_run(
+                run_id=run_id,
+                app_ids=app_ids,
+                window_start="2026-02-25T00:00:00Z",
+                window_end="2026-02-25T01:00:00Z",
+                group_size=0,
+                group_index=0,
+            )
+        store.append_item_log("run-a", "app1", "INFO", "first")
+        store.append_item_log("run-b", "app1", "INFO", "other run")
+        store.append_item_log("run-a", "app1", "ERROR", "second")
+
+        runs = {run["run_id"]: run for run in store.load_runs()}
+    finally:
+        store.close()
+
+    assert [item["item_id"] for item in runs["run-a"]["items"]] == ["app1", "app2"]
+    app1 = runs["run-a"]["items"][0]
+    assert [log["message"] for log in app1["logs"]] == ["first", "second"]
+    assert set(app1["logs"][0]) == {"timestamp", "level", "message"}
+    assert runs["run-a"]["items"][1]["logs"] == []
+    assert [log["message"] for log in runs["run-b"]["items"][0]["logs"]] == ["other run"]
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import pickle
+from dataclasses import asdict
+
+from data.models import (
+    EvaluationResult,
+    MetricValueVersioned,
+    TelemetryRecord,
+    ThresholdBreach,
+    partition_key_for,
+)
+
+
+def test_partition_key_for_shares_one_string_per_app_day() -> None:
+    first = partition_key_for("app1", "2024-03-01T00:00:00+00:00")
+    second = partition_key_for("app1", "2024-03-01T23:59:59Z")
+
+    assert first == "app1:2024-03-01"
+    assert second is first
+    assert partition_key_for("app1", "2024-03-02T00:00:00Z") == "app1:2024-03-02"
+    assert partition_key_for("app2", "2024-03-01T00:00:00Z") == "app2:2024-03-01"
+
+
+def test_to_dict_matches_asdict_layout() -> None:
+    telemetry = TelemetryRecord(
+        id="t1",
+        app_id="app1",
+        timestamp="2024-03-01T10:00:00Z",
+        model_id="m",
+        model_version="v",
+        input_text="in",
+        output_text="out",
+        latency_ms=12.5,
+        metadata={"trace_id": "abc"},
+    )
+    metric = MetricValueVersioned(
+        metric_name="safety_toxicity",
+        value=0.9,
+        version="1.0",
+        timestamp="2024-03-01T10:00:00Z",
+        metadata={"sample_count": 3},
+    )
+    breach = ThresholdBreach(
+        metric_name="safety_toxicity",
+        level="warning",
+        threshold_value=0.95,
+        actual_value=0.9,
+        direction="min",
+    )
+
+    payload = telemetry.to_dict()
+    assert payload == {**asdict(telemetry), "type": "telemetry", "pk": "app1:2024-03-01"}
+    assert list(payload) == [*asdict(telemetry), "type", "pk"]
+    assert metric.to_dict() == asdict(metric)
+    assert list(metric.to_dict()) == list(asdict(metric))
+    assert breach.to_dict() == asdict(breach)
+    assert list(breach.to_dict()) == list(asdict(breach))
+
+    payload["metadata"]["extra"] = True
+    assert telemetry.metadata == {"trace_id": "abc"}
+
+
+def test_batch_scale_models_use_slots_and_pickle() -> None:
+    record = TelemetryRecord(
+        id="t1",
+        app_id="app1",
+        timestamp="2024-03-01T10:00:00Z",
+        model_id="m",
+        model_version="v",
+        input_text="in",
+        output_text="out",
+    )
+    result = EvaluationResult(
+        id="r1",
+        app_id="app1",
+        timestamp="2024-03-01T10:00:00Z",
+        policy_name="p",
+        metrics=[],
+    )
+    for obj in (record, result):
+        assert not hasattr(obj, "__dict__")
+
+    # Records cross the process pool boundary when policies run out of process.
+    assert pickle.loads(pickle.dumps(record)) == record
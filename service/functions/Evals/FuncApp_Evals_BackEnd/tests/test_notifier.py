@@ -6,13 +6,19 @@ from orchestration import notifier
 from orchestration.notifier import (
     filter_breaches_by_min_level,
     enqueue_alert,
-    _alert_queue,
     CircuitBreaker,
     alert_worker,
     drain_alert_queue,
 )
 
 
+@pytest.fixture(autouse=True)
+def _fresh_alert_queue(monkeypatch):
+    # The module-level queue binds to the first event loop that waits on it; each
+    # test runs on its own loop, so give every test an unbound queue.
+    monkeypatch.setattr(notifier, "_alert_queue", asyncio.Queue())
+
+
 def test_filter_breaches_by_min_level() -> None:
     breaches = [
         ThresholdBreach(
@@ -36,11 +42,23 @@ def test_filter_breaches_by_min_level() -> None:
     assert critical_only[0].level == "critical"
 
 
+def test_filter_breaches_by_min_level_ranks_mixed_case_and_unknown_levels() -> None:
+    breaches = [
+        ThresholdBreach(metric_name=f"m{i}", level=level, threshold_value=1.0, actual_value=0.0, direction="min")
+        for i, level in enumerate(["Critical", "warning", "info", "CRITICAL", "warning"])
+    ]
+
+    assert [b.metric_name for b in filter_breaches_by_min_level(breaches, "CRITICAL")] == ["m0", "m3"]
+    # Unknown levels rank as warning, matching the min_level fallback.
+    assert filter_breaches_by_min_level(breaches, "warning") == breaches
+    assert filter_breaches_by_min_level([], "critical") == []
+
+
 @pytest.mark.asyncio
 async def test_enqueue_alert_no_channel_enabled_noop() -> None:
     # Clear queue first just in case
-    while not _alert_queue.empty():
-        _alert_queue.get_nowait()
+    while not notifier._alert_queue.empty():
+        notifier._alert_queue.get_nowait()
 
     cfg = AlertingConfig(
         enabled=True,
@@ -60,18 +78,18 @@ async def test_enqueue_alert_no_channel_enabled_noop() -> None:
 
     await enqueue_alert(cfg, app_id="app1", window_start="2026-02-25T00:00:00Z", window_end="2026-02-25T01:00:00Z", breaches=breaches)
     
-    assert _alert_queue.empty()
+    assert notifier._alert_queue.empty()
 
 
 @pytest.mark.asyncio
 async def test_enqueue_alert_disabled_config_noop() -> None:
-    while not _alert_queue.empty():
-        _alert_queue.get_nowait()
+    while not notifier._alert_queue.empty():
+        notifier._alert_queue.get_nowait()
 
     cfg = AlertingConfig(enabled=False)
     await enqueue_alert(cfg, app_id="app1", window_start="none", window_end="none", breaches=[])
     
-    assert _alert_queue.empty()
+    assert notifier._alert_queue.empty()
 
 
 @pytest.mark.asyncio
@@ -127,8 +145,8 @@ async def test_circuit_breaker_success_resets_failures() -> None:
 
 @pytest.mark.asyncio
 async def test_alert_worker_batches_alerts_per_app(monkeypatch) -> None:
-    while not _alert_queue.empty():
-        _alert_queue.get_nowait()
+    while not notifier._alert_queue.empty():
+        notifier._alert_queue.get_nowait()
 
     sent = []
 
@@ -172,3 +190,117 @@ async def test_alert_worker_batches_alerts_per_app(monkeypatch) -> None:
     assert len(sent) == 1
     assert "2 breach(es)" in sent[0][0]
     assert "Breaches: 2" in sent[0][1]
+
+
+@pytest.mark.asyncio
+async def test_alert_worker_sends_email_and_teams_concurrently(monkeypatch) -> None:
+    import threading
+
+    while not notifier._alert_queue.empty():
+        notifier._alert_queue.get_nowait()
+
+    # Each sender waits for the other; a sequential dispatch would break the barrier.
+    barrier = threading.Barrier(2, timeout=2.0)
+    sent = []
+
+    def _fake_send(channel):
+        def _send(config, subject, body):
+            barrier.wait()
+            sent.append(channel)
+        return _send
+
+    monkeypatch.setattr(notifier, "_send_email", _fake_send("email"))
+    monkeypatch.setattr(notifier, "_send_teams", _fake_send("teams"))
+
+    cfg = AlertingConfig(
+        enabled=True,
+        min_level="warning",
+        email=EmailAlertConfig(enabled=True),
+        teams=TeamsAlertConfig(enabled=True),
+    )
+    breaches = [
+        ThresholdBreach(
+            metric_name="safety_toxicity",
+            level="warning",
+            threshold_value=0.9,
+            actual_value=0.7,
+            direction="min",
+        )
+    ]
+
+    stop_event = asyncio.Event()
+    worker = asyncio.create_task(
+        alert_worker(
+            batch_window_seconds=0.01,
+            stop_event=stop_event,
+            email_breaker=CircuitBreaker(),
+            teams_breaker=CircuitBreaker(),
+        )
+    )
+    try:
+        await enqueue_alert(cfg, app_id="app1", window_start="s", window_end="e", breaches=breaches)
+        await drain_alert_queue(timeout_seconds=5.0)
+        stop_event.set()
+        await worker
+    finally:
+        if not worker.done():
+            worker.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await worker
+
+    assert sorted(sent) == ["email", "teams"]
+
+
+def test_send_email_reuses_tls_context(monkeypatch) -> None:
+    contexts = []
+
+    class _FakeSMTP:
+        def __init__(self, host, port, timeout):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            return False
+
+        def starttls(self, context):
+            contexts.append(context)
+
+        def login(self, username, password):
+            pass
+
+        def send_message(self, message):
+            pass
+
+    monkeypatch.setattr(notifier.smtplib, "SMTP", _FakeSMTP)
+    cfg = AlertingConfig(
+        email=EmailAlertConfig(
+            enabled=True,
+            smtp_host="smtp.example.com",
+            from_address="alerts@example.com",
+            to_addresses=["ops@example.com"],
+        )
+    )
+
+    notifier._send_email(cfg, "subject", "body")
+    notifier._send_email(cfg, "subject", "body")
+
+    assert len(contexts) == 2
+    assert contexts[0] is contexts[1]
+
+
+def test_build_body_layout() -> None:
+    breach = ThresholdBreach(
+        metric_name="safety_toxicity",
+        level="warning",
+        threshold_value=0.9,
+        actual_value=0.7,
+        direction="min",
+    )
+    line = "- metric=safety_toxicity level=warning actual=0.7 threshold=0.9 direction=min"
+
+    assert notifier._build_body("app1", "s", "e", [breach, breach]) == (
+        f"Application: app1\nWindow: s .. e\nBreaches: 2\n\n{line}\n{line}"
+    )
+    assert notifier._build_body("app1", "s", "e", []) == "Application: app1\nWindow: s .. e\nBreaches: 0\n"
@@ -2,7 +2,8 @@ import json
 
 import pytest
 
-from data.otlp_repository import OtlpTelemetryRepository
+from data import otlp_repository as otlp_module
+from data.otlp_repository import OtlpTelemetryRepository, _otlp_attrs_to_dict, _parse_dt
 
 
 @pytest.mark.asyncio
@@ -63,3 +64,274 @@ async def test_otlp_repository_fetches_by_app_and_window(tmp_path) -> None:
     assert len(records) == 1
     assert records[0].app_id == "app1"
     assert records[0].metadata["trace_id"] == "trace-1"
+
+
+@pytest.mark.asyncio
+async def test_otlp_repository_window_is_start_inclusive_end_exclusive(tmp_path) -> None:
+    def _span(span_id: str, start_nanos: str) -> dict:
+        return {
+            "traceId": span_id,
+            "spanId": span_id,
+            "startTimeUnixNano": start_nanos,
+            "attributes": [{"key": "app_id", "value": {"stringValue": "app1"}}],
+        }
+
+    # 2023-11-14T22:00:00Z == 1699999200 seconds.
+    payload = {
+        "resourceSpans": [
+            {
+                "scopeSpans": [
+                    {
+                        "spans": [
+                            _span("before", "1699999199999999999"),
+                            _span("at-start", "1699999200000000000"),
+                            _span("at-end", "1700002800000000000"),
+                        ]
+                    }
+                ]
+            }
+        ]
+    }
+    file_path = tmp_path / "otlp.json"
+    file_path.write_text(json.dumps(payload))
+
+    repo = OtlpTelemetryRepository(str(file_path))
+    records = [
+        record
+        async for chunk in repo.fetch_telemetry(
+            app_id="app1",
+            start_ts="2023-11-14T22:00:00Z",
+            end_ts="2023-11-14T23:00:00Z",
+        )
+        for record in chunk
+    ]
+
+    assert [r.metadata["span_id"] for r in records] == ["at-start"]
+    assert records[0].timestamp == "2023-11-14T22:00:00+00:00"
+
+
+def test_otlp_attrs_to_dict_keeps_scalars_and_drops_other_kinds() -> None:
+    attrs = [
+        {"key": "s", "value": {"stringValue": "x"}},
+        {"key": "i", "value": {"intValue": "7"}},
+        {"key": "d", "value": {"doubleValue": 0.0}},
+        {"key": "b", "value": {"boolValue": False}},
+        {"key": "arr", "value": {"arrayValue": {"values": []}}},
+        {"key": "empty", "value": {}},
+        {"value": {"stringValue": "no-key"}},
+    ]
+
+    assert _otlp_attrs_to_dict(attrs) == {
+        "s": "x",
+        "i": "7",
+        "d": 0.0,
+        "b": False,
+        "arr": None,
+        "empty": None,
+    }
+
+
+@pytest.mark.asyncio
+async def test_otlp_repository_span_attrs_override_resource_attrs(tmp_path) -> None:
+    payload = {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": "app_id", "value": {"stringValue": "app1"}},
+                        {"key": "model_id", "value": {"stringValue": "resource-model"}},
+                    ]
+                },
+                "scopeSpans": [
+                    {
+                        "spans": [
+                            {
+                                "spanId": "inherits",
+                                "startTimeUnixNano": "1700000000000000000",
+                                "attributes": [],
+                            },
+                            {
+                                "spanId": "overrides",
+                                "startTimeUnixNano": "1700000000000000000",
+                                "attributes": [{"key": "model_id", "value": {"stringValue": "span-model"}}],
+                            },
+                            {
+                                "spanId": "other-app",
+                                "startTimeUnixNano": "1700000000000000000",
+                                "attributes": [{"key": "app_id", "value": {"stringValue": "app2"}}],
+                            },
+                        ]
+                    }
+                ],
+            }
+        ]
+    }
+    file_path = tmp_path / "otlp.json"
+    file_path.write_text(json.dumps(payload))
+
+    repo = OtlpTelemetryRepository(str(file_path))
+    records = [
+        record
+        async for chunk in repo.fetch_telemetry(
+            app_id="app1",
+            start_ts="2023-11-14T22:00:00+00:00",
+            end_ts="2023-11-14T23:00:00+00:00",
+        )
+        for record in chunk
+    ]
+
+    assert [(r.metadata["span_id"], r.model_id) for r in records] == [
+        ("inherits", "resource-model"),
+        ("overrides", "span-model"),
+    ]
+
+
+def _single_span_payload(span_id: str) -> dict:
+    return {
+        "resourceSpans": [
+            {
+                "scopeSpans": [
+                    {
+                        "spans": [
+                            {
+                                "spanId": span_id,
+                                "startTimeUnixNano": "1700000000000000000",
+                                "attributes": [
+                                    {"key": "app_id", "value": {"stringValue": "app1"}},
+                                    {"key": "latency_ms", "value": {"doubleValue": 12.5}},
+                                ],
+                            }
+                        ]
+                    }
+                ]
+            }
+        ]
+    }
+
+
+async def _fetch_span_ids(repo: OtlpTelemetryRepository) -> list:
+    return [
+        (record.metadata["span_id"], record.latency_ms)
+        async for chunk in repo.fetch_telemetry(
+            app_id="app1",
+            start_ts="2023-11-14T22:00:00+00:00",
+            end_ts="2023-11-14T23:00:00+00:00",
+        )
+        for record in chunk
+    ]
+
+
+@pytest.mark.asyncio
+async def test_otlp_repository_parses_small_file_once_until_it_changes(tmp_path) -> None:
+    otlp_module._load_resource_spans.cache_clear()
+    file_path = tmp_path / "otlp.json"
+    file_path.write_text(json.dumps(_single_span_payload("first")))
+    repo = OtlpTelemetryRepository(str(file_path))
+
+    assert await _fetch_span_ids(repo) == [("first", 12.5)]
+    assert await _fetch_span_ids(repo) == [("first", 12.5)]
+    assert otlp_module._load_resource_spans.cache_info().misses == 1
+
+    file_path.write_text(json.dumps(_single_span_payload("rewritten")))
+    assert await _fetch_span_ids(repo) == [("rewritten", 12.5)]
+    assert otlp_module._load_resource_spans.cache_info().misses == 2
+
+
+@pytest.mark.asyncio
+async def test_otlp_repository_streams_files_above_cache_limit(tmp_path) -> None:
+    otlp_module._load_resource_spans.cache_clear()
+    file_path = tmp_path / "otlp.json"
+    file_path.write_text(json.dumps(_single_span_payload("streamed")))
+    repo = OtlpTelemetryRepository(str(file_path), parse_cache_max_bytes=0)
+
+    assert await _fetch_span_ids(repo) == [("streamed", 12.5)]
+    assert otlp_module._load_resource_spans.cache_info().misses == 0
+
+
+@pytest.mark.asyncio
+async def test_otlp_repository_stdlib_fallback_matches_orjson(tmp_path, monkeypatch) -> None:
+    file_path = tmp_path / "otlp.json"
+    file_path.write_text(json.dumps(_single_span_payload("codec")))
+    repo = OtlpTelemetryRepository(str(file_path))
+
+    otlp_module._load_resource_spans.cache_clear()
+    with_orjson = await _fetch_span_ids(repo)
+
+    otlp_module._load_resource_spans.cache_clear()
+    monkeypatch.setattr(otlp_module, "orjson", None)
+    assert await _fetch_span_ids(repo) == with_orjson == [("codec", 12.5)]
+
+
+def test_parse_dt_treats_trailing_z_as_utc() -> None:
+    assert _parse_dt("2023-11-14T22:00:00Z") == _parse_dt("2023-11-14T22:00:00+00:00")
+    assert _parse_dt("2023-11-14T22:00:00.5Z").utcoffset().total_seconds() == 0
+    assert _parse_dt("2023-11-14T23:00:00+01:00") == _parse_dt("2023-11-14T22:00:00Z")
+
+
+@pytest.mark.asyncio
+async def test_otlp_repository_yields_fixed_size_chunks(tmp_path) -> None:
+    spans = [
+        {
+            "spanId": f"span-{i}",
+            "startTimeUnixNano": "1700000000000000000",
+            "attributes": [{"key": "app_id", "value": {"stringValue": "app1"}}],
+        }
+        for i in range(5)
+    ]
+    file_path = tmp_path / "otlp.json"
+    file_path.write_text(json.dumps({"resourceSpans": [{"scopeSpans": [{"spans": spans}]}]}))
+
+    repo = OtlpTelemetryRepository(str(file_path), chunk_size=2)
+    chunks = [
+        [record.metadata["span_id"] for record in chunk]
+        async for chunk in repo.fetch_telemetry(
+            app_id="app1",
+            start_ts="2023-11-14T22:00:00+00:00",
+            end_ts="2023-11-14T23:00:00+00:00",
+        )
+    ]
+
+    assert chunks == [["span-0", "span-1"], ["span-2", "span-3"], ["span-4"]]
+
+
+@pytest.mark.asyncio
+async def test_otlp_repository_records_share_repeated_strings(tmp_path) -> None:
+    spans = [
+        {
+            "spanId": f"span-{i}",
+            "startTimeUnixNano": "1700000000000000000",
+            "attributes": [
+                {"key": "app_id", "value": {"stringValue": "app1"}},
+                {"key": "model_id", "value": {"stringValue": "gpt-" + "x" * 40}},
+                {"key": "service.name", "value": {"stringValue": "svc-" + "y" * 40}},
+            ],
+        }
+        for i in range(2)
+    ]
+    file_path = tmp_path / "otlp.json"
+    file_path.write_text(json.dumps({"resourceSpans": [{"scopeSpans": [{"spans": spans}]}]}))
+
+    repo = OtlpTelemetryRepository(str(file_path))
+    first, second = [
+        record
+        async for chunk in repo.fetch_telemetry(
+            app_id="app1",
+            start_ts="2023-11-14T22:00:00+00:00",
+            end_ts="2023-11-14T23:00:00+00:00",
+        )
+        for record in chunk
+    ]
+
+    assert first.model_id is second.model_id
+    assert first.model_version is second.model_version
+    assert first.metadata["service_name"] is second.metadata["service_name"]
+    assert first.app_id is second.app_id
+
+
+def test_parse_lock_is_shared_per_file_version() -> None:
+    first = otlp_module._parse_lock_for("/exports/a.json", 1, 10)
+
+    assert otlp_module._parse_lock_for("/exports/a.json", 1, 10) is first
+    assert otlp_module._parse_lock_for("/exports/b.json", 1, 10) is not first
+    assert otlp_module._parse_lock_for("/exports/a.json", 2, 10) is not first
+    assert otlp_module._load_resource_spans.cache_info().maxsize == 1
@@ -0,0 +1,177 @@
+import statistics
+from typing import Any, List
+
+import pytest
+
+from config.models import PolicyConfig
+from data.models import TelemetryRecord
+from evaluation.policies import (
+    PerformanceReadabilityFluencyStylePolicy,
+    PerformanceRelevancePolicy,
+    SafetyBiasFairnessPolicy,
+    _mean,
+)
+
+
+def _record(idx: int, input_text: str, output_text: str, **metadata: Any) -> TelemetryRecord:
+    return TelemetryRecord(
+        id=str(idx),
+        app_id="app1",
+        timestamp=f"2026-02-24T00:00:{idx:02d}Z",
+        model_id="m1",
+        model_version="1.0",
+        input_text=input_text,
+        output_text=output_text,
+        metadata=dict(metadata),
+    )
+
+
+def _records() -> List[TelemetryRecord]:
+    return [
+        _record(1, "what is the capital of france", "The capital of France is Paris.", demographic_group="a"),
+        _record(2, "summarize the report", "The report covers revenue and costs", demographic_group="b"),
+        _record(3, "hello", "", demographic_group="a"),
+    ]
+
+
+def _policy(cls: type, **parameters: Any) -> Any:
+    return cls(PolicyConfig(name="p", metrics=[], parameters=parameters))
+
+
+def test_mean_matches_statistics_mean() -> None:
+    values = [0.1, 0.2, 0.3, 1e-9, 7.25]
+    assert _mean(values) == pytest.approx(statistics.mean(values), rel=1e-15)
+    assert _mean([]) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_relevance_and_readability_scores_are_stable() -> None:
+    records = _records()
+
+    relevance = (await _policy(PerformanceRelevancePolicy).evaluate("app1", records))[0]
+    readability = (await _policy(PerformanceReadabilityFluencyStylePolicy).evaluate("app1", records))[0]
+    fairness = (await _policy(SafetyBiasFairnessPolicy).evaluate("app1", records))[0]
+
+    # Pinned against the statistics.mean implementation.
+    assert relevance.value == 0.3333
+    assert readability.value == 0.6667
+    assert fairness.value == 0.3333
+    assert fairness.metadata["groups"] == 2
+
+
+def _ops_records() -> List[TelemetryRecord]:
+    records = _records()
+    for idx, (latency, status, util) in enumerate(
+        [(120.0, "ok", 0.2), (None, "timeout", 0.1), (340.5, "OK", 0.97)]
+    ):
+        records[idx].latency_ms = latency
+        records[idx].metadata.update({"status": status, "resource_utilization": util})
+    return records
+
+
+def test_record_aggregates_columns() -> None:
+    from evaluation.aggregates import RecordAggregates
+
+    records = _ops_records()
+    agg = RecordAggregates.from_records(records)
+    lengths = [len(r.output_text or "") for r in records]
+
+    assert agg.sample_count == 3
+    assert agg.input_texts == tuple(r.input_text for r in records)
+    assert agg.output_texts[0] == "The capital of France is Paris."
+    assert RecordAggregates.from_records([_record(9, None, None)]).output_texts == ("",)
+    assert agg.latencies == (120.0, 340.5)
+    assert agg.latency_sum == 460.5
+    assert agg.degraded_events == 2
+    assert agg.output_length_mean == pytest.approx(statistics.mean(lengths))
+    assert agg.output_length_pstdev == pytest.approx(statistics.pstdev(lengths))
+    assert agg.latency_stats == (230.25, 340.5)
+    assert RecordAggregates.from_records([]).output_length_pstdev == 0.0
+    assert RecordAggregates.from_records([]).latency_stats == (0.0, 0.0)
+
+
+@pytest.mark.asyncio
+async def test_policies_read_shared_aggregates() -> None:
+    from evaluation.aggregates import RecordAggregates
+    from evaluation.policies import (
+        SafetyRobustnessPolicy,
+        SystemReliabilityAvailabilityResourceHealthPolicy,
+        SystemReliabilityLatencyPolicy,
+    )
+
+    records = _ops_records()
+    shared = RecordAggregates.from_records(records)
+    for cls, expected in (
+        (SafetyRobustnessPolicy, 0.289),
+        (SystemReliabilityLatencyPolicy, 340.5),
+        (SystemReliabilityAvailabilityResourceHealthPolicy, 0.3333),
+    ):
+        standalone = (await _policy(cls).evaluate("app1", records))[0]
+        policy = _policy(cls)
+        policy.aggregates = shared
+        reused = (await policy.evaluate("app1", records))[0]
+        assert standalone.value == reused.value == expected
+        assert standalone.metadata == reused.metadata
+
+
+@pytest.mark.asyncio
+async def test_record_aggregates_compute_only_columns_that_are_read() -> None:
+    from evaluation.aggregates import RecordAggregates
+    from evaluation.policies import SafetyToxicityPolicy
+
+    records = _ops_records()
+    records[0].metadata["resource_utilization"] = "high"
+    shared = RecordAggregates.from_records(records)
+    policy = _policy(SafetyToxicityPolicy)
+    policy.aggregates = shared
+
+    assert (await policy.evaluate("app1", records))[0].value == 1.0
+    assert set(vars(shared)) == {"records", "output_texts", "output_analyses"}
+    with pytest.raises(ValueError):
+        shared.degraded_events
+
+
+def test_record_aggregates_analyze_each_text_once() -> None:
+    from evaluation.aggregates import RecordAggregates
+
+    agg = RecordAggregates.from_records(_records())
+    first = agg.output_analyses[0]
+
+    assert first.words == ("the", "capital", "of", "france", "is", "paris")
+    assert first.tokens == frozenset(first.words)
+    assert first.ends_with_sentence_punct and first.sentence_count == 1
+    assert agg.output_analyses[2].words == ()
+    assert agg.input_analyses[1].tokens == {"summarize", "the", "report"}
+    assert agg.output_analyses is agg.output_analyses
+
+
+def test_nearest_rank_percentile_matches_sorted_index() -> None:
+    import math
+    import random
+
+    from evaluation.aggregates import nearest_rank_percentile
+
+    rng = random.Random(7)
+    for size in (1, 2, 3, 19, 20, 21, 100, 1001, 4096, 5003):
+        values = [rng.uniform(0, 5000) for _ in range(size)]
+        ordered = sorted(values)
+        for fraction in (0.5, 0.95, 0.99, 1.0):
+            expected = ordered[max(0, math.ceil(size * fraction) - 1)]
+            assert nearest_rank_percentile(values, fraction) == expected
+
+
+@pytest.mark.asyncio
+async def test_policy_parameters_are_resolved_at_construction() -> None:
+    from evaluation.policies import SafetyCompliancePolicy, SafetyToxicityPolicy
+
+    toxicity = _policy(SafetyToxicityPolicy, toxic_terms=["paris"], version="2.0")
+    compliance = _policy(SafetyCompliancePolicy)
+
+    assert toxicity.toxic_terms == frozenset({"paris"})
+    assert toxicity.version == "2.0"
+    assert "credit card" in compliance.blocked_terms
+    assert compliance.version == "1.0"
+
+    metric = (await toxicity.evaluate("app1", _records()))[0]
+    assert metric.metadata["toxic_hits"] == 1
+    assert metric.version == "2.0"
@@ -1,10 +1,21 @@
 from __future__ import annotations
 
+import threading
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List
 
 import pytest
 
-from data.repositories import CosmosTelemetryRepository, _pick_telemetry_fields
+from data.models import EvaluationResult, TelemetryRecord
+from data.repositories import (
+    CosmosEvaluationRepository,
+    CosmosTelemetryRepository,
+    InMemoryEvaluationRepository,
+    InMemoryStore,
+    InMemoryTelemetryRepository,
+    _date_slices,
+    _record_from_row,
+)
 
 
 class _FakePager:
@@ -18,6 +29,7 @@ class _FakePager:
 class _FakeCosmosClient:
     def __init__(self) -> None:
         self.partition_keys: List[str] = []
+        self.queries: List[str] = []
 
     def query_telemetry_paged(
         self,
@@ -26,6 +38,7 @@ class _FakeCosmosClient:
         max_item_count: int = 100,
         partition_key: str | None = None,
     ) -> _FakePager:
+        self.queries.append(query)
         if partition_key is not None:
             self.partition_keys.append(partition_key)
         # Return one page with one minimal telemetry item for each partition query.
@@ -46,7 +59,7 @@ class _FakeCosmosClient:
             ]
         )
 
-def test_pick_telemetry_fields_preserves_existing_metadata_trace_id() -> None:
+def test_record_from_row_preserves_existing_metadata_trace_id() -> None:
     row = {
         "id": "t1",
         "app_id": "app1",
@@ -60,12 +73,12 @@ def test_pick_telemetry_fields_preserves_existing_metadata_trace_id() -> None:
         "ignored": "x",
     }
 
-    payload = _pick_telemetry_fields(row)
-    assert payload["metadata"]["trace_id"] == "from-metadata"
-    assert "ignored" not in payload
+    record = _record_from_row(row)
+    assert record.metadata["trace_id"] == "from-metadata"
+    assert record.model_version == "v"
 
 
-def test_pick_telemetry_fields_promotes_top_level_trace_id() -> None:
+def test_record_from_row_promotes_top_level_trace_id() -> None:
     row = {
         "id": "t2",
         "app_id": "app1",
@@ -77,8 +90,8 @@ def test_pick_telemetry_fields_promotes_top_level_trace_id() -> None:
         "trace_id": "top-level-trace",
     }
 
-    payload = _pick_telemetry_fields(row)
-    assert payload["metadata"]["trace_id"] == "top-level-trace"
+    record = _record_from_row(row)
+    assert record.metadata["trace_id"] == "top-level-trace"
 
 
 @pytest.mark.asyncio
@@ -101,3 +114,375 @@ async def test_cosmos_telemetry_repository_queries_date_sliced_partitions() -> N
         "app1:2026-02-25",
         "app1:2026-02-26",
     ]
+    # Explicit projection of the record fields and every trace id name, never the whole document.
+    assert not client.queries[0].startswith("SELECT *")
+    assert "c.trace_id, c.traceId, c.traceparent" in client.queries[0]
+
+
+class _BarrierPager:
+    """Pager whose first page only arrives once ``parties`` partitions are fetching at once."""
+
+    def __init__(self, barrier: threading.Barrier, rows: List[Dict[str, Any]]) -> None:
+        self._barrier = barrier
+        self._rows = rows
+
+    def by_page(self):
+        self._barrier.wait(timeout=5)
+        yield self._rows
+
+
+class _ConcurrentFakeCosmosClient:
+    def __init__(self, parties: int, fail_partition: str | None = None) -> None:
+        self._barrier = threading.Barrier(parties)
+        self._fail_partition = fail_partition
+
+    def query_telemetry_paged(self, query, parameters, max_item_count=100, partition_key=None):
+        if partition_key == self._fail_partition:
+            raise RuntimeError(f"boom in {partition_key}")
+        row = {
+            "id": f"row-{partition_key}",
+            "app_id": "app1",
+            "timestamp": "2026-02-24T00:00:00Z",
+            "model_id": "m",
+            "model_version": "v",
+            "input_text": "in",
+            "output_text": "out",
+        }
+        return _BarrierPager(self._barrier, [row])
+
+
+@pytest.mark.asyncio
+async def test_cosmos_telemetry_repository_scans_day_partitions_concurrently() -> None:
+    repo = CosmosTelemetryRepository(_ConcurrentFakeCosmosClient(parties=2), partition_concurrency=2)
+
+    ids = [
+        record.id
+        async for chunk in repo.fetch_telemetry(
+            app_id="app1",
+            start_ts="2026-02-24T23:00:00Z",
+            end_ts="2026-02-25T01:00:00Z",
+        )
+        for record in chunk
+    ]
+
+    # Each pager blocks until both partitions are fetching, so a sequential scan would time out.
+    assert sorted(ids) == ["row-app1:2026-02-24", "row-app1:2026-02-25"]
+
+
+@pytest.mark.asyncio
+async def test_cosmos_telemetry_repository_surfaces_partition_errors() -> None:
+    client = _ConcurrentFakeCosmosClient(parties=1, fail_partition="app1:2026-02-25")
+    repo = CosmosTelemetryRepository(client, partition_concurrency=1)
+
+    with pytest.raises(RuntimeError, match="boom in app1:2026-02-25"):
+        async for _ in repo.fetch_telemetry(
+            app_id="app1",
+            start_ts="2026-02-24T23:00:00Z",
+            end_ts="2026-02-25T01:00:00Z",
+        ):
+            pass
+
+
+class _FakeResultsClient:
+    def __init__(self, stored_ids: List[str]) -> None:
+        self.stored_ids = set(stored_ids)
+        self.queried_ids: List[List[str]] = []
+        self.upserted: List[Dict[str, Any]] = []
+
+    def query_results(self, query: str, parameters: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        ids = [p["value"] for p in parameters]
+        self.queried_ids.append(ids)
+        return [{"id": rid} for rid in ids if rid in self.stored_ids]
+
+    def upsert_results_batch(self, items: List[Dict[str, Any]], partition_key: str) -> None:
+        self.upserted.extend(items)
+        self.stored_ids.update(item["id"] for item in items)
+
+    def upsert_result(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        self.upserted.append(item)
+        self.stored_ids.add(item["id"])
+        return item
+
+
+def _result(result_id: str, timestamp: str = "2026-02-24T00:00:00Z") -> EvaluationResult:
+    return EvaluationResult(
+        id=result_id,
+        app_id="app1",
+        timestamp=timestamp,
+        policy_name="p",
+        metrics=[],
+    )
+
+
+@pytest.mark.asyncio
+async def test_results_exist_only_queries_ids_not_known_to_exist() -> None:
+    client = _FakeResultsClient(stored_ids=["old"])
+    repo = CosmosEvaluationRepository(client)
+
+    await repo.save_results([_result("saved")])
+    assert await repo.results_exist(["saved", "old", "new"]) == ["saved", "old"]
+    assert client.queried_ids == [["old", "new"]]
+
+    # "old" was found once and is now answered locally; "new" is still unknown.
+    assert await repo.results_exist(["old", "new"]) == ["old"]
+    assert client.queried_ids[-1] == ["new"]
+    assert await repo.result_exists("saved")
+    assert len(client.queried_ids) == 2
+
+
+def test_known_result_ids_are_capped_oldest_first() -> None:
+    repo = CosmosEvaluationRepository(_FakeResultsClient(stored_ids=[]), known_ids_max=2)
+
+    repo._remember(["a", "b", "c"])
+
+    assert list(repo._known_ids) == ["b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_save_results_writes_partitions_concurrently() -> None:
+    barrier = threading.Barrier(2)
+
+    class _BarrierResultsClient(_FakeResultsClient):
+        def upsert_results_batch(self, items: List[Dict[str, Any]], partition_key: str) -> None:
+            barrier.wait(timeout=5)
+            super().upsert_results_batch(items, partition_key)
+
+    client = _BarrierResultsClient(stored_ids=[])
+    repo = CosmosEvaluationRepository(client, write_concurrency=2)
+    next_day = "2026-02-25T00:00:00Z"
+
+    # Two partitions, two results each: each batch waits for the other partition's batch.
+    await repo.save_results([_result("r1"), _result("r1b"), _result("r2", next_day), _result("r2b", next_day)])
+
+    assert sorted(item["id"] for item in client.upserted) == ["r1", "r1b", "r2", "r2b"]
+    assert await repo.result_exists("r2b")
+    assert client.queried_ids == []
+
+
+@pytest.mark.parametrize("empty_trace_id", [None, ""])
+def test_record_from_row_skips_null_or_empty_trace_id(empty_trace_id: Any) -> None:
+    row = {
+        "id": "t4",
+        "app_id": "app1",
+        "timestamp": "2026-02-24T00:00:00Z",
+        "model_id": "m",
+        "model_version": "v",
+        "input_text": "in",
+        "output_text": "out",
+        "metadata": {"trace_id": ""},
+        "trace_id": empty_trace_id,
+        "traceId": "abc",
+    }
+
+    assert _record_from_row(row).metadata["trace_id"] == "abc"
+
+
+def test_record_from_row_defaults_optional_fields() -> None:
+    row = {
+        "id": "t3",
+        "app_id": "app1",
+        "timestamp": "2026-02-24T00:00:00Z",
+        "model_id": "m",
+        "model_version": "v",
+        "input_text": "in",
+        "output_text": "out",
+        "trace_id": 42,
+    }
+
+    record = _record_from_row(row)
+    assert record.expected_output is None
+    assert record.user_id is None
+    assert record.latency_ms is None
+    assert record.metadata == {"trace_id": "42"}
+
+
+def test_date_slices_cover_every_overlapping_day() -> None:
+    assert _date_slices("2024-02-28T23:00:00Z", "2024-03-01T01:00:00Z") == (
+        "2024-02-28",
+        "2024-02-29",
+        "2024-03-01",
+    )
+    assert _date_slices("2026-12-31T10:00:00Z", "2026-12-31T11:00:00Z") == ("2026-12-31",)
+    assert _date_slices("2026-01-02T00:00:00Z", "2026-01-01T00:00:00Z") == ()
+
+
+@pytest.mark.asyncio
+async def test_in_memory_latest_results_returns_newest_first() -> None:
+    store = InMemoryStore(telemetry=[], results=[])
+    repo = InMemoryEvaluationRepository(store)
+    await repo.save_results([_result(f"r{day}", f"2026-02-{day:02d}T00:00:00Z") for day in (3, 1, 4, 2)])
+    store.results.append(
+        EvaluationResult(id="other", app_id="app2", timestamp="2026-03-01T00:00:00Z", policy_name="p", metrics=[])
+    )
+
+    latest = await repo.latest_results("app1", limit=2)
+    assert [r["id"] for r in latest] == ["r4", "r3"]
+    assert latest[0]["pk"] == "app1:2026-02-04"
+
+
+def _telemetry(record_id: str, app_id: str, timestamp: str) -> TelemetryRecord:
+    return TelemetryRecord(
+        id=record_id,
+        app_id=app_id,
+        timestamp=timestamp,
+        model_id="m",
+        model_version="v",
+        input_text="in",
+        output_text="out",
+    )
+
+
+@pytest.mark.asyncio
+async def test_in_memory_store_indexes_appended_records() -> None:
+    store = InMemoryStore(
+        telemetry=[
+            _telemetry("late", "app1", "2026-02-24T05:00:00Z"),
+            _telemetry("early", "app1", "2026-02-24T01:00:00Z"),
+            _telemetry("other", "app2", "2026-02-24T02:00:00Z"),
+        ],
+        results=[],
+    )
+    telemetry_repo = InMemoryTelemetryRepository(store)
+    results_repo = InMemoryEvaluationRepository(store)
+
+    async def _window_ids() -> List[str]:
+        window = telemetry_repo.fetch_telemetry("app1", "2026-02-24T01:00:00Z", "2026-02-24T05:00:00Z")
+        return [r.id async for chunk in window for r in chunk]
+
+    assert await _window_ids() == ["early"]
+    store.telemetry.append(_telemetry("mid", "app1", "2026-02-24T03:00:00Z"))
+    assert await _window_ids() == ["early", "mid"]
+
+    assert not await results_repo.result_exists("r1")
+    store.results.append(_result("r1"))
+    assert await results_repo.results_exist(["r1", "r2"]) == ["r1"]
+    store.results.clear()
+    assert not await results_repo.result_exists("r1")
+
+    # A reassigned list of the same length is re-indexed rather than served from the old index.
+    store.results.append(_result("r1"))
+    assert await results_repo.result_exists("r1")
+    store.results = [_result("r2")]
+    assert await results_repo.results_exist(["r1", "r2"]) == ["r2"]
+
+
+def test_in_memory_store_equality_ignores_indexes() -> None:
+    indexed = InMemoryStore(telemetry=[], results=[_result("r1")])
+    indexed.result_ids()
+
+    assert indexed == InMemoryStore(telemetry=[], results=[_result("r1")])
+
+
+@pytest.mark.asyncio
+async def test_results_exist_queries_chunks_concurrently() -> None:
+    barrier = threading.Barrier(3)
+
+    class _BarrierResultsClient(_FakeResultsClient):
+        def query_results(self, query: str, parameters: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            barrier.wait(timeout=5)
+            return super().query_results(query, parameters)
+
+    ids = [f"r{i:03d}" for i in range(250)]
+    client = _BarrierResultsClient(stored_ids=ids[::2])
+    repo = CosmosEvaluationRepository(client, query_concurrency=3)
+
+    # Three chunks (100, 100, 50) only get past the barrier if all are in flight at once.
+    assert await repo.results_exist(ids) == ids[::2]
+    assert sorted(len(chunk) for chunk in client.queried_ids) == [50, 100, 100]
+
+
+class _PartitionedResultsClient:
+    def __init__(self, rows_by_partition: Dict[str, List[Dict[str, Any]]]) -> None:
+        self.rows_by_partition = rows_by_partition
+        self.queried_partitions: List[Any] = []
+
+    def query_results(
+        self, query: str, parameters: List[Dict[str, Any]], partition_key: str | None = None
+    ) -> List[Dict[str, Any]]:
+        self.queried_partitions.append(partition_key)
+        top = int(query.split("TOP ")[1].split()[0])
+        if partition_key is None:
+            excluded = next((p["value"] for p in parameters if p["name"] == "@exclude_pks"), [])
+            self.excluded_partitions = excluded
+            rows = [row for pk, rows in self.rows_by_partition.items() if pk not in excluded for row in rows]
+        else:
+            rows = self.rows_by_partition.get(partition_key, [])
+        return sorted(rows, key=lambda r: r["timestamp"], reverse=True)[:top]
+
+
+@pytest.mark.asyncio
+async def test_latest_results_walks_recent_partitions_newest_first() -> None:
+    today = datetime.now(timezone.utc).date()
+    yesterday = today - timedelta(days=1)
+    client = _PartitionedResultsClient(
+        {
+            f"app1:{today}": [{"timestamp": f"{today}T01:00:00Z"}],
+            f"app1:{yesterday}": [{"timestamp": f"{yesterday}T0{h}:00:00Z"} for h in range(3)],
+        }
+    )
+    repo = CosmosEvaluationRepository(client, latest_lookback_days=3)
+
+    latest = await repo.latest_results("app1", limit=3)
+    assert [r["timestamp"] for r in latest] == [
+        f"{today}T01:00:00Z",
+        f"{yesterday}T02:00:00Z",
+        f"{yesterday}T01:00:00Z",
+    ]
+    assert client.queried_partitions == [f"app1:{today}", f"app1:{yesterday}"]
+
+    # Not enough results inside the lookback window: one cross-partition query fetches only
+    # what the walked partitions could not supply, and the two sets are merged newest first.
+    old_day = today - timedelta(days=10)
+    client.rows_by_partition[f"app1:{old_day}"] = [{"timestamp": f"{old_day}T0{h}:00:00Z"} for h in range(3)]
+    client.queried_partitions.clear()
+    latest = await repo.latest_results("app1", limit=6)
+    assert [r["timestamp"] for r in latest] == [
+        f"{today}T01:00:00Z",
+        f"{yesterday}T02:00:00Z",
+        f"{yesterday}T01:00:00Z",
+        f"{yesterday}T00:00:00Z",
+        f"{old_day}T02:00:00Z",
+        f"{old_day}T01:00:00Z",
+    ]
+    assert client.queried_partitions[-1] is None
+    assert len(client.queried_partitions) == 4
+    assert len(client.excluded_partitions) == 3
+
+
+@pytest.mark.asyncio
+async def test_save_results_skips_ids_already_saved() -> None:
+    client = _FakeResultsClient(stored_ids=[])
+    repo = CosmosEvaluationRepository(client)
+
+    await repo.save_results([_result("r1"), _result("r1")])
+    await repo.save_results([_result("r1"), _result("r2")])
+
+    assert [item["id"] for item in client.upserted] == ["r1", "r2"]
+
+
+@pytest.mark.asyncio
+async def test_save_results_keeps_last_duplicate_within_call() -> None:
+    client = _FakeResultsClient(stored_ids=[])
+    repo = CosmosEvaluationRepository(client)
+
+    await repo.save_results(
+        [_result("r1", "2026-02-24T01:00:00Z"), _result("r2"), _result("r1", "2026-02-24T02:00:00Z")]
+    )
+
+    assert [(item["id"], item["timestamp"]) for item in client.upserted] == [
+        ("r1", "2026-02-24T02:00:00Z"),
+        ("r2", "2026-02-24T00:00:00Z"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_cosmos_calls_run_on_dedicated_io_pool() -> None:
+    class _ThreadRecordingClient(_FakeResultsClient):
+        def upsert_result(self, item: Dict[str, Any]) -> Dict[str, Any]:
+            self.thread_name = threading.current_thread().name
+            return super().upsert_result(item)
+
+    client = _ThreadRecordingClient(stored_ids=[])
+    await CosmosEvaluationRepository(client).save_result(_result("r1"))
+
+    assert client.thread_name.startswith("cosmos-io")
@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta, timezone
+
+from croniter import croniter
+
+from config.models import ResolvedAppConfig
+from orchestration.scheduler import CronScheduler
+
+
+def _app(app_id: str, batch_time: str) -> ResolvedAppConfig:
+    return ResolvedAppConfig(
+        app_id=app_id,
+        batch_time=batch_time,
+        policy_names=[],
+        policies=[],
+        thresholds={},
+    )
+
+
+def test_next_run_time_matches_fresh_croniter_and_reuses_parsed_schedule() -> None:
+    scheduler = CronScheduler()
+    apps = [_app("a", "0 2 * * *"), _app("b", "0 2 * * *"), _app("c", "*/15 * * * 1-5")]
+    base = datetime(2026, 2, 24, 1, 7, tzinfo=timezone.utc)
+
+    # Move forward and backward in time so cached iterators are re-seeded both ways.
+    for offset_hours in (0, 30, -12, 5):
+        now = base + timedelta(hours=offset_hours)
+        for app in apps:
+            expected = croniter(app.batch_time, now).get_next(datetime)
+            assert scheduler.next_run_time(app, now=now) == expected
+
+    assert len(scheduler._iters) == 2
+
+
+def test_due_apps_uses_previous_tick() -> None:
+    scheduler = CronScheduler()
+    app = _app("a", "0 * * * *")
+    now = datetime(2026, 2, 24, 10, 30, tzinfo=timezone.utc)
+
+    assert scheduler.due_apps([app], now=now) == [app]
+    scheduler.mark_run("a", now)
+    assert scheduler.due_apps([app], now=now + timedelta(minutes=20)) == []
+    assert scheduler.due_apps([app], now=now + timedelta(minutes=45)) == [app]
@@ -54,6 +54,27 @@ def test_processor_writes_telemetry_document_with_partition_key() -> None:
     assert doc["metadata"]["ingest_source"] == "event_hub_processor"
 
 
+def test_process_events_uses_bulk_sink_when_available() -> None:
+    class BulkSink(InMemoryTelemetrySink):
+        def __init__(self) -> None:
+            super().__init__()
+            self.bulk_calls = 0
+
+        def upsert_telemetry_many(self, items: List[Dict[str, Any]]) -> None:
+            self.bulk_calls += 1
+            self.items.extend(items)
+
+    sink = BulkSink()
+    processor = TelemetryEventProcessor(sink)
+
+    count = processor.process_events([_sample_event(), _sample_event()], enqueued_time_utc="2026-02-27T00:00:01Z")
+
+    assert count == 2
+    assert sink.bulk_calls == 1
+    assert len(sink.items) == 2
+    assert sink.items[0]["metadata"]["event_hub_enqueued_time_utc"] == "2026-02-27T00:00:01Z"
+
+
 from unittest.mock import MagicMock, patch
 import json
 import gzip
@@ -85,7 +106,14 @@ import gzip
 from unittest.mock import MagicMock
 
 def test_processor_decompresses_gzip_array_payload() -> None:
-    sink = InMemoryTelemetrySink()
+    bulk_calls: List[int] = []
+
+    class _BulkSink(InMemoryTelemetrySink):
+        def upsert_telemetry_many(self, items: List[Dict[str, Any]]) -> None:
+            bulk_calls.append(len(items))
+            self.items.extend(items)
+
+    sink = _BulkSink()
     processor = TelemetryEventProcessor(sink)
 
     mock_azure = MagicMock()
@@ -117,7 +145,47 @@ def test_processor_decompresses_gzip_array_payload() -> None:
 
         assert len(sink.items) == 2
         assert sink.items[0]["metadata"]["trace_id"] == "trace-a"
-        assert len(sink.items) == 2
+        assert bulk_calls == [2]
         assert mock_partition_context.update_checkpoint.call_count == 1
     finally:
         sys.modules.pop("azure.eventhub", None)
+
+
+def test_process_events_writes_partitions_concurrently_with_executor() -> None:
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    barrier = threading.Barrier(2)
+
+    class _BarrierSink(InMemoryTelemetrySink):
+        def upsert_telemetry_many(self, items: List[Dict[str, Any]]) -> None:
+            # Each partition group waits for the other, so this only passes when they overlap.
+            barrier.wait(timeout=5)
+            self.items.extend(items)
+
+    events = [_sample_event(), _sample_event(), _sample_event()]
+    events[2]["app_id"] = "app2"
+    sink = _BarrierSink()
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        count = TelemetryEventProcessor(sink).process_events(events, executor=executor)
+
+    assert count == 3
+    assert sorted(doc["app_id"] for doc in sink.items) == ["app1", "app1", "app2"]
+
+
+def test_run_eventhub_processor_loop_accepts_deprecated_max_concurrency() -> None:
+    import pytest
+
+    mock_azure = MagicMock()
+    sys.modules["azure.eventhub"] = mock_azure
+    try:
+        from telemetry.processor import run_eventhub_processor_loop
+
+        with pytest.warns(DeprecationWarning, match="max_concurrency"):
+            run_eventhub_processor_loop(
+                TelemetryEventProcessor(InMemoryTelemetrySink()), "Endpoint=sb://fake", "fake-hub", max_concurrency=4
+            )
+        assert mock_azure.EventHubConsumerClient.from_connection_string.return_value.receive.called
+    finally:
+        sys.modules.pop("azure.eventhub", None)
@@ -23,3 +23,72 @@ def test_evaluate_thresholds_detects_breach() -> None:
 
     assert len(breaches) == 1
     assert breaches[0].level == "warning"
+
+
+def test_evaluate_thresholds_indexed_matches_unindexed() -> None:
+    from evaluation.thresholds import build_threshold_index, evaluate_thresholds_indexed
+
+    metrics = [
+        MetricValueVersioned(metric_name="performance_precision_coherence", value=0.85, version="1.0", timestamp="t"),
+        MetricValueVersioned(metric_name="system_reliability_latency", value=1500.0, version="1.0", timestamp="t"),
+        MetricValueVersioned(metric_name="unthresholded", value=0.0, version="1.0", timestamp="t"),
+    ]
+    thresholds = {
+        "performance_precision_coherence": [
+            ThresholdConfig(level="warning", value=0.93, direction="min"),
+            ThresholdConfig(level="critical", value=0.88, direction="min"),
+        ],
+        "system_reliability_latency": [
+            ThresholdConfig(level="warning", value=1200, direction="max"),
+            ThresholdConfig(level="critical", value=2000, direction="max"),
+        ],
+    }
+
+    indexed = evaluate_thresholds_indexed(metrics, build_threshold_index(thresholds))
+
+    assert [b.to_dict() for b in indexed] == [b.to_dict() for b in evaluate_thresholds(metrics, thresholds)]
+    assert [(b.metric_name, b.level) for b in indexed] == [
+        ("performance_precision_coherence", "warning"),
+        ("performance_precision_coherence", "critical"),
+        ("system_reliability_latency", "warning"),
+    ]
+
+
+def test_evaluate_thresholds_indexed_rejects_unknown_direction_on_use() -> None:
+    import pytest
+
+    from evaluation.thresholds import build_threshold_index, evaluate_thresholds_indexed
+
+    index = build_threshold_index({"m": [ThresholdConfig(level="warning", value=1.0, direction="sideways")]})
+    metric = MetricValueVersioned(metric_name="m", value=0.5, version="1.0", timestamp="t")
+
+    with pytest.raises(ValueError, match="sideways"):
+        evaluate_thresholds_indexed([metric], index)
+
+
+def test_evaluate_thresholds_indexed_boundaries_match_strict_comparison() -> None:
+    from evaluation.thresholds import build_threshold_index, evaluate_thresholds_indexed
+
+    thresholds = {
+        "low": [ThresholdConfig(level="warning", value=0.5, direction="min")],
+        "high": [ThresholdConfig(level="warning", value=100, direction="max")],
+    }
+    index = build_threshold_index(thresholds)
+    for value in (0.5, 0.4999, 0.5001, 100.0, 99.999, 100.001, float("nan")):
+        metrics = [
+            MetricValueVersioned(metric_name="low", value=value, version="1.0", timestamp="t"),
+            MetricValueVersioned(metric_name="high", value=value, version="1.0", timestamp="t"),
+        ]
+        indexed = [b.to_dict() for b in evaluate_thresholds_indexed(metrics, index)]
+        assert indexed == [b.to_dict() for b in evaluate_thresholds(metrics, thresholds)]
+
+
+def test_threshold_models_use_slots() -> None:
+    metric = MetricValueVersioned(metric_name="m", value=1.0, version="1.0", timestamp="t")
+    threshold = ThresholdConfig(level="warning", value=1.0, direction="min")
+    for obj in (metric, threshold):
+        assert not hasattr(obj, "__dict__")
+
+    # Batch runs stamp version/metadata onto existing metrics, so they stay mutable.
+    metric.version = "2.0"
+    assert metric.to_dict()["version"] == "2.0"
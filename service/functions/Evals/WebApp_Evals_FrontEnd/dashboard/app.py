@@ -1,12 +1,22 @@
 from __future__ import annotations
 
 import json
+import re
 import sys
 import threading
+from dataclasses import asdict
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional
 
 from flask import Flask, jsonify, render_template, request, Response
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to the stdlib codec.
+    orjson = None
 
 BASE_DIR = Path(__file__).resolve().parent
 MOCK_FILE = BASE_DIR / "mock_results.json"
@@ -19,19 +29,74 @@ if str(BACKEND_ROOT) not in sys.path:
 from config.loader import load_config
 from config.models import ThresholdConfig
 from data.models import MetricValueVersioned, ThresholdBreach
-from evaluation.thresholds import evaluate_thresholds
+from evaluation.thresholds import build_threshold_index, evaluate_thresholds_indexed
 from orchestration.job_tracking import SqliteJobStatusStore
-from typing import Tuple
+from typing import Sequence, Tuple
 
 CONFIG_FILE = BACKEND_ROOT / "config" / "config.yaml"
 
 app = Flask(__name__, template_folder="templates", static_folder="static")
 
+
+class _OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson; defers to the stdlib for custom kwargs."""
+
+    _options = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self._options)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+if orjson is not None:
+    app.json = _OrjsonProvider(app)
+
+
+def _json_loads(raw: str | bytes) -> Any:
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _json_dumps_bytes(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=app.json.default, option=_OrjsonProvider._options)
+    return app.json.dumps(obj).encode("utf-8")
+
+
+def _stream_json_array(rows: Iterable[Any]) -> Iterator[bytes]:
+    yield b"["
+    separator = b""
+    for row in rows:
+        yield separator + _json_dumps_bytes(row)
+        separator = b","
+    yield b"]"
+
+
+def _json_array_response(rows: Iterable[Any]) -> Response:
+    """Encode a JSON array row by row instead of materializing the whole body.
+
+    Rows must not depend on the request context, which is gone once streaming starts.
+    """
+    return Response(_stream_json_array(rows), mimetype="application/json")
+
 try:
     ROOT_CONFIG = load_config(str(CONFIG_FILE))
-    DEFAULT_THRESHOLD_MAP = ROOT_CONFIG.global_thresholds
+    # Frozen once at import; requests without overrides share it as-is.
+    DEFAULT_THRESHOLD_MAP = MappingProxyType(
+        {metric: tuple(entries) for metric, entries in ROOT_CONFIG.global_thresholds.items()}
+    )
 except Exception:
-    DEFAULT_THRESHOLD_MAP = {}
+    DEFAULT_THRESHOLD_MAP = MappingProxyType({})
 
 
 def _openapi_spec() -> Dict[str, Any]:
@@ -87,15 +152,36 @@ def _openapi_spec() -> Dict[str, Any]:
     }
 
 
+# The spec is static, so encode it once instead of per request.
+_OPENAPI_BYTES = _json_dumps_bytes(_openapi_spec())
+
+
+_FileSignature = Tuple[Tuple[int, int], ...]
+
+
+def _file_signature(path: Path, companions: Sequence[Path] = ()) -> _FileSignature:
+    """Return (mtime_ns, size) for ``path`` plus any companion files that exist."""
+    stat = path.stat()
+    signature = [(stat.st_mtime_ns, stat.st_size)]
+    for companion in companions:
+        try:
+            companion_stat = companion.stat()
+        except FileNotFoundError:
+            signature.append((0, 0))
+        else:
+            signature.append((companion_stat.st_mtime_ns, companion_stat.st_size))
+    return tuple(signature)
+
+
 class FileCache:
     def __init__(self) -> None:
-        self._cache: Dict[str, Tuple[int, Any]] = {}
+        self._cache: Dict[str, Tuple[_FileSignature, Any]] = {}
         self._lock = threading.Lock()
 
-    def get_or_load(self, path: Path, loader_func: Any) -> Any:
+    def get_or_load(self, path: Path, loader_func: Any, companions: Sequence[Path] = ()) -> Any:
         key = str(path)
         try:
-            mtime_ns = path.stat().st_mtime_ns
+            signature = _file_signature(path, companions)
         except FileNotFoundError:
             # Ensure stale cache is not served if file is removed.
             with self._lock:
@@ -103,11 +189,11 @@ class FileCache:
             return loader_func()
 
         with self._lock:
-            cached_mtime_ns, cached_data = self._cache.get(key, (0, None))
-        if mtime_ns != cached_mtime_ns or cached_data is None:
+            cached_signature, cached_data = self._cache.get(key, ((), None))
+        if signature != cached_signature or cached_data is None:
             data = loader_func()
             with self._lock:
-                self._cache[key] = (mtime_ns, data)
+                self._cache[key] = (signature, data)
             return data
 
         return cached_data
@@ -117,37 +203,74 @@ _FILE_CACHE = FileCache()
 
 def _load_mock_data() -> Dict[str, Any]:
     def _loader() -> Dict[str, Any]:
-        return json.loads(MOCK_FILE.read_text())
+        return _json_loads(MOCK_FILE.read_text())
     return _FILE_CACHE.get_or_load(MOCK_FILE, _loader)
 
 
-def _load_status_data() -> Dict[str, Any]:
+class StatusSnapshot(NamedTuple):
+    """Batch status runs sorted newest first, with lookups built once per file load."""
+
+    runs_sorted_desc: List[Dict[str, Any]]
+    run_by_id: Dict[str, Dict[str, Any]]
+    item_by_id: Dict[str, Dict[str, Dict[str, Any]]]
+    # id(run) -> stats; filled lazily by _run_with_stats for runs of this snapshot.
+    run_stats: Dict[int, Dict[str, Any]]
+
+
+def _build_status_snapshot(runs: List[Dict[str, Any]]) -> StatusSnapshot:
+    runs_sorted_desc = sorted(runs, key=lambda r: r.get("started_at", ""), reverse=True)
+    run_by_id: Dict[str, Dict[str, Any]] = {}
+    item_by_id: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for run in runs_sorted_desc:
+        run_id = run.get("run_id")
+        if run_id in run_by_id:
+            continue
+        run_by_id[run_id] = run
+        items: Dict[str, Dict[str, Any]] = {}
+        for item in run.get("items", []):
+            items.setdefault(item.get("item_id"), item)
+        item_by_id[run_id] = items
+    return StatusSnapshot(runs_sorted_desc, run_by_id, item_by_id, {})
+
+
+def _load_status_snapshot() -> StatusSnapshot:
     if STATUS_DB_FILE.exists():
-        def _db_loader() -> Dict[str, Any]:
+        def _db_loader() -> StatusSnapshot:
             store = SqliteJobStatusStore(STATUS_DB_FILE)
             try:
-                return {"runs": store.load_runs()}
+                return _build_status_snapshot(store.load_runs())
             finally:
                 store.close()
-        return _FILE_CACHE.get_or_load(STATUS_DB_FILE, _db_loader)
+        # The job store runs in WAL mode, so committed writes land in the -wal file
+        # and leave the main database file untouched until a checkpoint.
+        wal_file = STATUS_DB_FILE.with_name(f"{STATUS_DB_FILE.name}-wal")
+        return _FILE_CACHE.get_or_load(STATUS_DB_FILE, _db_loader, companions=(wal_file,))
         
     if not STATUS_FILE.exists():
-        return {"runs": []}
+        return _build_status_snapshot([])
         
-    def _json_loader() -> Dict[str, Any]:
-        return json.loads(STATUS_FILE.read_text())
+    def _json_loader() -> StatusSnapshot:
+        return _build_status_snapshot(_json_loads(STATUS_FILE.read_text()).get("runs", []))
     return _FILE_CACHE.get_or_load(STATUS_FILE, _json_loader)
 
 
 def _compute_run_stats(run: Dict[str, Any]) -> Dict[str, Any]:
     items = run.get("items", [])
     total = len(items)
-    completed = sum(1 for i in items if i.get("status") == "completed")
-    failed = sum(1 for i in items if i.get("status") == "failed")
-    running = sum(1 for i in items if i.get("status") == "running")
-    pending = sum(1 for i in items if i.get("status") == "pending")
-    breaches = sum(int(i.get("breach_count", 0)) for i in items)
-    policy_runs = sum(int(i.get("policy_runs", 0)) for i in items)
+    completed = failed = running = pending = 0
+    breaches = policy_runs = 0
+    for item in items:
+        status = item.get("status")
+        if status == "completed":
+            completed += 1
+        elif status == "failed":
+            failed += 1
+        elif status == "running":
+            running += 1
+        elif status == "pending":
+            pending += 1
+        breaches += int(item.get("breach_count", 0))
+        policy_runs += int(item.get("policy_runs", 0))
     return {
         "total_items": total,
         "completed_items": completed,
@@ -160,59 +283,76 @@ def _compute_run_stats(run: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def _sorted_runs() -> List[Dict[str, Any]]:
-    data = _load_status_data()
-    runs = data.get("runs", [])
-    return sorted(runs, key=lambda r: r.get("started_at", ""), reverse=True)
-
-
-def _run_with_stats(run: Dict[str, Any]) -> Dict[str, Any]:
+def _run_with_stats(run: Dict[str, Any], stats_cache: Optional[Dict[int, Dict[str, Any]]] = None) -> Dict[str, Any]:
     enriched = dict(run)
-    enriched["stats"] = _compute_run_stats(run)
+    if stats_cache is None:
+        enriched["stats"] = _compute_run_stats(run)
+        return enriched
+    # Keyed by id(): the cache lives in the same StatusSnapshot that owns ``run``.
+    stats = stats_cache.get(id(run))
+    if stats is None:
+        stats = stats_cache[id(run)] = _compute_run_stats(run)
+    enriched["stats"] = stats
     return enriched
 
 
-def _clone_threshold_map(
-    threshold_map: Dict[str, List[ThresholdConfig]],
-) -> Dict[str, List[ThresholdConfig]]:
-    return {
-        metric: [
-            ThresholdConfig(level=t.level, value=t.value, direction=t.direction)
-            for t in entries
-        ]
-        for metric, entries in threshold_map.items()
-    }
-
-
 def _upsert_threshold(
-    threshold_map: Dict[str, List[ThresholdConfig]],
+    threshold_map: Dict[str, Tuple[ThresholdConfig, ...]],
     metric_name: str,
     level: str,
     value: float,
     direction: str,
 ) -> None:
-    entries = threshold_map.setdefault(metric_name, [])
+    # Copy-on-write: only the overridden metric gets a new entry tuple; the rest stay
+    # shared with DEFAULT_THRESHOLD_MAP.
+    replacement = ThresholdConfig(level=level, value=value, direction=direction)
+    entries = threshold_map.get(metric_name, ())
     for i, entry in enumerate(entries):
         if entry.level == level:
-            entries[i] = ThresholdConfig(level=level, value=value, direction=direction)
+            threshold_map[metric_name] = entries[:i] + (replacement,) + entries[i + 1 :]
             return
-    entries.append(ThresholdConfig(level=level, value=value, direction=direction))
+    threshold_map[metric_name] = entries + (replacement,)
 
 
-def _active_threshold_map() -> Dict[str, List[ThresholdConfig]]:
-    threshold_map = _clone_threshold_map(DEFAULT_THRESHOLD_MAP)
-    use_dynamic = request.args.get("dynamic_thresholds", "").lower() in {"1", "true", "yes", "on"}
-    if not use_dynamic:
-        return threshold_map
+_DYNAMIC_TRUE_VALUES = {"1", "true", "yes", "on"}
+# threshold.<metric>.<level>=<value> and direction.<metric>.<level>=min|max
+_THRESHOLD_ARG_RE = re.compile(r"(threshold|direction)\.([^.]+)\.([^.]+)")
+_ThresholdSignature = Tuple[Tuple[str, str], ...]
+_FrozenThresholdMap = Mapping[str, Tuple[ThresholdConfig, ...]]
 
-    for key, raw_value in request.args.items():
-        if not key.startswith("threshold."):
-            continue
-        parts = key.split(".")
-        if len(parts) != 3:
+
+def _threshold_signature() -> _ThresholdSignature:
+    """Reduce the request args to the items that affect the active threshold map."""
+    if request.args.get("dynamic_thresholds", "").lower() not in _DYNAMIC_TRUE_VALUES:
+        return ()
+    return tuple(
+        sorted(
+            (key, value)
+            for key, value in request.args.items()
+            if key.startswith(("threshold.", "direction."))
+        )
+    )
+
+
+@lru_cache(maxsize=256)
+def _build_threshold_map(signature: _ThresholdSignature) -> _FrozenThresholdMap:
+    if not signature:
+        return DEFAULT_THRESHOLD_MAP
+    values: List[Tuple[str, str, str]] = []
+    directions: Dict[Tuple[str, str], str] = {}
+    for key, raw_value in signature:
+        match = _THRESHOLD_ARG_RE.fullmatch(key)
+        if match is None:
             continue
-        _, metric_name, level = parts
-        direction = request.args.get(f"direction.{metric_name}.{level}", "min").strip().lower()
+        kind, metric_name, level = match.groups()
+        if kind == "threshold":
+            values.append((metric_name, level, raw_value))
+        else:
+            directions[(metric_name, level)] = raw_value.strip().lower()
+
+    threshold_map = dict(DEFAULT_THRESHOLD_MAP)
+    for metric_name, level, raw_value in values:
+        direction = directions.get((metric_name, level), "min")
         if direction not in {"min", "max"}:
             direction = "min"
         _upsert_threshold(
@@ -222,7 +362,12 @@ def _active_threshold_map() -> Dict[str, List[ThresholdConfig]]:
             value=float(raw_value),
             direction=direction,
         )
-    return threshold_map
+    # Shared across requests via the lru_cache, so hand out a read-only view.
+    return MappingProxyType(threshold_map)
+
+
+def _active_threshold_map() -> _FrozenThresholdMap:
+    return _build_threshold_map(_threshold_signature())
 
 
 def _make_metric(metric: Dict[str, Any], fallback_ts: str) -> MetricValueVersioned:
@@ -247,12 +392,13 @@ def _status_for_breaches(breaches: List[ThresholdBreach]) -> str:
 
 def _latest_with_breaches(
     latest_rows: List[Dict[str, Any]],
-    threshold_map: Dict[str, List[ThresholdConfig]],
+    threshold_map: Mapping[str, Sequence[ThresholdConfig]],
 ) -> List[Dict[str, Any]]:
     output: List[Dict[str, Any]] = []
+    threshold_index = build_threshold_index(threshold_map)
     for row in latest_rows:
         metrics = [_make_metric(metric, row.get("timestamp", "")) for metric in row.get("metrics", [])]
-        breaches = evaluate_thresholds(metrics, threshold_map)
+        breaches = evaluate_thresholds_indexed(metrics, threshold_index)
         enriched = dict(row)
         enriched["metrics"] = [m.to_dict() for m in metrics]
         enriched["breaches"] = [b.to_dict() for b in breaches]
@@ -261,6 +407,41 @@ def _latest_with_breaches(
     return output
 
 
+class _BreachViewCache:
+    """Memoize ``_latest_with_breaches`` output by the identity of its inputs.
+
+    Both inputs are already cached objects (the parsed mock file and the per-signature
+    threshold map), so an unchanged file polled with the same query reuses the result.
+    Entries hold references to their inputs, which keeps the ``id()`` keys unambiguous.
+    """
+
+    def __init__(self, max_entries: int = 64) -> None:
+        self._entries: Dict[Tuple[int, int], Tuple[Any, Any, List[Dict[str, Any]]]] = {}
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def get_or_build(
+        self,
+        latest_rows: List[Dict[str, Any]],
+        threshold_map: Mapping[str, Sequence[ThresholdConfig]],
+    ) -> List[Dict[str, Any]]:
+        key = (id(latest_rows), id(threshold_map))
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] is latest_rows and entry[1] is threshold_map:
+            return entry[2]
+
+        output = _latest_with_breaches(latest_rows, threshold_map)
+        with self._lock:
+            if len(self._entries) >= self._max_entries:
+                self._entries.clear()
+            self._entries[key] = (latest_rows, threshold_map, output)
+        return output
+
+
+_BREACH_VIEW_CACHE = _BreachViewCache()
+
+
 @app.route("/")
 def index() -> str:
     return render_template("index.html")
@@ -270,7 +451,7 @@ def index() -> str:
 def latest() -> Any:
     data = _load_mock_data()
     threshold_map = _active_threshold_map()
-    return jsonify(_latest_with_breaches(data["latest"], threshold_map))
+    return _json_array_response(_BREACH_VIEW_CACHE.get_or_build(data["latest"], threshold_map))
 
 
 @app.route("/api/trends/<app_id>")
@@ -284,43 +465,43 @@ def trends(app_id: str) -> Any:
 def alerts() -> Any:
     data = _load_mock_data()
     threshold_map = _active_threshold_map()
-    latest_rows = _latest_with_breaches(data["latest"], threshold_map)
-    all_alerts: List[Dict[str, Any]] = []
-    for item in latest_rows:
-        all_alerts.extend(item.get("breaches", []))
-    return jsonify(all_alerts)
+    latest_rows = _BREACH_VIEW_CACHE.get_or_build(data["latest"], threshold_map)
+    return _json_array_response(breach for item in latest_rows for breach in item.get("breaches", []))
 
 
 @app.route("/api/thresholds")
 def thresholds() -> Any:
     threshold_map = _active_threshold_map()
     serialized = {
-        metric: [t.__dict__ for t in entries]
+        metric: [asdict(t) for t in entries]
         for metric, entries in threshold_map.items()
     }
-    dynamic = request.args.get("dynamic_thresholds", "").lower() in {"1", "true", "yes", "on"}
+    dynamic = request.args.get("dynamic_thresholds", "").lower() in _DYNAMIC_TRUE_VALUES
     return jsonify({"dynamic_thresholds": dynamic, "thresholds": serialized})
 
 
 @app.route("/api/batch/current")
 def batch_current() -> Any:
-    runs = _sorted_runs()
+    snapshot = _load_status_snapshot()
+    runs = snapshot.runs_sorted_desc
     running = next((r for r in runs if r.get("status") == "running"), None)
     run = running or (runs[0] if runs else None)
     if run is None:
         return jsonify(None)
-    return jsonify(_run_with_stats(run))
+    return jsonify(_run_with_stats(run, snapshot.run_stats))
 
 
 @app.route("/api/batch/history")
 def batch_history() -> Any:
-    runs = [_run_with_stats(r) for r in _sorted_runs()]
+    snapshot = _load_status_snapshot()
+    stats_cache = snapshot.run_stats
+    runs = snapshot.runs_sorted_desc
     page = request.args.get("page", type=int)
     page_size = request.args.get("page_size", type=int)
 
     # Backward-compatible response for clients that do not request pagination.
     if page is None and page_size is None:
-        return jsonify(runs)
+        return _json_array_response(_run_with_stats(r, stats_cache) for r in runs)
 
     safe_page = max(1, page or 1)
     safe_page_size = min(100, max(1, page_size or 10))
@@ -333,7 +514,7 @@ def batch_history() -> Any:
     end = start + safe_page_size
     return jsonify(
         {
-            "items": runs[start:end],
+            "items": [_run_with_stats(r, stats_cache) for r in runs[start:end]],
             "page": safe_page,
             "page_size": safe_page_size,
             "total": total,
@@ -344,18 +525,19 @@ def batch_history() -> Any:
 
 @app.route("/api/batch/run/<run_id>")
 def batch_run_detail(run_id: str) -> Any:
-    run = next((r for r in _sorted_runs() if r.get("run_id") == run_id), None)
+    snapshot = _load_status_snapshot()
+    run = snapshot.run_by_id.get(run_id)
     if run is None:
         return jsonify({"error": "run not found"}), 404
-    return jsonify(_run_with_stats(run))
+    return jsonify(_run_with_stats(run, snapshot.run_stats))
 
 
 @app.route("/api/batch/run/<run_id>/item/<item_id>/logs")
 def batch_item_logs(run_id: str, item_id: str) -> Any:
-    run = next((r for r in _sorted_runs() if r.get("run_id") == run_id), None)
-    if run is None:
+    snapshot = _load_status_snapshot()
+    if run_id not in snapshot.run_by_id:
         return jsonify({"error": "run not found"}), 404
-    item = next((i for i in run.get("items", []) if i.get("item_id") == item_id), None)
+    item = snapshot.item_by_id[run_id].get(item_id)
     if item is None:
         return jsonify({"error": "item not found"}), 404
     return jsonify(
@@ -370,14 +552,7 @@ def batch_item_logs(run_id: str, item_id: str) -> Any:
     )
 
 
-@app.route("/api/openapi.json")
-def openapi() -> Any:
-    return jsonify(_openapi_spec())
-
-
-@app.route("/api/docs")
-def docs() -> Response:
-    html = """<!doctype html>
+_DOCS_HTML = """<!doctype html>
 <html>
   <head>
     <meta charset="UTF-8" />
@@ -397,7 +572,16 @@ def docs() -> Response:
   </body>
 </html>
 """
-    return Response(html, mimetype="text/html")
+
+
+@app.route("/api/openapi.json")
+def openapi() -> Response:
+    return Response(_OPENAPI_BYTES, mimetype="application/json")
+
+
+@app.route("/api/docs")
+def docs() -> Response:
+    return Response(_DOCS_HTML, mimetype="text/html")
 
 
 if __name__ == "__main__":